@@ -0,0 +1,218 @@
+"""
+Validasi batch tanpa GUI untuk dijalankan di server.
+
+Contoh:
+    python -m batch_validate "Input/*.xlsx" bank_a.xlsx --workers 4 --summary summary.json
+
+Setiap file divalidasi dengan DataValidator.process_file dan hasilnya ditulis
+ke folder Output/..._validated seperti biasa; file dengan nama sama dari folder
+berbeda mendapat akhiran _2, _3, ... Ringkasan per file ditulis
+sebagai JSON (ke stdout atau ke file --summary). Exit code:
+    0 - semua file berhasil divalidasi
+    1 - ada file yang gagal divalidasi
+    2 - tidak ada file input yang ditemukan
+    3 - semua file berhasil, tetapi ada temuan (hanya dengan --fail-on-findings)
+    4 - semua file divalidasi, tetapi ada file per bank yang gagal ditulis
+        (status "partial" di ringkasan)
+"""
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import db_utils
+
+db_utils.set_headless()
+
+from data_validator import DataValidator
+
+EXIT_OK = 0
+EXIT_FAILED = 1
+EXIT_NO_INPUT = 2
+EXIT_FINDINGS = 3
+EXIT_PARTIAL = 4
+
+
+def expand_inputs(patterns):
+    """
+    Ubah daftar path/glob menjadi daftar file unik sesuai urutan argumen.
+
+    Pola glob yang tidak cocok dengan file apa pun dilewati, sedangkan path
+    biasa selalu dikembalikan agar file yang tidak ada dilaporkan sebagai error.
+    """
+    files = []
+    for pattern in patterns:
+        matches = sorted(glob.glob(pattern)) if glob.has_magic(pattern) else [pattern]
+        for path in matches:
+            if path not in files:
+                files.append(path)
+    return files
+
+
+def output_names(input_files):
+    """
+    Nama dasar output per file input, unik dalam satu run.
+
+    Folder output diturunkan dari nama file saja, sehingga dua file dengan
+    nama sama dari folder berbeda akan saling menimpa. File berikutnya dengan
+    nama yang sudah dipakai mendapat akhiran _2, _3, dan seterusnya
+    (dibandingkan tanpa membedakan huruf besar/kecil, seperti di Windows).
+
+    Returns:
+        list: Nama output sesuai urutan input_files.
+    """
+    base_names = [os.path.splitext(os.path.basename(path))[0] for path in input_files]
+    used = {name.lower() for name in base_names}
+    names = []
+    taken = set()
+    for name in base_names:
+        if name.lower() in taken:
+            suffix = 2
+            while f"{name}_{suffix}".lower() in used:
+                suffix += 1
+            name = f"{name}_{suffix}"
+            used.add(name.lower())
+        taken.add(name.lower())
+        names.append(name)
+    return names
+
+
+def validate_file(input_file, inner_workers=None, output_name=None):
+    """
+    Validasi satu file dan kembalikan ringkasan yang bisa di-serialize ke JSON.
+
+    Args:
+        input_file (str): Path file Excel input.
+        inner_workers (int, optional): Batas worker paralel di dalam satu file.
+        output_name (str, optional): Nama dasar folder/file output
+            (lihat output_names).
+
+    Returns:
+        dict: Ringkasan hasil validasi file.
+    """
+    started = time.perf_counter()
+    summary = {"input_file": input_file, "status": "ok", "error": None}
+    try:
+        validator = DataValidator(db_utils.FUZZY_MATCH_THRESHOLD)
+        if inner_workers:
+            validator.parallel_workers = min(validator.parallel_workers, inner_workers)
+            validator.split_workers = min(validator.split_workers, inner_workers)
+        output_file, error_count, _ = validator.process_file(
+            input_file, collect_results=False, output_name=output_name
+        )
+        failed_banks = [
+            str(report["bank_code"])
+            for report in validator.run_stats.get("bank_files", [])
+            if report["error"]
+        ]
+        summary.update({
+            "output_file": output_file,
+            "rows": validator.run_stats.get("rows"),
+            "findings": error_count,
+            "dedup_ratio": validator.run_stats.get("dedup", {}).get("ratio"),
+            "bank_files": len(validator.run_stats.get("bank_files", [])),
+            "failed_bank_files": failed_banks,
+        })
+        if failed_banks:
+            summary.update({
+                "status": "partial",
+                "error": f"Gagal menulis file bank: {', '.join(failed_banks)}",
+            })
+    except Exception as e:
+        summary.update({"status": "error", "error": str(e)})
+    summary["seconds"] = round(time.perf_counter() - started, 3)
+    return summary
+
+
+def run(input_files, workers=1):
+    """
+    Validasi banyak file, secara paralel jika workers > 1.
+
+    Returns:
+        list: Ringkasan per file sesuai urutan input_files.
+    """
+    workers = max(1, min(workers, len(input_files)))
+    names = output_names(input_files)
+    if workers == 1:
+        return [
+            validate_file(input_file, output_name=name)
+            for input_file, name in zip(input_files, names)
+        ]
+
+    # CPU dibagi rata agar worker per file tidak saling berebut
+    inner_workers = max(1, (os.cpu_count() or 1) // workers)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(
+            validate_file, input_files, [inner_workers] * len(input_files), names
+        ))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="batch_validate",
+        description="Validasi banyak file LLD tanpa GUI.",
+    )
+    parser.add_argument("inputs", nargs="+", help="File Excel atau pola glob (mis. 'Input/*.xlsx')")
+    parser.add_argument(
+        "-w", "--workers", type=int, default=1,
+        help="Jumlah file yang divalidasi bersamaan (default: 1)",
+    )
+    parser.add_argument("--summary", help="Tulis ringkasan JSON ke file ini, bukan ke stdout")
+    parser.add_argument(
+        "--fail-on-findings", action="store_true",
+        help="Exit code 3 jika ada temuan validasi",
+    )
+    args = parser.parse_args(argv)
+
+    input_files = expand_inputs(args.inputs)
+    if not input_files:
+        print("Tidak ada file input.", file=sys.stderr)
+        return EXIT_NO_INPUT
+
+    # Database lama: tambahkan tracking versi reference data (tidak berubah jika sudah ada)
+    db_utils.migrate_database()
+    results = run(input_files, args.workers)
+    for result in results:
+        if result["status"] == "ok":
+            print(
+                f"OK    {result['input_file']}: {result['findings']} temuan "
+                f"({result['seconds']} detik)",
+                file=sys.stderr,
+            )
+        elif result["status"] == "partial":
+            print(
+                f"PARTIAL {result['input_file']}: {result['findings']} temuan, "
+                f"{result['error']}",
+                file=sys.stderr,
+            )
+        else:
+            print(f"ERROR {result['input_file']}: {result['error']}", file=sys.stderr)
+
+    summary = {
+        "files": results,
+        "succeeded": sum(result["status"] == "ok" for result in results),
+        "partial": sum(result["status"] == "partial" for result in results),
+        "failed": sum(result["status"] == "error" for result in results),
+        "findings": sum(result.get("findings") or 0 for result in results),
+    }
+    summary_json = json.dumps(summary, indent=2, default=str)
+    if args.summary:
+        with open(args.summary, "w") as f:
+            f.write(summary_json)
+    else:
+        print(summary_json)
+
+    if summary["failed"]:
+        return EXIT_FAILED
+    if summary["partial"]:
+        return EXIT_PARTIAL
+    if args.fail_on_findings and summary["findings"]:
+        return EXIT_FINDINGS
+    return EXIT_OK
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,191 @@
+"""
+Benchmark similarity.ratio_exceeds terhadap difflib.SequenceMatcher.
+
+Contoh:
+    python benchmark_similarity.py --pairs 200000 --threshold 0.9
+    python benchmark_similarity.py --same-bank
+
+Pasangan nama dibuat dari nama bank dengan variasi acak (huruf diganti,
+dihapus, kata ditambah), lalu setiap pasangan dicek dengan kedua cara.
+Dengan --same-bank, DataValidator.is_same_bank juga dibandingkan dengan
+algoritma aslinya (reference_is_same_bank).
+Skrip gagal (exit code 1) jika ada satu pun hasil atau nilai ratio yang berbeda.
+"""
+import argparse
+import random
+import re
+import string
+import sys
+import time
+from difflib import SequenceMatcher
+
+from similarity import ratio_exceeds, sequence_ratio
+
+BANK_NAMES = [
+    "BANK CENTRAL ASIA",
+    "BANK MANDIRI",
+    "BANK NEGARA INDONESIA",
+    "BANK RAKYAT INDONESIA",
+    "BANK DANAMON INDONESIA",
+    "BANK CIMB NIAGA",
+    "BANK OCBC NISP",
+    "BANK PERMATA",
+    "BANK TABUNGAN NEGARA",
+    "HSBC",
+    "STANDARD CHARTERED",
+    "CITIBANK NA",
+    "DBS BANK",
+    "OVERSEA CHINESE BANKING CORPORATION",
+    "UNITED OVERSEAS BANK",
+    "BANK OF CHINA",
+    "INDUSTRIAL AND COMMERCIAL BANK OF CHINA",
+    "MUFG BANK",
+    "SUMITOMO MITSUI BANKING CORPORATION",
+    "MIZUHO BANK",
+    "DEUTSCHE BANK",
+    "JPMORGAN CHASE BANK",
+    "BANK OF AMERICA",
+    "MAYBANK",
+]
+
+
+def mutate(name, rng):
+    """Buat variasi nama: typo, huruf hilang, atau kata tambahan."""
+    chars = list(name)
+    for _ in range(rng.randint(0, 3)):
+        action = rng.random()
+        pos = rng.randrange(len(chars))
+        if action < 0.4:
+            chars[pos] = rng.choice(string.ascii_uppercase)
+        elif action < 0.7 and len(chars) > 1:
+            del chars[pos]
+        else:
+            chars.insert(pos, rng.choice(string.ascii_uppercase + " "))
+    if rng.random() < 0.2:
+        chars.extend(" " + rng.choice(["PERSERO", "TBK", "SINGAPORE", "BRANCH"]))
+    if rng.random() < 0.2:
+        chars[:0] = rng.choice(["PT ", "PT. ", "(PERSERO) ", "BANK "])
+    if rng.random() < 0.1:
+        chars.extend(rng.choice([", TBK", " (PERSERO)", " LTD.", " LIMITED"]))
+    return "".join(chars)
+
+
+def reference_is_same_bank(bank1, bank2, threshold):
+    """
+    Algoritma is_same_bank sebelum dioptimasi (clean_bank_name lokal dan
+    SequenceMatcher), untuk pengecekan kesetaraan hasil.
+    """
+    def clean_bank_name(name):
+        name = str(name).upper()
+        name = re.sub(r"[^\w\s]", " ", name)
+        name = " ".join(name.split())
+        common_words = [
+            "PT", "BANK", "PERSERO", "(PERSERO)", "TBK", "INCORPORATION",
+            "CORPORATION", "LTD", "LIMITED", "INCORPORATED",
+        ]
+        for word in common_words:
+            name = name.replace(f" {word} ", " ")
+            if name.startswith(f"{word} "):
+                name = name[len(word):].strip()
+            if name.endswith(f" {word}"):
+                name = name[: -len(word)].strip()
+        return name
+
+    if str(bank1).strip() == "" or str(bank2).strip() == "":
+        return False
+    clean_bank1 = clean_bank_name(bank1)
+    clean_bank2 = clean_bank_name(bank2)
+    if clean_bank1 == clean_bank2:
+        return True
+
+    def extract_bank_code(name):
+        codes = [word for word in name.split() if len(word) in [2, 3, 4] and word.isalpha()]
+        return codes[0] if codes else None
+
+    code1 = extract_bank_code(clean_bank1)
+    code2 = extract_bank_code(clean_bank2)
+    if code1 and code2 and code1 == code2:
+        return True
+    if (
+        (clean_bank1 in clean_bank2 or clean_bank2 in clean_bank1)
+        and (len(clean_bank1) == 0 or len(clean_bank2) == 0)
+    ):
+        return True
+    return SequenceMatcher(None, clean_bank1, clean_bank2).ratio() > threshold
+
+
+def check_same_bank(pairs, threshold):
+    """
+    Bandingkan DataValidator.is_same_bank dengan reference_is_same_bank.
+
+    Returns:
+        int: Jumlah pasangan yang hasilnya berbeda.
+    """
+    from data_validator import DataValidator
+
+    validator = DataValidator(threshold)
+
+    started = time.perf_counter()
+    expected = [reference_is_same_bank(a, b, threshold) for a, b in pairs]
+    reference_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    actual = [validator.is_same_bank(a, b) for a, b in pairs]
+    fast_seconds = time.perf_counter() - started
+
+    mismatches = sum(e != a for e, a in zip(expected, actual))
+    print(f"Same bank       : {sum(expected)}")
+    print(f"reference       : {reference_seconds:.3f} s")
+    print(f"is_same_bank    : {fast_seconds:.3f} s ({reference_seconds / fast_seconds:.1f}x)")
+    print(f"Mismatches      : {mismatches}")
+    return mismatches
+
+
+def make_pairs(count, seed):
+    rng = random.Random(seed)
+    pairs = []
+    for _ in range(count):
+        first = rng.choice(BANK_NAMES)
+        # Sekitar separuh pasangan berasal dari bank yang sama
+        second = first if rng.random() < 0.5 else rng.choice(BANK_NAMES)
+        pairs.append((mutate(first, rng), mutate(second, rng)))
+    return pairs
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--pairs", type=int, default=100000)
+    parser.add_argument("--threshold", type=float, default=0.9)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--same-bank", action="store_true",
+        help="Bandingkan juga DataValidator.is_same_bank dengan algoritma aslinya",
+    )
+    args = parser.parse_args(argv)
+
+    pairs = make_pairs(args.pairs, args.seed)
+
+    started = time.perf_counter()
+    expected = [SequenceMatcher(None, a, b).ratio() > args.threshold for a, b in pairs]
+    baseline_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    actual = [ratio_exceeds(a, b, args.threshold) for a, b in pairs]
+    fast_seconds = time.perf_counter() - started
+
+    mismatches = sum(e != a for e, a in zip(expected, actual))
+    ratio_mismatches = sum(
+        SequenceMatcher(None, a, b).ratio() != sequence_ratio(a, b) for a, b in pairs
+    )
+    print(f"Pairs           : {len(pairs)} (threshold {args.threshold})")
+    print(f"Similar pairs   : {sum(expected)}")
+    print(f"SequenceMatcher : {baseline_seconds:.3f} s")
+    print(f"ratio_exceeds   : {fast_seconds:.3f} s ({baseline_seconds / fast_seconds:.1f}x)")
+    print(f"Mismatches      : {mismatches} (ratio: {ratio_mismatches})")
+    if args.same_bank:
+        mismatches += check_same_bank(pairs, args.threshold)
+    return 1 if mismatches or ratio_mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,167 @@
+import hashlib
+import json
+import os
+import pickle
+
+# Versi format file checkpoint; checkpoint dengan versi lain diabaikan
+CHECKPOINT_FORMAT = 3
+HASH_CHUNK_SIZE = 1 << 20
+
+
+def file_content_hash(path):
+    """SHA-256 isi file, dibaca per blok agar file besar tidak dimuat ke memori."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ValidationCheckpoint:
+    """
+    Checkpoint validasi di file sidecar, untuk melanjutkan run yang terhenti.
+
+    Header (versi format dan key) disimpan di file JSON terpisah
+    (<path>.json). Data-nya berupa rangkaian record pickle yang hanya
+    ditambahkan di akhir: setiap batch yang sudah divalidasi beserta
+    findings-nya, tahap yang sudah selesai, dan file per bank yang sudah
+    ditulis. Record terakhir yang terpotong (proses mati saat menulis)
+    diabaikan saat load.
+
+    Batch tidak disimpan di memori: record batch diawali header kecil berisi
+    jumlah baris dan ukuran datanya, sehingga load hanya mencatat offset dan
+    jumlah baris, dan iter_batches membaca batch satu per satu dari file.
+
+    Checkpoint hanya dipakai jika key-nya sama, yaitu hash isi file input
+    dan reference data yang dipakai untuk validasi. Key dicek dari header
+    JSON lebih dulu, sehingga file pickle hanya di-unpickle jika header cocok.
+    """
+
+    def __init__(self, path, key):
+        self.path = path
+        self.header_path = f"{path}.json"
+        self.key = key
+        self.batch_offsets = []
+        self.rows_done = 0  # Jumlah baris yang sudah divalidasi di checkpoint
+        self.stages = set()
+        self.bank_files = set()
+        self._file = None
+
+    def load(self):
+        """
+        Baca checkpoint yang ada, lalu buka file untuk menambah record.
+
+        Returns:
+            bool: True jika checkpoint dengan key yang sama ditemukan.
+        """
+        resumed = self._header_matches()
+        valid_end = 0  # Posisi akhir record terakhir yang utuh
+        if resumed:
+            try:
+                with open(self.path, "rb") as f:
+                    file_size = os.fstat(f.fileno()).st_size
+                    while True:
+                        record = pickle.load(f)
+                        if record[0] == "batch":
+                            # Data batch dilewati, cukup catat posisinya
+                            _, rows, size = record
+                            offset = f.tell()
+                            if offset + size > file_size:
+                                break  # Data batch terpotong
+                            f.seek(size, os.SEEK_CUR)
+                            self.batch_offsets.append(offset)
+                            self.rows_done += rows
+                        else:
+                            self._apply(record)
+                        valid_end = f.tell()
+            except FileNotFoundError:
+                resumed = False
+            except Exception:
+                pass  # Akhir file, atau record terakhir terpotong/rusak
+
+        if resumed:
+            # Buang record terpotong, lalu lanjutkan menulis di akhir file
+            self._file = open(self.path, "r+b")
+            self._file.truncate(valid_end)
+            self._file.seek(valid_end)
+        else:
+            self.batch_offsets, self.rows_done = [], 0
+            self.stages, self.bank_files = set(), set()
+            # Data lama dikosongkan dulu, baru header baru ditulis
+            self._file = open(self.path, "wb")
+            self._write_header()
+        return resumed
+
+    def _header_matches(self):
+        """True jika header JSON checkpoint cocok dengan format dan key run ini."""
+        try:
+            with open(self.header_path, "r", encoding="utf-8") as f:
+                header = json.load(f)
+        except (OSError, ValueError):
+            return False
+        return (
+            isinstance(header, dict)
+            and header.get("format") == CHECKPOINT_FORMAT
+            and header.get("key") == self.key
+        )
+
+    def _write_header(self):
+        temp_path = f"{self.header_path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump({"format": CHECKPOINT_FORMAT, "key": self.key}, f)
+        os.replace(temp_path, self.header_path)
+
+    def _apply(self, record):
+        if record[0] == "stage":
+            self.stages.add(record[1])
+        elif record[0] == "bank_file":
+            self.bank_files.add(record[1])
+
+    def _write(self, record):
+        pickle.dump(record, self._file, protocol=pickle.HIGHEST_PROTOCOL)
+        self._file.flush()
+
+    def add_batch(self, batch, findings):
+        """Simpan satu batch yang sudah divalidasi."""
+        data = pickle.dumps((batch, findings), protocol=pickle.HIGHEST_PROTOCOL)
+        pickle.dump(("batch", len(batch), len(data)), self._file, protocol=pickle.HIGHEST_PROTOCOL)
+        self._file.write(data)
+        self._file.flush()
+        self.rows_done += len(batch)
+
+    def iter_batches(self):
+        """
+        Baca batch yang tersimpan saat load, satu per satu dari file.
+
+        Yields:
+            tuple: (batch, findings) sesuai urutan penyimpanan.
+        """
+        offsets = list(self.batch_offsets)
+        with open(self.path, "rb") as f:
+            for offset in offsets:
+                f.seek(offset)
+                yield pickle.load(f)
+
+    def mark_stage(self, stage):
+        """Tandai tahap output (mis. "main_written") sudah selesai."""
+        self.stages.add(stage)
+        self._write(("stage", stage))
+
+    def mark_bank_file(self, bank_code):
+        """Tandai file per bank sudah berhasil ditulis."""
+        self.bank_files.add(bank_code)
+        self._write(("bank_file", bank_code))
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def remove(self):
+        """Hapus checkpoint setelah run selesai."""
+        self.close()
+        for path in (self.header_path, self.path):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
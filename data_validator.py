@@ -1,10 +1,22 @@
 import pandas as pd
-from difflib import SequenceMatcher
-from openpyxl.styles import PatternFill
-from openpyxl.comments import Comment
-import re
+import numpy as np
 import os
+import pickle
+import hashlib
+import threading
+import time
+import logging
+from collections import namedtuple, deque
+from itertools import chain, islice
+from concurrent.futures import ProcessPoolExecutor
 import db_utils
+from keyword_matcher import CategoryMatcher, KeywordAutomaton, StatusMatcher
+from name_normalizer import normalize_name, strip_bank_code_words, strip_bank_words
+from memo_cache import LRUCache
+from similarity import ratio_exceeds
+from excel_io import ExcelBatchReader, ExcelStreamWriter
+from checkpoint import ValidationCheckpoint, file_content_hash
+from partition_spill import BankPartitionSpill, iter_partition
 
 # Constants untuk nama kolom
 COL_NAMA_PENERIMA = "nama_penerima"
@@ -18,70 +30,372 @@ COL_STT = "stt"
 COL_TAHUN = "tahun"
 COL_BULAN = "bulan"
 
+# Kolom yang dibaca oleh aturan validasi (dikirim ke worker process)
+RULE_COLUMNS = [
+    COL_NAMA_PENERIMA,
+    COL_KATEGORI_PENERIMA,
+    COL_NAMA_PEMBAYAR,
+    COL_KATEGORI_PEMBAYAR,
+    COL_KODE_BANK,
+    COL_STATUS_PENERIMA,
+    COL_STATUS_PEMBAYAR,
+    COL_STT,
+]
+
+# Penggantian nama header kolom di file output
+HEADER_RENAME_MAP = {
+    "cKdBank": "cKdBank",
+    "baris": "baris",
+    "sandi_bank": "Sandi Bank",
+    "tahun": "Thn",
+    "bulan": "Bln",
+    "tanggal": "Tgl",
+    "nomer_identifikasi": "No. Identifikasi",
+    "rekening": "Rek",
+    "status_penerima": "SPn",
+    "kategori_penerima": "KPn",
+    "status_pembayar": "SPb",
+    "kategori_pembayar": "KPb",
+    "hubungan_keuangan": "HK",
+    "sandi_negara": "NDK",
+    "sandi_valuta": "Valuta",
+    "nilai transaksi": "Nilai Transaksi",
+    "stt": "STT",
+    "nama_penerima": "Pelaku Penerima",
+    "jenis_id_penerima": "Jns Id Pn",
+    "nomor_id_penerima": "No Id Pn",
+    "nama_pembayar": "Pelaku Pembayar",
+    "jenis_id_pembayar": "Jns Id Pb",
+    "nomor_id_pembayar": "No Id Pb",
+    "bank_pengirim": "Bank Pengirim",
+    "bank_penerima": "Bank Penerima",
+    "detil_transaksi": "Keterangan Detail Transaksi",
+    "info_DP": "info DP",
+}
+
+# Kata-kata yang menunjukkan ID/N1 jika tidak ada keyword negara
+COMPANY_WORDS = frozenset({"PT", "PERSERO", "TBK", "LTD", "CV", "KOPERASI"})
+
+# Kata pendek yang harus persis berdiri sendiri
+SHORT_KEYWORDS = frozenset({
+    "PT", "WHO", "UN", "TBK", "CV", "LTD", "INC", "CORP", "CO",
+    "LLC", "PTE", "PVT", "BV", "NV", "SA", "GMBH", "AG", "SL",
+    "SRL", "SAS", "SARL", "SPA", "SNC", "SCS", "SCA", "SAR",
+    "SASU", "SARLU",
+})
+
+# Automaton karakter untuk menemukan semua kata pendek (sebagai substring) dalam satu scan
+SHORT_KEYWORD_MATCHER = KeywordAutomaton()
+for _keyword in SHORT_KEYWORDS:
+    SHORT_KEYWORD_MATCHER.add(_keyword, _keyword)
+SHORT_KEYWORD_MATCHER.build()
+
+# Hasil klasifikasi satu nama untuk satu sisi (penerima/pembayar)
+NameClassification = namedtuple("NameClassification", ["category", "has_c0", "has_f1"])
+
+
+# Kolom yang wajib ada di data input
+REQUIRED_COLUMNS = [
+    COL_NAMA_PENERIMA,
+    COL_KATEGORI_PENERIMA,
+    COL_NAMA_PEMBAYAR,
+    COL_KATEGORI_PEMBAYAR,
+    COL_STT,
+]
+
+# Field setiap temuan validasi; juga urutan tuple ringkas temuan per bank
+FINDING_FIELDS = ("row", "column", "current", "suggested", "name", "bank_code", "status")
+
+# Kolom DataFrame hasil validate_dataframe/validate_records
+FINDING_COLUMNS = ["position", "index", "column", "current", "suggested", "name", "bank_code", "status"]
+
+# Event yang bisa di-subscribe lewat DataValidator.subscribe
+VALIDATION_EVENTS = ("stage_start", "stage_end", "batch_completed", "finding", "file_written")
+
+
+class ValidationCancelled(Exception):
+    """Dilempar process_file saat run dibatalkan lewat CancellationToken."""
+
+
+class CancellationToken:
+    """
+    Token pembatalan kooperatif untuk process_file.
+
+    cancel() boleh dipanggil dari thread mana pun; process_file memeriksa
+    token di antara batch baris dan di antara tahap output.
+    """
+
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self):
+        self._event.set()
+
+    @property
+    def cancelled(self):
+        return self._event.is_set()
+
+    def raise_if_cancelled(self):
+        if self._event.is_set():
+            raise ValidationCancelled("Validasi dibatalkan")
+
 class DataValidator:
-    def __init__(self, fuzzy_match_threshold=0.9):
+    def __init__(self, fuzzy_match_threshold=0.9, reference_state=None):
+        """
+        Args:
+            fuzzy_match_threshold (float): Batas kemiripan nama bank.
+            reference_state (dict, optional): Reference data yang sudah dimuat
+                (lihat get_reference_state). Jika diisi, database tidak dibaca,
+                misalnya di dalam worker process.
+        """
+        config = db_utils.load_config()
+        validation_config = config.get("validation", {})
+        # Cache hasil is_same_bank per pasangan nama, dikosongkan jika threshold berubah
+        self.bank_pair_cache = LRUCache(
+            validation_config.get("bank_pair_cache_size", 50000)
+        )
+        self.fuzzy_match_threshold = fuzzy_match_threshold
+
+        # Bentuk normal setiap nama unik, dipakai bersama oleh semua aturan
+        self.name_cache = LRUCache(validation_config.get("name_cache_size", 100000))
+
+        # Cache klasifikasi per nama, dikosongkan setiap reference data berubah
+        self.classification_cache = LRUCache(
+            validation_config.get("classification_cache_size", 100000)
+        )
+        self.run_stats = {}
+        self.dedup_stats = {"rows": 0, "unique_rows": 0}
+
+        # Pengaturan validasi paralel
+        self.parallel_workers = validation_config.get("parallel_workers", 0) or os.cpu_count() or 1
+        self.parallel_min_rows = validation_config.get("parallel_min_rows", 50000)
+        self.batch_rows = validation_config.get("batch_rows", 20000)
+        self.split_workers = validation_config.get("split_workers", 0) or os.cpu_count() or 1
+        # Simpan progress ke file sidecar agar run yang terhenti bisa dilanjutkan
+        self.checkpoint_enabled = validation_config.get("checkpoint", False)
+
+        # Listener event process_file per nama event (lihat subscribe)
+        self._listeners = {}
+        self._run_started = time.perf_counter()
+        self._stage_started = {}
+
+        if reference_state is not None:
+            self.reference_mapping = reference_state["reference_mapping"]
+            self.bank_codes = reference_state["bank_codes"]
+            self.status_mapping = reference_state["status_mapping"]
+            self.stt_category_exceptions = reference_state["stt_category_exceptions"]
+            self.category_priority = reference_state["category_priority"]
+            self.reference_version = None
+            self.compile_reference_data()
+            return
+
+        reference_data = db_utils.get_reference_data()
+        self.reference_version = reference_data["version"]
         self.reference_mapping = {
-            "penerima": db_utils.get_mapping_data("ref_mapping_penerima"),
-            "pembayar": db_utils.get_mapping_data("ref_mapping_pembayar"),
+            "penerima": reference_data["penerima"],
+            "pembayar": reference_data["pembayar"],
         }
-        self.bank_codes = db_utils.get_bank_codes()
-        self.fuzzy_match_threshold = fuzzy_match_threshold
+        self.bank_codes = reference_data["bank_codes"]
         
         # Load STT category exceptions from config
-        config = db_utils.load_config()
-        self.stt_category_exceptions = config.get("validation", {}).get("stt_category_exceptions", {})
-        self.status_mapping = db_utils.get_status_mapping()
+        self.stt_category_exceptions = validation_config.get("stt_category_exceptions", {})
+        self.status_mapping = reference_data["status_mapping"]
         
         # Tambahkan prioritas kategori
         self.category_priority = ["B0", "C0", "F1", "F2"]
+        self.compile_reference_data()
+
+    @property
+    def fuzzy_match_threshold(self):
+        """Batas kemiripan nama bank untuk is_same_bank."""
+        return self._fuzzy_match_threshold
+
+    @fuzzy_match_threshold.setter
+    def fuzzy_match_threshold(self, value):
+        if getattr(self, "_fuzzy_match_threshold", None) != value:
+            self.bank_pair_cache.clear()
+        self._fuzzy_match_threshold = value
+
+    def get_reference_state(self):
+        """
+        Reference data yang dibutuhkan untuk validasi, untuk dikirim ke worker process.
+
+        Returns:
+            dict: Mapping kategori, bank codes, status mapping, STT exceptions
+                dan prioritas kategori.
+        """
+        return {
+            "reference_mapping": self.reference_mapping,
+            "bank_codes": self.bank_codes,
+            "status_mapping": self.status_mapping,
+            "stt_category_exceptions": self.stt_category_exceptions,
+            "category_priority": self.category_priority,
+        }
 
     def reload_reference_data(self):
-        """Reload mapping dan bank codes dari database."""
-        self.reference_mapping = {
-            "penerima": db_utils.get_mapping_data("ref_mapping_penerima"),
-            "pembayar": db_utils.get_mapping_data("ref_mapping_pembayar"),
+        """
+        Reload mapping dan bank codes dari database, hanya jika versi reference
+        data di database berubah sejak terakhir dimuat.
+        """
+        version = db_utils.get_reference_version()
+        if version is not None and version == self.reference_version:
+            return  # Tidak ada perubahan di database, tidak perlu query ulang
+
+        reference_data = db_utils.get_reference_data()
+        self.reference_version = reference_data["version"]
+        previous = self.reference_snapshot()
+        reference_mapping = {
+            "penerima": reference_data["penerima"],
+            "pembayar": reference_data["pembayar"],
         }
-        self.bank_codes = db_utils.get_bank_codes()
-        self.status_mapping = db_utils.get_status_mapping()
+        bank_codes = reference_data["bank_codes"]
+        status_mapping = reference_data["status_mapping"]
+        if self.reference_snapshot(reference_mapping, bank_codes, status_mapping) == previous:
+            return  # Tidak ada perubahan, matcher dan cache tetap dipakai
+
+        self.reference_mapping = reference_mapping
+        self.bank_codes = bank_codes
+        self.status_mapping = status_mapping
+        self.compile_reference_data()
+
+    def reference_snapshot(self, reference_mapping=None, bank_codes=None, status_mapping=None):
+        """Snapshot reference data, termasuk urutannya, untuk mendeteksi perubahan."""
+        reference_mapping = reference_mapping if reference_mapping is not None else self.reference_mapping
+        bank_codes = bank_codes if bank_codes is not None else self.bank_codes
+        status_mapping = status_mapping if status_mapping is not None else self.status_mapping
+        return (
+            tuple(reference_mapping["penerima"].items()),
+            tuple(reference_mapping["pembayar"].items()),
+            tuple(bank_codes.items()),
+            tuple((keyword, tuple(statuses)) for keyword, statuses in status_mapping.items()),
+        )
+
+    def compile_reference_data(self):
+        """Kompilasi reference data menjadi matcher, cukup sekali per load."""
+        self.category_matchers = {
+            side: CategoryMatcher(mapping)
+            for side, mapping in self.reference_mapping.items()
+        }
+        self.status_matcher = StatusMatcher(self.status_mapping)
+        # Index sandi bank -> nama referensi yang sudah dibersihkan
+        self.bank_reference_index = {
+            code: self.clean_bank_code_name(name)
+            for code, name in self.bank_codes.items()
+        }
+        self.classification_cache.clear()
+
+    def classify_name(self, side, name):
+        """
+        Klasifikasi nama untuk satu sisi (penerima/pembayar), memakai cache.
+
+        Args:
+            side (str): "penerima" atau "pembayar".
+            name (str): Nama yang diklasifikasi.
+
+        Returns:
+            NameClassification: Kategori spesifik serta apakah nama
+                mengandung keyword C0 atau F1.
+        """
+        mapping_dict = self.reference_mapping[side]
+
+        def classify():
+            # Keyword C0 dan F1 dicek sekaligus dalam satu scan substring
+            substring_categories = self.category_matchers[side].find_substring_categories(name)
+            return NameClassification(
+                category=self.check_specific_category(name, mapping_dict),
+                has_c0="C0" in substring_categories,
+                has_f1="F1" in substring_categories,
+            )
+
+        key = ("name", side, str(name), tuple(self.category_priority))
+        return self.classification_cache.get_or_compute(key, classify)
+
+    def get_cached_suggested_status(self, name):
+        """Versi get_suggested_status yang memakai cache klasifikasi."""
+        return self.classification_cache.get_or_compute(
+            ("status", str(name)), lambda: tuple(self.get_suggested_status(name))
+        )
+
+    def is_valid_bank_code(self, bank_name, bank_code):
+        """Versi validate_bank_code yang memakai cache klasifikasi."""
+        key = (
+            "bank_code",
+            None if pd.isna(bank_name) else str(bank_name),
+            None if pd.isna(bank_code) else str(bank_code),
+        )
+        return self.classification_cache.get_or_compute(
+            key, lambda: self.validate_bank_code(bank_name, bank_code)
+        )
+
+    def is_same_bank_cached(self, bank1, bank2):
+        """
+        Versi is_same_bank yang memakai cache per pasangan nama.
+
+        Key cache adalah pasangan nama (uppercase, spasi dinormalisasi) tanpa
+        memperhatikan urutan; perbandingan selalu dihitung dengan urutan yang
+        sama agar hasilnya tidak bergantung pada pasangan mana yang muncul dulu.
+        """
+        def normalize(name):
+            return None if pd.isna(name) else " ".join(str(name).upper().split())
+
+        pair = sorted(
+            [(normalize(bank1), bank1), (normalize(bank2), bank2)],
+            key=lambda item: (item[0] is None, item[0] or ""),
+        )
+        key = (pair[0][0], pair[1][0])
+        return self.bank_pair_cache.get_or_compute(
+            key, lambda: self.is_same_bank(pair[0][1], pair[1][1])
+        )
+
+    def normalize_name(self, name):
+        """
+        Bentuk normal (token, teks, token set) sebuah nama, memakai cache.
+
+        Args:
+            name: Nama mentah.
+
+        Returns:
+            NormalizedName: Hasil name_normalizer.normalize_name.
+        """
+        key = str(name).upper()
+        return self.name_cache.get_or_compute(key, lambda: normalize_name(key))
+
+    def get_category_matcher(self, mapping_dict):
+        """Ambil matcher yang sudah dikompilasi untuk mapping_dict."""
+        for matcher in self.category_matchers.values():
+            if matcher.mapping is mapping_dict:
+                return matcher
+        # Mapping di luar reference_mapping (mis. dari pemanggil lain)
+        return CategoryMatcher(mapping_dict)
 
     def get_suggested_status(self, name):
         """Get suggested status based on keywords in the name."""
         name = str(name).upper()
-        
-        # Daftar kata-kata yang bisa diabaikan jika ada keyword negara
-        company_words = {"PT", "PERSERO", "TBK", "LTD", "CV", "KOPERASI"}
-        
-        # Daftar kata pendek yang harus persis berdiri sendiri
-        short_keywords = {"PT", "WHO", "UN", "TBK", "CV", "LTD", "INC", "CORP", "CO", "LLC", "PTE", "PVT", "BV", "NV", "SA", "GMBH", "AG", "SL", "SRL", "SAS", "SARL", "SPA", "SRL", "SNC", "SCS", "SCA", "SAR", "SASU", "SARLU"}
+        normalized = self.normalize_name(name)
 
         # Jika keyword pendek ditemukan sekadar sebagai substring, abaikan
-        for kw in short_keywords:
-            if kw in name and not self.is_standalone_word(kw, name):
+        for kw in SHORT_KEYWORD_MATCHER.iter_matches(name):
+            if kw not in normalized.token_set:
                 # Jika ternyata hanya substring, kita lanjut tanpa men-flag
                 return []
 
         # Cek dulu keyword negara (prioritas tertinggi)
-        country_statuses = set()
-        for keyword, statuses in self.status_mapping.items():
-            if self.is_standalone_word(keyword, name):
-                for status in statuses:
-                    # Jika menemukan status negara
-                    if status not in ["ID", "N1"]:
-                        country_statuses.add(status)
+        # Urutan status dibuat tetap (urutan mapping) agar hasil sama di setiap proses
+        country_statuses = []
+        for statuses in self.status_matcher.find_statuses(normalized.tokens):
+            for status in statuses:
+                # Jika menemukan status negara
+                if status not in ["ID", "N1"] and status not in country_statuses:
+                    country_statuses.append(status)
 
         # Jika ada status negara, langsung return tanpa mengecek ID/N1
         if country_statuses:
-            return list(country_statuses)
-            
-        # Jika tidak ada status negara, cek untuk ID/N1
-        id_statuses = set()
-        # Hanya cek kata-kata yang menunjukkan ID/N1 jika tidak ada status negara
-        for keyword in company_words:
-            if self.is_standalone_word(keyword, name):
-                id_statuses.update(["ID", "N1"])
-                break
+            return country_statuses
 
-        return list(id_statuses) if id_statuses else []
+        # Jika tidak ada status negara, cek kata-kata yang menunjukkan ID/N1
+        if normalized.token_set & COMPANY_WORDS:
+            return ["ID", "N1"]
+        return []
 
     def validate_bank_code(self, bank_name, bank_code):
         """
@@ -102,35 +416,32 @@ class DataValidator:
         except (ValueError, AttributeError):
             return False
 
-        if bank_code not in self.bank_codes:
+        # Nama referensi sudah dibersihkan saat reference data dimuat
+        clean_reference = self.bank_reference_index.get(bank_code)
+        if clean_reference is None:
             return False
 
-        reference_bank_name = self.bank_codes[bank_code].upper()
         bank_name = str(bank_name).upper() if not pd.isna(bank_name) else ""
-
-        def clean_bank_name(name):
-            name = str(name).upper()
-            name = re.sub(r"[^\w\s]", " ", name)
-            name = " ".join(name.split())
-            # Hapus kata-kata lokasi/negara
-            location_words = ["HONG KONG", "SINGAPORE", "INDONESIA", "CHINA", "JAPAN", ""]
-            for loc in location_words:
-                name = name.replace(loc, "")
-            # Hapus kata-kata umum
-            common_words = ["PT", "BANK", "PERSERO", "TBK", "LIMITED", "LTD"]
-            for word in common_words:
-                name = name.replace(word, "")
-            return name.strip()
-
-        clean_bank = clean_bank_name(bank_name)
-        clean_reference = clean_bank_name(reference_bank_name)
+        clean_bank = self.classification_cache.get_or_compute(
+            ("clean_bank_code_name", bank_name), lambda: self.clean_bank_code_name(bank_name)
+        )
 
         return clean_reference in clean_bank or clean_bank in clean_reference
 
+    def clean_bank_code_name(self, name):
+        """
+        Bersihkan nama bank untuk dibandingkan dengan nama referensi sandi bank:
+        hapus tanda baca, kata lokasi/negara dan kata umum seperti PT atau BANK.
+        """
+        return strip_bank_code_words(self.normalize_name(name))
+
     def is_same_bank(self, bank1, bank2):
         """
         Memeriksa apakah dua nama bank merujuk ke bank yang sama
 
+        Hasilnya setara dengan algoritma asli (clean_bank_name + SequenceMatcher);
+        cek dengan: python benchmark_similarity.py --same-bank
+
         Args:
             bank1 (str): Nama bank pertama.
             bank2 (str): Nama bank kedua.
@@ -141,38 +452,8 @@ class DataValidator:
         if pd.isna(bank1) or pd.isna(bank2) or str(bank1).strip() == '' or str(bank2).strip() == '':
             return False
 
-        try:
-            clean_bank1 = self.clean_bank_name(str(bank1))
-            clean_bank2 = self.clean_bank_name(str(bank2))
-        except (ValueError, AttributeError):
-            return False
-
-        def clean_bank_name(name):
-            name = str(name).upper()
-            name = re.sub(r"[^\w\s]", " ", name)
-            name = " ".join(name.split())
-            common_words = [
-                "PT",
-                "BANK",
-                "PERSERO",
-                "(PERSERO)",
-                "TBK",
-                "INCORPORATION",
-                "CORPORATION",
-                "LTD",
-                "LIMITED",
-                "INCORPORATED", 
-            ]
-            for word in common_words:
-                name = name.replace(f" {word} ", " ")
-                if name.startswith(f"{word} "):
-                    name = name[len(word) :].strip()
-                if name.endswith(f" {word}"):
-                    name = name[: -len(word)].strip()
-            return name
-
-        clean_bank1 = clean_bank_name(bank1)
-        clean_bank2 = clean_bank_name(bank2)
+        clean_bank1 = strip_bank_words(self.normalize_name(bank1))
+        clean_bank2 = strip_bank_words(self.normalize_name(bank2))
 
         if clean_bank1 == clean_bank2:
             return True
@@ -196,10 +477,7 @@ class DataValidator:
         ):
             return True
 
-        return (
-            SequenceMatcher(None, clean_bank1, clean_bank2).ratio()
-            > self.fuzzy_match_threshold
-        )
+        return ratio_exceeds(clean_bank1, clean_bank2, self.fuzzy_match_threshold)
 
     def is_n1_category(self, stt_value):
         """
@@ -211,7 +489,7 @@ class DataValidator:
         Returns:
             bool: True jika termasuk kategori N1, False jika tidak.
         """
-        return str(stt_value) in ["1NNN", "1000", "1901", "1902", "1903", "1904", "1905", "1911", "1912", "1906", "1907", "2NNN", "2000", "2901", "2902", "2903", "2904", "2905", "2911", "2912", "2906", "2907"]
+        return str(stt_value) in db_utils.N1_STT_CODES
 
     def is_category_allowed_for_stt(self, stt, category):
         """
@@ -244,62 +522,28 @@ class DataValidator:
             
         # Ubah ke uppercase untuk konsistensi
         word = word.upper()
-        text = text.upper()
-
-        # Daftar kata pendek yang harus persis berdiri sendiri
-        short_keywords = {
-            "PT", "WHO", "UN", "TBK", "CV", "LTD", "INC", "CORP", "CO", 
-            "LLC", "PTE", "PVT", "BV", "NV", "SA", "GMBH", "AG", "SL", 
-            "SRL", "SAS", "SARL", "SPA", "SNC", "SCS", "SCA", "SAR", 
-            "SASU", "SARLU"
-        }
-        
+        # Teks dinormalisasi sekali per nama (tanda baca jadi spasi, spasi tunggal)
+        normalized = self.normalize_name(text)
+
         # Jika keyword adalah kata pendek, lakukan pengecekan lebih ketat
-        if word in short_keywords:
-            # Bersihkan teks dari karakter khusus kecuali underscore
-            text = re.sub(r'[^\w\s]', ' ', text)
-            # Normalisasi spasi menjadi single space
-            text = ' '.join(text.split())
-            # Tambahkan spasi di awal dan akhir untuk memudahkan pengecekan
-            text = f" {text} "
-            
-            # Cari semua kemunculan kata dengan word boundaries
-            matches = re.finditer(fr'\b{re.escape(word)}\b', text)
-            
-            for match in matches:
-                # Ambil karakter sebelum dan sesudah match
-                start, end = match.span()
-                # Periksa apakah kata benar-benar berdiri sendiri
-                if text[start-1] == " " and text[end] == " ":
-                    return True
-            return False
-            
+        if word in SHORT_KEYWORDS:
+            # Kata pendek harus sama persis dengan salah satu token
+            return word in normalized.token_set
+
         # Untuk kata-kata normal atau multi-word keywords
-        else:
-            # Bersihkan teks dari karakter khusus
-            text = re.sub(r'[^\w\s]', ' ', text)
-            # Normalisasi spasi
-            text = ' '.join(text.split())
-            # Tambahkan spasi di awal dan akhir
-            text = f" {text} "
-            # Cari kata dengan spasi di sekitarnya
-            return f" {word} " in text
+        # Cari kata dengan spasi di sekitarnya
+        return f" {word} " in normalized.padded
 
     def check_specific_category(self, name, mapping_dict):
         """
         Memeriksa kategori spesifik berdasarkan keyword, dengan mempertimbangkan prioritas.
         Mengembalikan kategori yang ditemukan atau None jika tidak ada yang cocok.
         """
-        name = str(name).upper()
-        found_categories = {}
-        
-        # Cek semua keyword yang cocok terlebih dahulu
-        for keyword, category in mapping_dict.items():
-            if keyword.upper() in ["PT", "CV", "TBK"]:  # Skip generic company identifiers
-                continue
-            if self.is_standalone_word(keyword, name):
-                if category not in found_categories:
-                    found_categories[category] = keyword
+        name_tokens = self.normalize_name(name).tokens
+        matcher = self.get_category_matcher(mapping_dict)
+
+        # Cari semua keyword yang cocok dalam satu kali scan (PT/CV/TBK dilewati)
+        found_categories = matcher.find_categories(name_tokens)
 
         # Jika ada kategori yang ditemukan, prioritaskan berdasarkan self.category_priority
         if found_categories:
@@ -311,12 +555,7 @@ class DataValidator:
             return next(iter(found_categories.keys()))
                     
         # Jika tidak ada kategori spesifik, cek identifier umum
-        for keyword, category in mapping_dict.items():
-            if keyword.upper() in ["PT", "CV", "TBK"]:
-                if self.is_standalone_word(keyword, name):
-                    return category
-                    
-        return None
+        return matcher.find_generic(name_tokens)
 
     def get_bank_category(self, name, status, bank_code, is_valid_code):
         """
@@ -335,7 +574,7 @@ class DataValidator:
             tuple: (suggested_category, suggested_status)
         """
         # Cek dulu status yang disarankan
-        suggested_statuses = self.get_suggested_status(name)
+        suggested_statuses = self.get_cached_suggested_status(name)
         
         # Jika ada saran status
         if suggested_statuses:
@@ -370,7 +609,7 @@ class DataValidator:
             return "E0"  # Jika bukan bank, sarankan E0
             
         # Cek status untuk konfirmasi bank luar negeri
-        suggested_statuses = self.get_suggested_status(name)
+        suggested_statuses = self.get_cached_suggested_status(name)
         
         # Jika ada suggested status
         if suggested_statuses:
@@ -391,20 +630,747 @@ class DataValidator:
         
         return "E0"  # Default jika tidak ada informasi yang cukup
 
-    def process_file(self, input_file):
+    def _validate_frame(self, df):
+        """
+        Validasi DataFrame secara kolumnar.
+
+        Aturan yang tidak bergantung pada analisis nama (N1, STT exception,
+        I0, deteksi "BANK" dan gate C2) dihitung sebagai mask NumPy untuk
+        seluruh kolom sekaligus. Hanya baris yang benar-benar membutuhkan
+        analisis nama yang diproses satu per satu.
+
+        Args:
+            df (DataFrame): Data yang akan divalidasi.
+
+        Returns:
+            list: List hasil validasi dengan urutan yang sama seperti
+                validasi baris per baris.
+        """
+        row_count = len(df)
+        if row_count == 0:
+            return []
+
+        def column(name):
+            if name in df.columns:
+                return df[name].to_numpy(dtype=object)
+            return np.full(row_count, "", dtype=object)
+
+        def upper_text(values):
+            return pd.Series(values, dtype=object).map(str).str.upper()
+
+        def contains_text(upper_values, text):
+            return upper_values.str.contains(text, regex=False).to_numpy(dtype=bool)
+
+        def is_in(values, options):
+            mask = np.zeros(row_count, dtype=bool)
+            for option in options:
+                mask |= values == option
+            return mask
+
+        nama_penerima = column(COL_NAMA_PENERIMA)
+        nama_pembayar = column(COL_NAMA_PEMBAYAR)
+        kategori_penerima = column(COL_KATEGORI_PENERIMA)
+        kategori_pembayar = column(COL_KATEGORI_PEMBAYAR)
+        status_penerima = column(COL_STATUS_PENERIMA)
+        status_pembayar = column(COL_STATUS_PEMBAYAR)
+        bank_codes = column(COL_KODE_BANK)
+        row_numbers = (df.index + 2).tolist()
+
+        stt_text = pd.Series(column(COL_STT), dtype=object).map(str)
+        penerima_status = upper_text(status_penerima).to_numpy(dtype=object)
+        pembayar_status = upper_text(status_pembayar).to_numpy(dtype=object)
+        nama_penerima_upper = upper_text(nama_penerima)
+        nama_pembayar_upper = upper_text(nama_pembayar)
+
+        # N1: paksa kedua kategori menjadi N1 dan lewati semua pengecekan lain
+        is_n1 = stt_text.isin(db_utils.N1_STT_CODES).to_numpy()
+        is_regular = ~is_n1
+
+        # Kategori paksaan dan kategori yang diizinkan berdasarkan STT
+        forced_first = {
+            stt: categories[0]
+            for stt, categories in self.stt_category_exceptions.items()
+            if categories
+        }
+        forced_category = stt_text.map(forced_first).to_numpy(dtype=object)
+        has_forced = is_regular & pd.notna(forced_category)
+        is_allowed = np.zeros(row_count, dtype=bool)
+        for stt, categories in self.stt_category_exceptions.items():
+            is_allowed |= (stt_text == stt).to_numpy() & is_in(kategori_penerima, categories)
+        is_allowed &= is_regular
+
+        is_i0 = (
+            is_regular
+            & ~is_allowed
+            & (nama_penerima == nama_pembayar)
+            & (penerima_status == pembayar_status)
+        )
+
+        is_penerima_bank = (
+            contains_text(nama_penerima_upper, "BANK")
+            & (kategori_penerima != "F1")
+            & (kategori_penerima != "C0")
+        )
+        is_pembayar_bank = (
+            contains_text(nama_pembayar_upper, "BANK")
+            & (kategori_pembayar != "F1")
+            & (kategori_pembayar != "C0")
+        )
+
+        suggested_penerima = np.full(row_count, None, dtype=object)
+        suggested_pembayar = np.full(row_count, None, dtype=object)
+        suggested_pembayar[is_allowed] = kategori_pembayar[is_allowed]
+        suggested_pembayar[is_i0] = "I0"
+
+        # Analisis nama hanya untuk baris yang belum diputuskan oleh mask
+        penerima_mapping = self.reference_mapping["penerima"]
+        pembayar_mapping = self.reference_mapping["pembayar"]
+        for pos in np.flatnonzero(is_regular & ~is_allowed).tolist():
+            nama_pn = nama_penerima[pos]
+            nama_pb = nama_pembayar[pos]
+            bank_code = bank_codes[pos]
+            penerima_bank = bool(is_penerima_bank[pos])
+            pembayar_bank = bool(is_pembayar_bank[pos])
+            suggested_pn = None
+            suggested_pb = suggested_pembayar[pos]
+            profile_pn = self.classify_name("penerima", nama_pn)
+
+            if not is_i0[pos]:
+                profile_pb = self.classify_name("pembayar", nama_pb)
+                if profile_pn.has_c0:
+                    suggested_pn = "C0"
+                    penerima_bank = False
+                if profile_pb.has_c0:
+                    suggested_pb = "C0"
+                    pembayar_bank = False
+                if suggested_pn is None and profile_pn.has_f1:
+                    suggested_pn = "F1"
+                if suggested_pb is None and profile_pb.has_f1:
+                    suggested_pb = "F1"
+
+                if suggested_pn is None and penerima_bank:
+                    suggested_pn, _ = self.get_bank_category(
+                        nama_pn,
+                        status_penerima[pos],
+                        bank_code,
+                        self.is_valid_bank_code(nama_pn, bank_code)
+                    )
+                    # Bank penerima C1/C2 dan pembayar bank yang sama: kategori berkebalikan
+                    if suggested_pn in ["C1", "C2"] and self.is_same_bank_cached(nama_pn, nama_pb):
+                        suggested_pb = "C2" if suggested_pn == "C1" else "C1"
+
+                if suggested_pb is None and pembayar_bank:
+                    suggested_pb, _ = self.get_bank_category(
+                        nama_pb,
+                        status_pembayar[pos],
+                        bank_code,
+                        self.is_valid_bank_code(nama_pb, bank_code)
+                    )
+
+            if suggested_pn is None and not penerima_bank:
+                suggested_pn = profile_pn.category
+            if suggested_pb is None and not pembayar_bank:
+                suggested_pb = profile_pb.category
+
+            suggested_penerima[pos] = suggested_pn
+            suggested_pembayar[pos] = suggested_pb
+
+        # Validasi khusus kategori C2 pembayar
+        suggested_c2 = np.full(row_count, None, dtype=object)
+        for pos in np.flatnonzero(is_regular & (kategori_pembayar == "C2")).tolist():
+            suggested_c2[pos] = self.validate_c2_category(
+                nama_pembayar[pos],
+                status_pembayar[pos],
+                bank_codes[pos],
+                self.is_valid_bank_code(nama_pembayar[pos], bank_codes[pos])
+            )
+
+        # Saran status, kecuali untuk nama yang mengandung LTD
+        def suggest_status(names, names_upper, current_status):
+            suggested = np.full(row_count, None, dtype=object)
+            has_ltd = contains_text(names_upper, "LTD")
+            for pos in np.flatnonzero(is_regular & ~has_ltd).tolist():
+                statuses = self.get_cached_suggested_status(names[pos])
+                if statuses and current_status[pos] not in statuses:
+                    suggested[pos] = " or ".join(statuses)
+            return suggested
+
+        suggested_status_penerima = suggest_status(nama_penerima, nama_penerima_upper, penerima_status)
+        suggested_status_pembayar = suggest_status(nama_pembayar, nama_pembayar_upper, pembayar_status)
+
+        def is_set(values):
+            return np.fromiter((bool(value) for value in values), dtype=bool, count=row_count)
+
+        # (mask, kolom, current, suggested, name, status) sesuai urutan pengecekan per baris
+        rules = [
+            (is_n1 & (kategori_penerima != "N1"), COL_KATEGORI_PENERIMA,
+             kategori_penerima, "N1", nama_penerima, "N1"),
+            (is_n1 & (kategori_pembayar != "N1"), COL_KATEGORI_PEMBAYAR,
+             kategori_pembayar, "N1", nama_pembayar, "N1"),
+            (has_forced & (kategori_penerima != forced_category), COL_KATEGORI_PENERIMA,
+             kategori_penerima, forced_category, nama_penerima, status_penerima),
+            (is_set(suggested_penerima) & (kategori_penerima != suggested_penerima), COL_KATEGORI_PENERIMA,
+             kategori_penerima, suggested_penerima, nama_penerima, penerima_status),
+            (is_set(suggested_pembayar) & (kategori_pembayar != suggested_pembayar), COL_KATEGORI_PEMBAYAR,
+             kategori_pembayar, suggested_pembayar, nama_pembayar, pembayar_status),
+            (is_set(suggested_c2), COL_KATEGORI_PEMBAYAR,
+             "C2", suggested_c2, nama_pembayar, status_pembayar),
+            (is_set(suggested_status_penerima), COL_STATUS_PENERIMA,
+             penerima_status, suggested_status_penerima, nama_penerima, penerima_status),
+            (is_set(suggested_status_pembayar), COL_STATUS_PEMBAYAR,
+             pembayar_status, suggested_status_pembayar, nama_pembayar, pembayar_status),
+        ]
+
+        # Urutkan temuan per baris, lalu per urutan aturan
+        order_keys = np.sort(np.concatenate([
+            np.flatnonzero(rule[0]) * len(rules) + rule_index
+            for rule_index, rule in enumerate(rules)
+        ]))
+
+        def value_at(values, pos):
+            return values[pos] if isinstance(values, np.ndarray) else values
+
+        validation_results = []
+        for key in order_keys.tolist():
+            pos, rule_index = divmod(key, len(rules))
+            _, column_name, current, suggested, name, status = rules[rule_index]
+            validation_results.append({
+                "row": row_numbers[pos],
+                "column": column_name,
+                "current": value_at(current, pos),
+                "suggested": value_at(suggested, pos),
+                "name": name[pos],
+                "bank_code": bank_codes[pos],
+                "status": value_at(status, pos),
+            })
+        return validation_results
+
+    def _validate_unique_rows(self, df):
+        """
+        Validasi DataFrame dengan menggabungkan baris yang identik pada semua
+        kolom aturan (RULE_COLUMNS): teks str() dan tipe setiap nilainya sama.
+
+        Setiap kombinasi unik divalidasi sekali lewat _validate_frame, lalu
+        temuannya disalin ke semua baris dengan kombinasi yang sama dengan
+        nomor baris masing-masing. Urutan temuan tetap per baris lalu per aturan.
+
+        Args:
+            df (DataFrame): Data yang akan divalidasi, index asli dipertahankan.
+
+        Returns:
+            list: List hasil validasi, sama seperti _validate_frame(df).
+        """
+        row_count = len(df)
+        rule_columns = [col for col in RULE_COLUMNS if col in df.columns]
+        if row_count == 0 or not rule_columns:
+            self.dedup_stats["rows"] += row_count
+            self.dedup_stats["unique_rows"] += row_count
+            return self._validate_frame(df)
+
+        # Kode per kolom dari teks str() yang dipakai aturan dan tipe nilainya:
+        # factorize nilai mentah akan menyamakan 1, 1.0 dan True, padahal teks
+        # ("1", "1.0", "True") dan hasil aturannya bisa berbeda. Lalu kode
+        # gabungan per baris.
+        column_codes = np.column_stack([
+            codes
+            for col in rule_columns
+            for codes in (
+                pd.factorize(df[col].astype(str))[0],
+                pd.factorize(df[col].map(type))[0],
+            )
+        ])
+        _, first_positions, group_ids = np.unique(
+            column_codes, axis=0, return_index=True, return_inverse=True
+        )
+        group_ids = group_ids.reshape(-1)
+        unique_positions = np.sort(first_positions)
+
+        self.dedup_stats["rows"] += row_count
+        self.dedup_stats["unique_rows"] += len(unique_positions)
+        if len(unique_positions) == row_count:
+            return self._validate_frame(df)
+
+        unique_findings = {}
+        for result in self._validate_frame(df.iloc[unique_positions]):
+            unique_findings.setdefault(result["row"], []).append(result)
+
+        row_numbers = (df.index + 2).tolist()
+        validation_results = []
+        for pos, group_id in enumerate(group_ids.tolist()):
+            findings = unique_findings.get(row_numbers[first_positions[group_id]])
+            if not findings:
+                continue
+            for result in findings:
+                validation_results.append({**result, "row": row_numbers[pos]})
+        return validation_results
+
+    def iter_validated_batches(self, batches):
+        """
+        Validasi batch-batch DataFrame secara berurutan.
+
+        Batch divalidasi serial sampai jumlah baris melewati parallel_min_rows;
+        setelah itu (jika parallel_workers > 1) batch berikutnya dikirim ke
+        process pool. Jumlah batch yang sedang diproses dibatasi agar memori
+        tetap kecil, dan hasil selalu dikembalikan sesuai urutan batch.
+
+        Args:
+            batches (iterable): DataFrame per batch dengan index asli.
+
+        Yields:
+            tuple: (batch, findings) untuk setiap batch.
+        """
+        self.run_stats["workers"] = 1
+        executor = None
+        pending = deque()
+        rows_seen = 0
+        try:
+            for batch in batches:
+                rows_seen += len(batch)
+                if (
+                    executor is None
+                    and self.parallel_workers > 1
+                    and rows_seen > self.parallel_min_rows
+                ):
+                    executor = ProcessPoolExecutor(
+                        max_workers=self.parallel_workers,
+                        initializer=_init_worker,
+                        initargs=(self.fuzzy_match_threshold, self.get_reference_state()),
+                    )
+                    self.run_stats["workers"] = self.parallel_workers
+
+                if executor is None:
+                    yield batch, self._validate_unique_rows(batch)
+                    continue
+
+                # Hanya kolom yang dibaca aturan validasi yang dikirim ke worker
+                rule_batch = batch[[col for col in RULE_COLUMNS if col in batch.columns]]
+                pending.append((batch, executor.submit(_validate_chunk, rule_batch)))
+                while len(pending) > self.parallel_workers * 2:
+                    yield self._collect_batch(*pending.popleft())
+
+            while pending:
+                yield self._collect_batch(*pending.popleft())
+        finally:
+            if executor is not None:
+                executor.shutdown(cancel_futures=True)
+
+    def _collect_batch(self, batch, future):
+        """Ambil hasil validasi batch dari worker dan catat statistik cache-nya."""
+        findings, cache_counts, dedup_stats = future.result()
+        for cache, (hits, misses) in zip(self._run_caches(), cache_counts):
+            cache.hits += hits
+            cache.misses += misses
+        for key, value in dedup_stats.items():
+            self.dedup_stats[key] += value
+        return batch, findings
+
+    def _run_caches(self):
+        """Cache yang statistiknya dilaporkan per run."""
+        return (self.classification_cache, self.bank_pair_cache)
+
+    def write_bank_files(
+        self, bank_jobs, main_writer, report_progress=None, cancel_token=None, checkpoint=None
+    ):
+        """
+        Tulis file hasil validasi per bank, secara paralel jika ada beberapa worker.
+
+        Workbook utama disimpan selagi worker menulis file per bank. Kegagalan
+        satu file bank hanya dicatat di laporannya dan tidak menghentikan
+        penulisan file bank lainnya.
+
+        Args:
+            bank_jobs (list): Tuple (bank_code, split_file, columns, partition),
+                dengan partition berupa BankPartition di file spill.
+            main_writer (ExcelStreamWriter): Writer workbook utama yang belum
+                disimpan, atau None jika sudah disimpan di run sebelumnya.
+            report_progress (callable, optional): Dipanggil dengan (stage, details)
+                saat workbook utama disimpan ("write_main") dan setiap file bank
+                selesai ("split").
+            cancel_token (CancellationToken, optional): Diperiksa sebelum setiap file bank.
+            checkpoint (ValidationCheckpoint, optional): Mencatat workbook utama
+                dan file bank yang sudah selesai ditulis.
+
+        Returns:
+            list: Laporan per file bank (bank_code, file, rows, seconds, error).
+        """
+        report_progress = report_progress or (lambda stage, details: None)
+        workers = min(self.split_workers, len(bank_jobs))
+        reports = []
+
+        def file_done(report):
+            reports.append(report)
+            if report["error"] is None:
+                if checkpoint is not None:
+                    checkpoint.mark_bank_file(report["bank_code"])
+                self._emit(
+                    "file_written",
+                    kind="bank",
+                    bank_code=report["bank_code"],
+                    file=report["file"],
+                    rows=report["rows"],
+                    seconds=report["seconds"],
+                )
+            report_progress("split", {"files_done": len(reports), "files_total": len(bank_jobs)})
+
+        def close_main_writer():
+            if main_writer is None:
+                return
+            report_progress("write_main", {})
+            self._stage_start("write_main")
+            started = time.perf_counter()
+            main_writer.close()
+            if checkpoint is not None:
+                checkpoint.mark_stage("main_written")
+            self._emit(
+                "file_written",
+                kind="main",
+                file=main_writer.output_file,
+                rows=main_writer.rows_written,
+                seconds=time.perf_counter() - started,
+            )
+            self._stage_end("write_main")
+
+        if workers <= 1:
+            close_main_writer()
+            self._stage_start("split")
+            for job in bank_jobs:
+                if cancel_token is not None:
+                    cancel_token.raise_if_cancelled()
+                file_done(_write_bank_file(*job))
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                futures = [executor.submit(_write_bank_file, *job) for job in bank_jobs]
+                # File per bank ditulis worker bersamaan dengan workbook utama
+                self._stage_start("split")
+                close_main_writer()
+                for (bank_code, split_file, _, partition), future in zip(bank_jobs, futures):
+                    if cancel_token is not None and cancel_token.cancelled:
+                        # File yang sedang ditulis worker dibiarkan selesai
+                        executor.shutdown(wait=False, cancel_futures=True)
+                        cancel_token.raise_if_cancelled()
+                    try:
+                        file_done(future.result())
+                    except Exception as e:
+                        # Worker gagal sebelum sempat membuat laporan (mis. proses mati)
+                        file_done({
+                            "bank_code": bank_code,
+                            "file": split_file,
+                            "rows": partition.rows,
+                            "seconds": None,
+                            "error": str(e),
+                        })
+
+        self._stage_end("split")
+        for report in reports:
+            if report["error"]:
+                logging.error(
+                    f"Gagal menulis file bank {report['bank_code']} "
+                    f"({report['file']}): {report['error']}"
+                )
+        return reports
+
+    def _start_run(self):
+        """Persiapan setiap run: reload reference data dan reset statistik."""
+        self.reload_reference_data()  # Pastikan memuat ulang mapping setiap kali proses
+        for cache in self._run_caches():
+            cache.reset_stats()
+        self.dedup_stats = {"rows": 0, "unique_rows": 0}
+
+    def _finish_run_stats(self, row_count, finding_count):
+        """Lengkapi run_stats dengan jumlah baris, temuan, cache dan dedup."""
+        self.run_stats.update({
+            "rows": row_count,
+            "findings": finding_count,
+            "classification_cache": self.classification_cache.stats(),
+            "bank_pair_cache": self.bank_pair_cache.stats(),
+            "dedup": {
+                **self.dedup_stats,
+                "ratio": (
+                    self.dedup_stats["rows"] / self.dedup_stats["unique_rows"]
+                    if self.dedup_stats["unique_rows"] else 1.0
+                ),
+            },
+        })
+
+    def iter_findings(self, source):
+        """
+        Hasilkan temuan validasi satu per satu, begitu setiap batch selesai
+        divalidasi, tanpa menulis file output.
+
+        Hanya satu batch (dan temuannya) yang ada di memori pada satu waktu,
+        sehingga temuan bisa dialirkan ke file atau queue dengan memori tetap.
+        run_stats diisi setelah generator selesai dikonsumsi.
+
+        Args:
+            source: Path file Excel (.xls/.xlsx), DataFrame, atau iterable of
+                dict dengan kolom/key seperti file input.
+
+        Yields:
+            dict: Temuan (row, column, current, suggested, name, bank_code,
+                status) sesuai urutan baris; row adalah nomor baris seperti di
+                file Excel (posisi baris + 2).
+
+        Raises:
+            ValueError: Jika file, DataFrame atau record tidak memiliki kolom
+                di REQUIRED_COLUMNS.
+        """
+        self._start_run()
+        self.run_stats = {}
+        row_count = finding_count = 0
+        batches = self._iter_source_batches(source)
+        try:
+            for batch, findings in self.iter_validated_batches(batches):
+                row_count += len(batch)
+                finding_count += len(findings)
+                yield from findings
+        finally:
+            batches.close()
+        self._finish_run_stats(row_count, finding_count)
+
+    def _iter_source_batches(self, source):
+        """
+        Batch DataFrame dari sumber iter_findings, dengan index = posisi baris
+        dan nilai kosong sebagai NaN seperti hasil ExcelBatchReader.
+        """
+        if isinstance(source, (str, os.PathLike)):
+            reader = ExcelBatchReader(source, self.batch_rows)
+            try:
+                missing = [col for col in REQUIRED_COLUMNS if col not in reader.columns]
+                if missing:
+                    raise ValueError(f"File Excel tidak memiliki kolom yang dibutuhkan: {', '.join(missing)}")
+                yield from reader
+            finally:
+                reader.close()
+            return
+
+        if isinstance(source, pd.DataFrame):
+            missing = [col for col in REQUIRED_COLUMNS if col not in source.columns]
+            if missing:
+                raise ValueError(f"DataFrame tidak memiliki kolom yang dibutuhkan: {', '.join(missing)}")
+            rule_columns = [col for col in RULE_COLUMNS if col in source.columns]
+            frame = source[rule_columns].reset_index(drop=True)
+            for start in range(0, len(frame), self.batch_rows):
+                yield _as_input_frame(frame.iloc[start:start + self.batch_rows])
+            return
+
+        # Iterable of dict: key wajib dicek di batch pertama; setiap batch
+        # memakai semua kolom aturan, key yang tidak ada menjadi NaN
+        records = iter(source)
+        chunk = list(islice(records, self.batch_rows))
+        if chunk:
+            present = set().union(*chunk)
+            missing = [col for col in REQUIRED_COLUMNS if col not in present]
+            if missing:
+                raise ValueError(f"Record tidak memiliki key yang dibutuhkan: {', '.join(missing)}")
+        start = 0
+        while chunk:
+            frame = pd.DataFrame.from_records(chunk, columns=RULE_COLUMNS)
+            frame.index = pd.RangeIndex(start, start + len(chunk))
+            yield _as_input_frame(frame)
+            start += len(chunk)
+            chunk = list(islice(records, self.batch_rows))
+
+    def validate_dataframe(self, df):
+        """
+        Validasi DataFrame di memori, tanpa membaca atau menulis file.
+
+        Aturan validasi dan urutan temuan sama dengan process_file. Nilai
+        kosong (None, pd.NA) diperlakukan seperti cell kosong di Excel.
+
+        Args:
+            df (DataFrame): Data dengan kolom seperti file input (nama_penerima,
+                kategori_penerima, ...); index boleh apa saja.
+
+        Returns:
+            DataFrame: Satu baris per temuan dengan kolom FINDING_COLUMNS;
+                position adalah posisi baris di df (0-based), index adalah
+                label index-nya.
+
+        Raises:
+            ValueError: Jika kolom di REQUIRED_COLUMNS tidak ada.
+        """
+        return _findings_frame(self.iter_findings(df), df.index)
+
+    def validate_records(self, records):
+        """
+        Validasi iterable of dict (mis. hasil query database) tanpa file I/O.
+
+        Record dibaca per batch_rows sehingga iterable besar (generator) tidak
+        perlu dimuat seluruhnya. Key yang tidak ada di sebuah record dianggap
+        kosong, seperti cell kosong di Excel.
+
+        Args:
+            records (iterable): Dict per baris dengan key seperti kolom file input.
+
+        Returns:
+            DataFrame: Satu baris per temuan dengan kolom FINDING_COLUMNS;
+                position dan index adalah urutan record (0-based).
+
+        Raises:
+            ValueError: Jika key di REQUIRED_COLUMNS tidak ada di batch record
+                pertama.
+        """
+        return _findings_frame(self.iter_findings(records))
+
+    def write_findings_excel(self, df, findings, output_file):
+        """
+        Ekspor opsional hasil validate_dataframe ke file Excel dengan highlight
+        dan comment, sama seperti workbook utama process_file.
+
+        Args:
+            df (DataFrame): Data yang divalidasi.
+            findings (DataFrame): Hasil validate_dataframe(df).
+            output_file (str): Path file .xlsx.
+        """
+        frame = df.reset_index(drop=True)
+        results = [
+            {**finding, "row": finding["position"] + 2}
+            for finding in findings.to_dict("records")
+        ]
+        with ExcelStreamWriter(output_file, frame.columns, HEADER_RENAME_MAP) as writer:
+            writer.write_batch(frame, results)
+
+    def subscribe(self, callback, events=None):
+        """
+        Daftarkan callback untuk event process_file.
+
+        Event (dict dengan key "event" dan "elapsed" = detik sejak run dimulai):
+            - stage_start / stage_end: {"stage", "seconds" (hanya stage_end)};
+              stage: "read", "validate", "write_main", "split"
+            - batch_completed: {"rows", "rows_done", "total_rows", "findings",
+              "seconds" (sejak batch sebelumnya), "resumed"}
+            - finding: {"finding"} untuk setiap ketidaksesuaian
+            - file_written: {"kind" ("main"/"bank"), "file", "rows", "seconds",
+              "bank_code" (hanya bank)}
+
+        Event hanya dibuat jika ada listener, jadi tanpa subscriber tidak ada
+        overhead selain satu lookup dict. Exception dari callback dicatat ke
+        log dan tidak menghentikan validasi.
+
+        Args:
+            callback (callable): Dipanggil dengan dict event, dari thread yang
+                menjalankan process_file.
+            events (iterable, optional): Nama event; default semua (VALIDATION_EVENTS).
+
+        Returns:
+            callable: Fungsi tanpa argumen untuk berhenti berlangganan.
+        """
+        events = VALIDATION_EVENTS if events is None else tuple(events)
+        for event in events:
+            if event not in VALIDATION_EVENTS:
+                raise ValueError(f"Event tidak dikenal: {event}")
+            self._listeners.setdefault(event, []).append(callback)
+
+        def unsubscribe():
+            for event in events:
+                listeners = self._listeners.get(event, [])
+                if callback in listeners:
+                    listeners.remove(callback)
+                if not listeners:
+                    self._listeners.pop(event, None)
+
+        return unsubscribe
+
+    def _emit(self, event, **data):
+        """Kirim event ke semua listener-nya (tidak melakukan apa pun jika tidak ada)."""
+        listeners = self._listeners.get(event)
+        if not listeners:
+            return
+        payload = {"event": event, "elapsed": time.perf_counter() - self._run_started, **data}
+        for callback in list(listeners):
+            try:
+                callback(payload)
+            except Exception:
+                logging.exception(f"Listener event {event} gagal")
+
+    def _stage_start(self, stage):
+        self._stage_started[stage] = time.perf_counter()
+        self._emit("stage_start", stage=stage)
+
+    def _stage_end(self, stage):
+        started = self._stage_started.pop(stage, None)
+        if started is not None and self._listeners.get("stage_end"):
+            self._emit("stage_end", stage=stage, seconds=time.perf_counter() - started)
+
+    def checkpoint_key(self, input_file):
+        """
+        Key checkpoint: hash isi file input dan semua data yang menentukan
+        hasil validasi, sehingga checkpoint lama tidak dipakai jika file atau
+        reference data berubah.
+        """
+        fingerprint = (
+            file_content_hash(input_file),
+            self.reference_snapshot(),
+            sorted((stt, tuple(categories)) for stt, categories in self.stt_category_exceptions.items()),
+            tuple(self.category_priority),
+            self.fuzzy_match_threshold,
+            tuple(db_utils.N1_STT_CODES),
+        )
+        return hashlib.sha256(pickle.dumps(fingerprint)).hexdigest()
+
+    def process_file(
+        self, input_file, progress_callback=None, cancel_token=None, use_checkpoint=None,
+        collect_results=True, output_name=None,
+    ):
         """
         Memproses file Excel dan melakukan validasi.
 
         Args:
             input_file (str): Path ke file Excel input.
+            progress_callback (callable, optional): Dipanggil dengan dict progress
+                {"stage", "rows", "total_rows", "rows_per_sec", ...} di setiap
+                tahap: "read", "validate" (per batch), "write_main" dan "split"
+                (per file bank, dengan files_done dan files_total). Dipanggil
+                dari thread yang menjalankan process_file.
+            cancel_token (CancellationToken, optional): Diperiksa di antara batch
+                dan di antara tahap output; jika dibatalkan, ValidationCancelled
+                dilempar.
+            use_checkpoint (bool, optional): Simpan batch yang sudah divalidasi
+                dan tahap yang selesai ke file .checkpoint di folder output, lalu
+                lanjutkan dari sana jika file yang sama diproses lagi. Default
+                dari config (validation.checkpoint).
+            collect_results (bool): Kumpulkan seluruh temuan sebagai list dict
+                untuk dikembalikan. Jika False, validation_results adalah None
+                dan temuan hanya ditampung di file spill per bank; gunakan
+                subscribe("finding") atau iter_findings untuk stream.
+            output_name (str, optional): Nama dasar folder dan file output
+                (Output/<output_name>_<tahun>_<bulan>_validated). Default nama
+                file input tanpa ekstensi.
 
         Returns:
             tuple: (output_file, error_count, validation_results)
                 - output_file (str): Path ke file Excel output.
                 - error_count (int): Jumlah error yang ditemukan.
-                - validation_results (list): List hasil validasi.
+                - validation_results (list): List hasil validasi, atau None.
         """
-        self.reload_reference_data()  # Pastikan memuat ulang mapping setiap kali proses
+        self._start_run()
+        if use_checkpoint is None:
+            use_checkpoint = self.checkpoint_enabled
+        if output_name is None:
+            output_name = os.path.splitext(os.path.basename(input_file))[0]
+        checkpoint = None
+        writer = None
+        spill = None
+        resumed = validated = None
+        started = self._run_started = time.perf_counter()
+        self._stage_started = {}
+        progress = {"rows": 0, "total_rows": None}
+
+        def check_cancelled():
+            if cancel_token is not None:
+                cancel_token.raise_if_cancelled()
+
+        def report_progress(stage, details=None):
+            if progress_callback is None:
+                return
+            elapsed = time.perf_counter() - started
+            progress_callback({
+                "stage": stage,
+                **progress,
+                "rows_per_sec": progress["rows"] / elapsed if elapsed else 0.0,
+                **(details or {}),
+            })
+
         try:
             # Validasi file exists dan extension
             if not os.path.exists(input_file):
@@ -417,433 +1383,280 @@ class DataValidator:
                     "Silakan pilih file asli (tanpa suffix '_validated')"
                 )
 
-            df = pd.read_excel(input_file)
-            
-            # Get year and month from dataframe
-            if "tahun" not in df.columns or "bulan" not in df.columns:
-                raise ValueError(f"File Excel harus memiliki kolom tahun dan bulan")
-            
-            # Get first non-null values for year and month
-            tahun = df["tahun"].dropna().iloc[0] if not df["tahun"].isna().all() else ""
-            bulan = df["bulan"].dropna().iloc[0] if not df["bulan"].isna().all() else ""
-            
-            # Validate year and month
-            try:
-                tahun = int(tahun)
-                bulan = int(bulan)
-                if not (2000 <= tahun <= 2100) or not (1 <= bulan <= 12):
-                    raise ValueError
-            except (ValueError, TypeError):
-                raise ValueError("Nilai tahun atau bulan tidak valid")
-
-            # Generate dan buat folder output
-            output_parent_folder = "Output"
-            os.makedirs(output_parent_folder, exist_ok=True)
-            output_folder_name = os.path.join(
-                output_parent_folder,
-                f"{os.path.splitext(os.path.basename(input_file))[0]}_{tahun}_{str(bulan).zfill(2)}_validated"
-            )
-            os.makedirs(output_folder_name, exist_ok=True)
-            output_file = os.path.join(
-                output_folder_name,
-                os.path.basename(os.path.splitext(input_file)[0]) + f"_{tahun}_{str(bulan).zfill(2)}_validated.xlsx"
-            )
-            
-            # Check if output file is currently open
-            try:
-                with open(output_file, 'a+b') as f:
-                    pass
-            except PermissionError:
-                raise PermissionError(
-                    f"File hasil validasi '{os.path.basename(output_file)}' sedang terbuka.\n"
-                    "Silakan tutup file tersebut terlebih dahulu."
-                )
-
             if not input_file.lower().endswith(('.xls', '.xlsx')):
                 raise ValueError("Format file harus Excel (.xls atau .xlsx)")
 
-            df = pd.read_excel(input_file)
-            
-            # Validasi minimal rows
-            if len(df) == 0:
-                raise ValueError("File Excel kosong")
-                
-            required_columns = [
-                "nama_penerima",
-                "kategori_penerima",
-                "nama_pembayar",
-                "kategori_pembayar",
-                "stt",
-            ]
-            if not all(col in df.columns for col in required_columns):
-                raise Exception(
-                    f"File Excel tidak memiliki kolom yang dibutuhkan: {', '.join(required_columns)}"
-                )
-
-            output_df = df.copy()
-            validation_results = []
-
-            for idx, row in df.iterrows():
-                # Check N1 first, if true then skip all other checks
-                if self.is_n1_category(row.get("stt", "")):
-                    # If N1, force both categories and statuses to N1
-                    if row["kategori_penerima"] != "N1":
-                        validation_results.append({
-                            "row": idx + 2,
-                            "column": "kategori_penerima",
-                            "current": row["kategori_penerima"],
-                            "suggested": "N1",
-                            "name": row["nama_penerima"],
-                            "bank_code": row.get("cKdBank", ""),
-                            "status": "N1",
-                        })
-                    if row["kategori_pembayar"] != "N1":
-                        validation_results.append({
-                            "row": idx + 2,
-                            "column": "kategori_pembayar",
-                            "current": row["kategori_pembayar"],
-                            "suggested": "N1",
-                            "name": row["nama_pembayar"],
-                            "bank_code": row.get("cKdBank", ""),
-                            "status": "N1",
-                        })
-                    continue  # Skip all other validation checks for this row
-
-                stt_value = row.get("stt", "")
-                forced_categories = self.stt_category_exceptions.get(str(stt_value), [])
-
-                if forced_categories:
-                    # Ambil kategori pertama dari daftar
-                    forced_category = forced_categories[0]
-                    if row["kategori_penerima"] != forced_category:
-                        validation_results.append({
-                            "row": idx + 2,
-                            "column": "kategori_penerima",
-                            "current": row["kategori_penerima"],
-                            "suggested": forced_category,
-                            "name": row["nama_penerima"],
-                            "bank_code": row.get("cKdBank", ""),
-                            "status": row.get("status_penerima", "")
-                        })
-
-                is_penerima_bank = (
-                    "BANK" in str(row[COL_NAMA_PENERIMA]).upper() 
-                    and row[COL_KATEGORI_PENERIMA] not in ["F1", "C0"]
-                )
-                is_pembayar_bank = (
-                    "BANK" in str(row[COL_NAMA_PEMBAYAR]).upper() 
-                    and row[COL_KATEGORI_PEMBAYAR] not in ["F1", "C0"]
-                )
-                is_valid_bank_code_penerima = self.validate_bank_code(
-                    row[COL_NAMA_PENERIMA], row.get(COL_KODE_BANK, "")
+            # File dibaca sekali, per batch, tanpa memuat seluruh isi ke memori
+            reader = ExcelBatchReader(input_file, self.batch_rows)
+            progress["total_rows"] = reader.total_rows
+            report_progress("read")
+            self._stage_start("read")
+            try:
+                # Get year and month from dataframe
+                if "tahun" not in reader.columns or "bulan" not in reader.columns:
+                    raise ValueError(f"File Excel harus memiliki kolom tahun dan bulan")
+
+                # Get first non-null values for year and month
+                batches = iter(reader)
+                buffered_batches = []
+                tahun = bulan = None
+                for batch in batches:
+                    buffered_batches.append(batch)
+                    if tahun is None and batch["tahun"].notna().any():
+                        tahun = batch["tahun"].dropna().iloc[0]
+                    if bulan is None and batch["bulan"].notna().any():
+                        bulan = batch["bulan"].dropna().iloc[0]
+                    if tahun is not None and bulan is not None:
+                        break
+
+                # Validate year and month
+                try:
+                    tahun = int(tahun if tahun is not None else "")
+                    bulan = int(bulan if bulan is not None else "")
+                    if not (2000 <= tahun <= 2100) or not (1 <= bulan <= 12):
+                        raise ValueError
+                except (ValueError, TypeError):
+                    raise ValueError("Nilai tahun atau bulan tidak valid")
+
+                # Generate dan buat folder output
+                output_parent_folder = "Output"
+                os.makedirs(output_parent_folder, exist_ok=True)
+                output_folder_name = os.path.join(
+                    output_parent_folder,
+                    f"{output_name}_{tahun}_{str(bulan).zfill(2)}_validated"
                 )
-                is_valid_bank_code_pembayar = self.validate_bank_code(
-                    row[COL_NAMA_PEMBAYAR], row.get(COL_KODE_BANK, "")
+                os.makedirs(output_folder_name, exist_ok=True)
+                output_file = os.path.join(
+                    output_folder_name,
+                    output_name + f"_{tahun}_{str(bulan).zfill(2)}_validated.xlsx"
                 )
-                penerima_status = str(row.get(COL_STATUS_PENERIMA, "")).upper()
-                pembayar_status = str(row.get(COL_STATUS_PEMBAYAR, "")).upper()
-                is_same_bank = self.is_same_bank(row[COL_NAMA_PENERIMA], row[COL_NAMA_PEMBAYAR])
-
-                suggested_category_penerima = None
-                suggested_category_pembayar = None
-
-                if suggested_category_pembayar is None:
-                    # Add check for STT category exceptions before the main validation logic
-                    if self.is_category_allowed_for_stt(row.get("stt", ""), row.get("kategori_penerima", "")):
-                        # Skip validation for kategori_penerima if it's allowed for this STT
-                        suggested_category_penerima = None
-                        suggested_category_pembayar = row.get("kategori_pembayar", "")  # Keep original validation for pembayar
-                    else:
-                        if (
-                            row["nama_penerima"] == row["nama_pembayar"]
-                            and penerima_status == pembayar_status
-                        ):
-                            suggested_category_pembayar = "I0"
-                        else:
-                            for central_bank_keyword in self.reference_mapping["penerima"]:
-                                if central_bank_keyword.upper() == "C0":
-                                    continue
-                                if (
-                                    central_bank_keyword.upper()
-                                    in str(row["nama_penerima"]).upper()
-                                    and self.reference_mapping["penerima"][
-                                        central_bank_keyword
-                                    ]
-                                    == "C0"
-                                ):
-                                    suggested_category_penerima = "C0"
-                                    is_penerima_bank = False
-                                    break
-
-                            for central_bank_keyword in self.reference_mapping["pembayar"]:
-                                if central_bank_keyword.upper() == "C0":
-                                    continue
-                                if (
-                                    central_bank_keyword.upper()
-                                    in str(row["nama_pembayar"]).upper()
-                                    and self.reference_mapping["pembayar"][
-                                        central_bank_keyword
-                                    ]
-                                    == "C0"
-                                ):
-                                    suggested_category_pembayar = "C0"
-                                    is_pembayar_bank = False
-                                    break
-
-                            if suggested_category_penerima is None:
-                                for q1_bank_keyword in self.reference_mapping["penerima"]:
-                                    if q1_bank_keyword.upper() == "F1":
-                                        continue
-                                    if (
-                                        q1_bank_keyword.upper()
-                                        in str(row["nama_penerima"]).upper()
-                                        and self.reference_mapping["penerima"][
-                                            q1_bank_keyword
-                                        ]
-                                        == "F1"
-                                    ):
-                                        suggested_category_penerima = "F1"
-                                        break
-
-                            if suggested_category_pembayar is None:
-                                for q1_bank_keyword in self.reference_mapping["pembayar"]:
-                                    if q1_bank_keyword.upper() == "F1":
-                                        continue
-                                    if (
-                                        q1_bank_keyword.upper()
-                                        in str(row["nama_pembayar"]).upper()
-                                        and self.reference_mapping["pembayar"][
-                                            q1_bank_keyword
-                                        ]
-                                        == "F1"
-                                    ):
-                                        suggested_category_pembayar = "F1"
-                                        break
-
-                            if suggested_category_penerima is None and is_penerima_bank:
-                                suggested_category_penerima, suggested_status_penerima = self.get_bank_category(
-                                    row["nama_penerima"],
-                                    row.get("status_penerima", ""),
-                                    row.get("cKdBank", ""),
-                                    is_valid_bank_code_penerima
-                                )
-                                
-                                if suggested_category_penerima:
-                                    # Jika ini bank penerima dengan kategori C1 atau C2,
-                                    # dan pembayar adalah bank yang sama
-                                    if (suggested_category_penerima in ["C1", "C2"] and 
-                                        self.is_same_bank(row["nama_penerima"], row["nama_pembayar"])):
-                                        # Sarankan kategori pembayar berdasarkan kategori penerima
-                                        if suggested_category_penerima == "C1":
-                                            suggested_category_pembayar = "C2"
-                                        else:
-                                            suggested_category_pembayar = "C1"
-
-                            if suggested_category_pembayar is None and is_pembayar_bank:
-                                suggested_category_pembayar, suggested_status_pembayar = self.get_bank_category(
-                                    row["nama_pembayar"],
-                                    row.get("status_pembayar", ""),
-                                    row.get("cKdBank", ""),
-                                    is_valid_bank_code_pembayar
-                                )
-
-                        if suggested_category_penerima is None and not is_penerima_bank:
-                            suggested_category_penerima = self.check_specific_category(
-                                row["nama_penerima"], 
-                                self.reference_mapping["penerima"]
-                            )
-
-                        if suggested_category_pembayar is None and not is_pembayar_bank:
-                            suggested_category_pembayar = self.check_specific_category(
-                                row["nama_pembayar"], 
-                                self.reference_mapping["pembayar"]
-                            )
 
-                if (
-                    suggested_category_penerima
-                    and row["kategori_penerima"] != suggested_category_penerima
-                ):
-                    validation_results.append(
-                        {
-                            "row": idx + 2,
-                            "column": "kategori_penerima",
-                            "current": row["kategori_penerima"],
-                            "suggested": suggested_category_penerima,
-                            "name": row["nama_penerima"],
-                            "bank_code": row.get("cKdBank", ""),
-                            "status": penerima_status,
-                        }
+                # Check if output file is currently open
+                try:
+                    with open(output_file, 'a+b') as f:
+                        pass
+                except PermissionError:
+                    raise PermissionError(
+                        f"File hasil validasi '{os.path.basename(output_file)}' sedang terbuka.\n"
+                        "Silakan tutup file tersebut terlebih dahulu."
                     )
 
-                if (
-                    suggested_category_pembayar
-                    and row["kategori_pembayar"] != suggested_category_pembayar
-                ):
-                    validation_results.append(
-                        {
-                            "row": idx + 2,
-                            "column": "kategori_pembayar",
-                            "current": row["kategori_pembayar"],
-                            "suggested": suggested_category_pembayar,
-                            "name": row["nama_pembayar"],
-                            "bank_code": row.get("cKdBank", ""),
-                            "status": pembayar_status,
-                        }
-                    )
+                # Validasi minimal rows
+                if not buffered_batches:
+                    raise ValueError("File Excel kosong")
 
-                # Tambahkan validasi khusus untuk kategori C2
-                if row["kategori_pembayar"] == "C2":
-                    suggested_category = self.validate_c2_category(
-                        row["nama_pembayar"],
-                        row.get("status_pembayar", ""),
-                        row.get("cKdBank", ""),
-                        is_valid_bank_code_pembayar
+                if not all(col in reader.columns for col in REQUIRED_COLUMNS):
+                    raise Exception(
+                        f"File Excel tidak memiliki kolom yang dibutuhkan: {', '.join(REQUIRED_COLUMNS)}"
                     )
-                    if suggested_category:
-                        validation_results.append({
-                            "row": idx + 2,
-                            "column": "kategori_pembayar",
-                            "current": "C2",
-                            "suggested": suggested_category,
-                            "name": row["nama_pembayar"],
-                            "bank_code": row.get("cKdBank", ""),
-                            "status": row.get("status_pembayar", ""),
-                        })
 
-                # Check status penerima
-                suggested_status_penerima = self.get_suggested_status(row["nama_penerima"])
-                current_status_penerima = str(row.get("status_penerima", "")).upper()
-                
-                if "LTD" not in str(row["nama_penerima"]).upper():
-                    if suggested_status_penerima and current_status_penerima not in suggested_status_penerima:
-                        validation_results.append({
-                            "row": idx + 2,
-                            "column": "status_penerima",
-                            "current": current_status_penerima,
-                            "suggested": " or ".join(suggested_status_penerima),
-                            "name": row["nama_penerima"],
-                            "bank_code": row.get("cKdBank", ""),
-                            "status": current_status_penerima
-                        })
-
-                # Check status pembayar
-                suggested_status_pembayar = self.get_suggested_status(row["nama_pembayar"])
-                current_status_pembayar = str(row.get("status_pembayar", "")).upper()
-                
-                if "LTD" not in str(row["nama_pembayar"]).upper():
-                    if suggested_status_pembayar and current_status_pembayar not in suggested_status_pembayar:
-                        validation_results.append({
-                            "row": idx + 2,
-                            "column": "status_pembayar",
-                            "current": current_status_pembayar,
-                            "suggested": " or ".join(suggested_status_pembayar),
-                            "name": row["nama_pembayar"],
-                            "bank_code": row.get("cKdBank", ""),
-                            "status": current_status_pembayar
-                        })
-
-            writer = pd.ExcelWriter(output_file, engine="openpyxl")
-            output_df.to_excel(writer, index=False)
-
-            worksheet = writer.sheets["Sheet1"]
-            red_fill = PatternFill(
-                start_color="FFFF00", end_color="FFFF00", fill_type="solid"
-            )
+                self.run_stats = {}
+                validation_results = [] if collect_results else None
+                finding_count = 0
+                # Baris dan temuan per bank ditampung di disk untuk file per bank
+                spill = BankPartitionSpill(output_folder_name)
+                if use_checkpoint:
+                    checkpoint = ValidationCheckpoint(
+                        os.path.splitext(output_file)[0] + ".checkpoint",
+                        self.checkpoint_key(input_file),
+                    )
+                    checkpoint.load()
+                    self.run_stats["resumed_rows"] = checkpoint.rows_done
+                main_written = (
+                    checkpoint is not None
+                    and "main_written" in checkpoint.stages
+                    and os.path.getsize(output_file) > 0
+                )
 
-            for result in validation_results:
-                col_idx = df.columns.get_loc(result["column"]) + 1
-                cell = worksheet.cell(row=result["row"], column=col_idx)
-                cell.fill = red_fill
-
-                comment_text = f"Suggested category: {result['suggested']}\n"
-                comment_text += f"Name: {result['name']}\n"
-                if "bank_code" in result:
-                    comment_text += f"Bank code: {result['bank_code']}\n"
-                comment_text += f"Status: {result['status']}"
-
-                cell.comment = Comment(comment_text, "Validator")
-
-            # Buat kamus penggantian header
-            rename_map = {
-                "cKdBank": "cKdBank",
-                "baris": "baris",
-                "sandi_bank": "Sandi Bank",
-                "tahun": "Thn",
-                "bulan": "Bln",
-                "tanggal": "Tgl",
-                "nomer_identifikasi": "No. Identifikasi",
-                "rekening": "Rek",
-                "status_penerima": "SPn",
-                "kategori_penerima": "KPn",
-                "status_pembayar": "SPb",
-                "kategori_pembayar": "KPb",
-                "hubungan_keuangan": "HK",
-                "sandi_negara": "NDK",
-                "sandi_valuta": "Valuta",
-                "nilai transaksi": "Nilai Transaksi",
-                "stt": "STT",
-                "nama_penerima": "Pelaku Penerima",
-                "jenis_id_penerima": "Jns Id Pn",
-                "nomor_id_penerima": "No Id Pn",
-                "nama_pembayar": "Pelaku Pembayar",
-                "jenis_id_pembayar": "Jns Id Pb",
-                "nomor_id_pembayar": "No Id Pb",
-                "bank_pengirim": "Bank Pengirim",
-                "bank_penerima": "Bank Penerima",
-                "detil_transaksi": "Keterangan Detail Transaksi",
-                "info_DP": "info DP",
-            }
-
-            # Ubah header di worksheet utama
-            for col_idx in range(1, worksheet.max_column + 1):
-                old_header = worksheet.cell(row=1, column=col_idx).value
-                new_header = rename_map.get(old_header, old_header)
-                worksheet.cell(row=1, column=col_idx).value = new_header
-
-            writer.close()
+                # Setiap batch langsung ditulis ke file output begitu selesai divalidasi;
+                # workbook disimpan di write_bank_files bersamaan dengan file per bank
+                writer = None if main_written else ExcelStreamWriter(
+                    output_file, reader.columns, HEADER_RENAME_MAP
+                )
+                # Batch dari checkpoint tidak divalidasi ulang, dibaca satu per satu dari file
+                resumed = checkpoint.iter_batches() if checkpoint is not None else None
+                rows_done = checkpoint.rows_done if checkpoint is not None else 0
+                fresh = (
+                    batch[batch.index >= rows_done]
+                    for batch in chain(buffered_batches, batches)
+                )
+                del buffered_batches
+                if checkpoint is None or "validated" not in checkpoint.stages:
+                    validated = self.iter_validated_batches(
+                        batch for batch in fresh if len(batch)
+                    )
+                self._stage_end("read")
+                self._stage_start("validate")
+                batch_started = time.perf_counter()
+                for is_new, (batch, findings) in chain(
+                    ((False, item) for item in resumed or ()),
+                    ((True, item) for item in validated or ()),
+                ):
+                    check_cancelled()
+                    if writer is not None:
+                        writer.write_batch(batch, findings)
+                    spill.add(batch, COL_KODE_BANK, findings, FINDING_FIELDS)
+                    finding_count += len(findings)
+                    if collect_results:
+                        validation_results.extend(findings)
+                    if is_new and checkpoint is not None:
+                        checkpoint.add_batch(batch, findings)
+                    progress["rows"] += len(batch)
+                    report_progress("validate")
+                    if self._listeners:
+                        batch_finished = time.perf_counter()
+                        self._emit(
+                            "batch_completed",
+                            rows=len(batch),
+                            rows_done=progress["rows"],
+                            total_rows=progress["total_rows"],
+                            findings=len(findings),
+                            seconds=batch_finished - batch_started,
+                            resumed=not is_new,
+                        )
+                        batch_started = batch_finished
+                        if self._listeners.get("finding"):
+                            for finding in findings:
+                                self._emit("finding", finding=finding)
+                if checkpoint is not None and "validated" not in checkpoint.stages:
+                    checkpoint.mark_stage("validated")
+                self._stage_end("validate")
+            finally:
+                # Generator ditutup segera agar process pool dan file checkpoint
+                # dilepas saat run dibatalkan atau gagal, bukan menunggu GC
+                for generator in (resumed, validated):
+                    if generator is not None:
+                        generator.close()
+                reader.close()
+
+            self._finish_run_stats(progress["rows"], finding_count)
 
             # Mulai pemecahan file per cKdBank
-            unique_banks = output_df['cKdBank'].dropna().unique()
-            for bank_code in unique_banks:
-                subset_df = output_df[output_df['cKdBank'] == bank_code].copy()
-                if subset_df.empty:
-                    continue
-
+            check_cancelled()
+            bank_jobs = []
+            resumed_reports = []
+            for bank_code, partition in spill.partitions():
                 split_file = os.path.join(
                     output_folder_name,
-                    os.path.basename(os.path.splitext(input_file)[0]) + f"_{tahun}_{str(bulan).zfill(2)}_{bank_code}_validated.xlsx"
+                    output_name + f"_{tahun}_{str(bulan).zfill(2)}_{bank_code}_validated.xlsx"
                 )
-                split_writer = pd.ExcelWriter(split_file, engine="openpyxl")
-                subset_df.to_excel(split_writer, index=False)
-                split_ws = split_writer.sheets["Sheet1"]
-
-                for res in validation_results:
-                    if res['bank_code'] == bank_code:
-                        # Cari baris di subset_df yang sesuai
-                        original_idx = res['row'] - 2  # 0-based index
-                        if original_idx in subset_df.index:
-                            # Dapatkan baris 'baru' di subset
-                            new_row = subset_df.index.get_loc(original_idx) + 2
-                            new_col = subset_df.columns.get_loc(res["column"]) + 1
-                            split_cell = split_ws.cell(row=new_row, column=new_col)
-                            split_cell.fill = red_fill
-                            comment_text = (
-                                f"Suggested category: {res['suggested']}\n"
-                                f"Name: {res['name']}\n"
-                                f"Bank code: {res.get('bank_code','')}\n"
-                                f"Status: {res['status']}"
-                            )
-                            split_cell.comment = Comment(comment_text, "Validator")
-                
-                # Ubah header di worksheet split
-                for col_idx in range(1, split_ws.max_column + 1):
-                    old_header = split_ws.cell(row=1, column=col_idx).value
-                    new_header = rename_map.get(old_header, old_header)
-                    split_ws.cell(row=1, column=col_idx).value = new_header
-
-                split_writer.close()
+                if (
+                    checkpoint is not None
+                    and bank_code in checkpoint.bank_files
+                    and os.path.exists(split_file)
+                ):
+                    # Sudah ditulis di run sebelumnya
+                    resumed_reports.append({
+                        "bank_code": bank_code,
+                        "file": split_file,
+                        "rows": partition.rows,
+                        "seconds": None,
+                        "error": None,
+                    })
+                    continue
+                bank_jobs.append((bank_code, split_file, reader.columns, partition))
+            self.run_stats["bank_files"] = resumed_reports + self.write_bank_files(
+                bank_jobs, writer, report_progress, cancel_token, checkpoint
+            )
 
-            return output_file, len(validation_results), validation_results
+            if checkpoint is not None:
+                checkpoint.remove()
+            return output_file, finding_count, validation_results
 
+        except ValidationCancelled:
+            raise
         except Exception as e:
-            raise Exception(f"Error processing file: {str(e)}")
\ No newline at end of file
+            raise Exception(f"Error processing file: {str(e)}")
+        finally:
+            if writer is not None:
+                writer.discard()  # Workbook utama yang belum tersimpan (run gagal/dibatalkan)
+            if checkpoint is not None:
+                checkpoint.close()
+            if spill is not None:
+                spill.remove()
+
+
+def _as_input_frame(frame):
+    """
+    Samakan DataFrame di memori dengan hasil ExcelBatchReader: dtype object
+    dan nilai kosong (None, pd.NA, NaT) sebagai NaN.
+    """
+    frame = frame.astype(object)
+    return frame.where(frame.notna(), np.nan)
+
+
+def _findings_frame(findings, index_labels=None):
+    """
+    Ubah stream hasil validasi menjadi DataFrame ringkas (kolom FINDING_COLUMNS).
+
+    Temuan dikumpulkan per kolom sambil dikonsumsi, sehingga dict per temuan
+    tidak perlu disimpan seluruhnya.
+
+    Args:
+        findings (iterable): Hasil validasi dengan "row" = posisi + 2.
+        index_labels (Index, optional): Label index data asli per posisi.
+    """
+    columns = {field: [] for field in FINDING_FIELDS}
+    for finding in findings:
+        for field, values in columns.items():
+            values.append(finding[field])
+
+    positions = np.asarray(columns.pop("row"), dtype=np.int64) - 2
+    frame = pd.DataFrame({
+        "position": positions,
+        "index": index_labels[positions] if index_labels is not None else positions,
+        "column": pd.Categorical(
+            columns.pop("column"),
+            categories=[COL_KATEGORI_PENERIMA, COL_KATEGORI_PEMBAYAR, COL_STATUS_PENERIMA, COL_STATUS_PEMBAYAR],
+        ),
+    })
+    for field, values in columns.items():
+        frame[field] = pd.array(values, dtype=object)
+    return frame[FINDING_COLUMNS]
+
+
+# Validator milik worker process, dibuat sekali saat worker start
+_worker_validator = None
+
+
+def _init_worker(fuzzy_match_threshold, reference_state):
+    """Initializer ProcessPoolExecutor: bangun validator dari reference data."""
+    global _worker_validator
+    _worker_validator = DataValidator(fuzzy_match_threshold, reference_state=reference_state)
+
+
+def _validate_chunk(chunk):
+    """Validasi satu potongan baris di worker process."""
+    caches = _worker_validator._run_caches()
+    before = [(cache.hits, cache.misses) for cache in caches]
+    _worker_validator.dedup_stats = {"rows": 0, "unique_rows": 0}
+    results = _worker_validator._validate_unique_rows(chunk)
+    cache_counts = [
+        (cache.hits - hits, cache.misses - misses)
+        for cache, (hits, misses) in zip(caches, before)
+    ]
+    return results, cache_counts, _worker_validator.dedup_stats
+
+
+def _write_bank_file(bank_code, split_file, columns, partition):
+    """
+    Tulis satu file hasil validasi per bank dari file spill, per batch, dan
+    laporkan durasinya.
+    """
+    started = time.perf_counter()
+    error = None
+    try:
+        with ExcelStreamWriter(split_file, columns, HEADER_RENAME_MAP) as split_writer:
+            for subset_df, bank_results in iter_partition(partition):
+                split_writer.write_batch(
+                    subset_df, (dict(zip(FINDING_FIELDS, result)) for result in bank_results)
+                )
+    except Exception as e:
+        error = str(e)
+    return {
+        "bank_code": bank_code,
+        "file": split_file,
+        "rows": partition.rows,
+        "seconds": time.perf_counter() - started,
+        "error": error,
+    }
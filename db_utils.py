@@ -1,8 +1,12 @@
+import atexit
+import csv
 import sqlite3
 import json
 import logging
-from tkinter import messagebox
 import os
+import re
+import threading
+import weakref
 
 # Konfigurasi logging
 logging.basicConfig(
@@ -33,14 +37,34 @@ def load_config(config_file="config.json"):
         show_error_message(f"File konfigurasi '{config_file}' tidak valid.")
     return None
 
+# Mode tanpa tampilan (CLI/server): error hanya dicatat ke log, tanpa dialog
+HEADLESS = False
+
+def set_headless(headless=True):
+    """Aktifkan/nonaktifkan mode tanpa dialog error (untuk CLI dan server)."""
+    global HEADLESS
+    HEADLESS = headless
+
 def log_error(message):
     """Mencatat pesan error ke log file dan menampilkan messagebox."""
     logging.error(message)
-    messagebox.showerror("Error", message)
+    show_error_message(message)
 
 def show_error_message(message):
-    """Menampilkan error message box."""
-    messagebox.showerror("Error", message)
+    """
+    Menampilkan error message box, kecuali di mode headless, tanpa display,
+    atau dari thread selain main thread (Tk hanya boleh dipanggil dari sana).
+    """
+    if HEADLESS or threading.current_thread() is not threading.main_thread():
+        return
+    try:
+        from tkinter import TclError, messagebox
+    except ImportError:
+        return
+    try:
+        messagebox.showerror("Error", message)
+    except TclError:
+        pass  # Tidak ada display
 
 config = load_config()
 
@@ -50,10 +74,187 @@ CATEGORIES = config.get("ui", {}).get("categories", ["B0", "C0", "C9", "D0", "E0
 N1_STT_CODES = config.get("validation", {}).get("n1_stt_codes", ["1NNN", "1000", "1901", "1902", "1903", "1904", "1905", "1911", "1912", "1906", "1907", "2NNN", "2000", "2901", "2902", "2903", "2904", "2905", "2911", "2912", "2906", "2907"]) if config else ["1NNN", "1000", "1901", "1902", "1903", "1904", "1905", "1911", "1912", "1906", "1907", "2NNN", "2000", "2901", "2902", "2903", "2904", "2905", "2911", "2912", "2906", "2907"]
 FUZZY_MATCH_THRESHOLD = config.get("validation", {}).get("fuzzy_match_threshold", 0.9) if config else 0.9
 ICON_PATH = config.get("ui", {}).get("icon_path", "icon.ico") if config else "icon.ico"
+BUSY_TIMEOUT_MS = config.get("database", {}).get("busy_timeout_ms", 5000) if config else 5000
+JOURNAL_MODE = config.get("database", {}).get("journal_mode", "WAL") if config else "WAL"
+
+class _ThreadOwner:
+    """Penanda di thread-local; ikut dihapus saat thread pemiliknya selesai."""
+
+class ConnectionManager:
+    """
+    Pool koneksi SQLite: satu koneksi per thread yang dipakai ulang oleh semua
+    fungsi di modul ini, sehingga tidak ada connect/close untuk setiap query.
+
+    Koneksi dibuka dengan journal mode WAL dan busy timeout, agar validasi
+    tetap bisa membaca database saat mapping sedang diedit dari GUI.
+
+    Koneksi sebuah thread ditutup otomatis saat thread tersebut selesai
+    (misalnya thread validasi dari GUI), dan close_all menutup semua koneksi
+    yang masih terbuka dari thread mana pun.
+    """
+
+    def __init__(self, database, busy_timeout_ms=BUSY_TIMEOUT_MS, journal_mode=JOURNAL_MODE):
+        self.database = database
+        self.busy_timeout_ms = busy_timeout_ms
+        self.journal_mode = journal_mode
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._connections = []
+
+    def connection(self):
+        """
+        Koneksi milik thread ini, dibuka saat pertama kali dibutuhkan.
+
+        Koneksi yang diwarisi dari proses induk (fork) tidak dipakai ulang.
+        """
+        conn = getattr(self._local, "conn", None)
+        if conn is not None and self._local.pid == os.getpid():
+            return conn
+
+        # check_same_thread=False agar close_all/cleanup bisa menutup koneksi
+        # dari thread lain; setiap koneksi tetap hanya dipakai oleh thread-nya
+        conn = sqlite3.connect(
+            self.database,
+            timeout=self.busy_timeout_ms / 1000,
+            check_same_thread=False,
+        )
+        conn.execute(f"PRAGMA busy_timeout = {int(self.busy_timeout_ms)}")
+        if self.journal_mode:
+            conn.execute(f"PRAGMA journal_mode = {self.journal_mode}")
+        with self._lock:
+            self._connections.append(conn)
+        # Thread-local dibersihkan saat thread selesai; owner ikut hilang dan
+        # finalizer menutup koneksinya
+        owner = _ThreadOwner()
+        weakref.finalize(owner, self._release, conn, os.getpid())
+        self._local.conn = conn
+        self._local.pid = os.getpid()
+        self._local.owner = owner
+        return conn
+
+    def _release(self, conn, pid):
+        """Tutup satu koneksi dan keluarkan dari pool."""
+        if pid != os.getpid():
+            return  # Koneksi warisan proses induk, bukan milik proses ini
+        with self._lock:
+            try:
+                self._connections.remove(conn)
+            except ValueError:
+                return  # Sudah ditutup oleh close_all
+        try:
+            conn.close()
+        except sqlite3.Error as e:
+            logging.error(f"Error closing database connection: {e}")
+
+    def close_all(self):
+        """Tutup semua koneksi di pool, misalnya sebelum file database diganti."""
+        with self._lock:
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            try:
+                conn.close()
+            except sqlite3.Error as e:
+                logging.error(f"Error closing database connection: {e}")
+        # Thread lain akan membuka koneksi baru karena koneksinya sudah ditutup
+        self._local = threading.local()
+
+connection_manager = ConnectionManager(DATABASE_NAME)
+atexit.register(connection_manager.close_all)
+
+def get_connection():
+    """
+    Koneksi database untuk thread ini dari pool.
+
+    Dipakai sebagai `with get_connection() as conn:`; blok with melakukan
+    commit/rollback seperti biasa, tetapi koneksinya tidak ditutup.
+    """
+    return connection_manager.connection()
+
+# Tabel reference data yang perubahannya dicatat di ref_data_version
+REFERENCE_TABLES = ["ref_mapping_penerima", "ref_mapping_pembayar", "bank_codes", "ref_mapping_status"]
+
+def ensure_reference_version_tracking(conn):
+    """
+    Buat tabel ref_data_version beserta trigger yang menaikkan versinya
+    setiap ada INSERT/UPDATE/DELETE pada tabel reference data.
+
+    Args:
+        conn (sqlite3.Connection): Koneksi database (perubahan belum di-commit).
+    """
+    cursor = conn.cursor()
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS ref_data_version (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            version INTEGER NOT NULL
+        )
+    """)
+    cursor.execute("INSERT OR IGNORE INTO ref_data_version (id, version) VALUES (1, 0)")
+    for table in REFERENCE_TABLES:
+        for event in ("INSERT", "UPDATE", "DELETE"):
+            cursor.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS {table}_{event.lower()}_version
+                AFTER {event} ON {table}
+                BEGIN
+                    UPDATE ref_data_version SET version = version + 1 WHERE id = 1;
+                END
+            """)
+
+def get_reference_version():
+    """
+    Versi reference data saat ini, naik setiap kali tabel reference berubah.
+
+    Hanya membaca; tabel dan trigger versi dibuat oleh create_database atau
+    migrate_database. Untuk database lama yang belum dimigrasi, waktu
+    modifikasi terakhir file database (termasuk file -wal) dipakai sebagai versi.
+
+    Returns:
+        int: Versi reference data, atau None jika tidak bisa dibaca
+            (pemanggil sebaiknya memuat ulang semua data).
+    """
+    try:
+        with get_connection() as conn:
+            has_table = conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'ref_data_version'"
+            ).fetchone()
+            if has_table:
+                row = conn.execute("SELECT version FROM ref_data_version WHERE id = 1").fetchone()
+                return row[0] if row else None
+    except sqlite3.Error as e:
+        logging.error(f"Error reading reference data version: {e}")
+        return None
+    return _database_mtime()
+
+def _database_mtime():
+    """Waktu modifikasi terakhir (ns) file database dan file -wal-nya."""
+    mtimes = []
+    for path in (DATABASE_NAME, f"{DATABASE_NAME}-wal"):
+        try:
+            mtimes.append(os.stat(path).st_mtime_ns)
+        except OSError:
+            pass
+    return max(mtimes) if mtimes else None
+
+def migrate_database():
+    """
+    Perbarui skema database lama: tambahkan tabel dan trigger versi reference
+    data (ref_data_version) jika belum ada.
+
+    Returns:
+        bool: True jika berhasil.
+    """
+    try:
+        with get_connection() as conn:
+            ensure_reference_version_tracking(conn)
+        return True
+    except sqlite3.Error as e:
+        log_error(f"Error migrating database: {e}")
+        return False
 
 def create_database():
     """Membuat database dan tabel-tabel yang diperlukan."""
     try:
+        # Koneksi di pool masih menunjuk ke file lama yang akan di-backup
+        connection_manager.close_all()
         if os.path.exists(DATABASE_NAME):
             backup_file = f"{DATABASE_NAME}.bak"
             try:
@@ -62,7 +263,7 @@ def create_database():
                 log_error(f"Failed to create backup of existing database")
                 return False
 
-        with sqlite3.connect(DATABASE_NAME) as conn:
+        with get_connection() as conn:
             cursor = conn.cursor()
             
             # Add transactions
@@ -107,6 +308,8 @@ def create_database():
                     )
                 """)
 
+                ensure_reference_version_tracking(conn)
+
                 cursor.execute("COMMIT")
                 return True
                 
@@ -121,7 +324,7 @@ def create_database():
 def insert_initial_data():
     """Memasukkan data awal ke dalam tabel."""
     try:
-        with sqlite3.connect(DATABASE_NAME) as conn:
+        with get_connection() as conn:
             cursor = conn.cursor()
 
             # Data mapping kategori (penerima dan pembayar)
@@ -255,6 +458,37 @@ def insert_initial_data():
     except sqlite3.Error as e:
         log_error(f"Error inserting initial data: {e}")
 
+def get_reference_data():
+    """
+    Mengambil semua reference data (mapping penerima/pembayar, kode bank,
+    status mapping) beserta versinya dalam satu query.
+
+    Returns:
+        dict: {"penerima", "pembayar", "bank_codes", "status_mapping", "version"}.
+            Jika gagal, semua data kosong dan version None.
+    """
+    data = {"penerima": {}, "pembayar": {}, "bank_codes": {}, "status_mapping": {}, "version": None}
+    # Versi dibaca sebelum data agar perubahan di antaranya terdeteksi saat reload
+    version = get_reference_version()
+    try:
+        with get_connection() as conn:
+            cursor = conn.execute("""
+                SELECT 'penerima', keyword, category FROM ref_mapping_penerima
+                UNION ALL SELECT 'pembayar', keyword, category FROM ref_mapping_pembayar
+                UNION ALL SELECT 'bank_codes', code, name FROM bank_codes
+                UNION ALL SELECT 'status_mapping', keyword, status FROM ref_mapping_status
+            """)
+            for source, key, value in cursor:
+                if source == "status_mapping":
+                    data[source].setdefault(key, []).append(value)
+                else:
+                    data[source][key] = value
+    except sqlite3.Error as e:
+        log_error(f"Error getting reference data: {e}")
+        return data
+    data["version"] = version
+    return data
+
 def get_mapping_data(table_name):
     """Get mapping data with validation."""
     valid_tables = ['ref_mapping_penerima', 'ref_mapping_pembayar']
@@ -264,9 +498,9 @@ def get_mapping_data(table_name):
         return {}
         
     try:
-        with sqlite3.connect(DATABASE_NAME) as conn:
-            conn.row_factory = sqlite3.Row  # Enable dictionary access
+        with get_connection() as conn:
             cursor = conn.cursor()
+            cursor.row_factory = sqlite3.Row  # Enable dictionary access
             
             cursor.execute(f"SELECT keyword, category FROM {table_name}")
             return {row['keyword']: row['category'] for row in cursor.fetchall()}
@@ -283,7 +517,7 @@ def get_bank_codes():
         dict: Data kode bank dalam bentuk dictionary {code: name}.
     """
     try:
-        with sqlite3.connect(DATABASE_NAME) as conn:
+        with get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute("SELECT code, name FROM bank_codes")
             data = {row[0]: row[1] for row in cursor.fetchall()}
@@ -295,9 +529,9 @@ def get_bank_codes():
 def get_status_mapping():
     """Get status mapping data."""
     try:
-        with sqlite3.connect(DATABASE_NAME) as conn:
-            conn.row_factory = sqlite3.Row
+        with get_connection() as conn:
             cursor = conn.cursor()
+            cursor.row_factory = sqlite3.Row
             cursor.execute("SELECT keyword, status FROM ref_mapping_status")
             mapping = {}
             for row in cursor.fetchall():
@@ -322,7 +556,7 @@ def add_mapping_data(table_name, keyword, category):
         bool: True jika berhasil, False jika gagal.
     """
     try:
-        with sqlite3.connect(DATABASE_NAME) as conn:
+        with get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute(
                 f"INSERT INTO {table_name} (keyword, category) VALUES (?, ?)",
@@ -354,7 +588,7 @@ def update_mapping_data(table_name, keyword, category):
         bool: True jika berhasil, False jika gagal.
     """
     try:
-        with sqlite3.connect(DATABASE_NAME) as conn:
+        with get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute(
                 f"UPDATE {table_name} SET category = ? WHERE keyword = ?",
@@ -380,7 +614,7 @@ def delete_mapping_data(table_name, keyword):
         bool: True jika berhasil, False jika gagal.
     """
     try:
-        with sqlite3.connect(DATABASE_NAME) as conn:
+        with get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute(f"DELETE FROM {table_name} WHERE keyword = ?", (keyword,))
             conn.commit()
@@ -406,7 +640,7 @@ def add_bank_code(code, name):
         if not code.isdigit() or len(code) != 3:
             raise ValueError("Kode bank harus berupa 3 digit angka.")
 
-        with sqlite3.connect(DATABASE_NAME) as conn:
+        with get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute(
                 "INSERT INTO bank_codes (code, name) VALUES (?, ?)", (code, name)
@@ -438,7 +672,7 @@ def update_bank_code(code, name):
         if not code.isdigit() or len(code) != 3:
             raise ValueError("Kode bank harus berupa 3 digit angka.")
 
-        with sqlite3.connect(DATABASE_NAME) as conn:
+        with get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute(
                 "UPDATE bank_codes SET name = ? WHERE code = ?", (name, code)
@@ -463,7 +697,7 @@ def delete_bank_code(code):
         bool: True jika berhasil, False jika gagal.
     """
     try:
-        with sqlite3.connect(DATABASE_NAME) as conn:
+        with get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute("DELETE FROM bank_codes WHERE code = ?", (code,))
             conn.commit()
@@ -475,7 +709,7 @@ def delete_bank_code(code):
 def add_status_mapping(keyword, status):
     """Add new status mapping."""
     try:
-        with sqlite3.connect(DATABASE_NAME) as conn:
+        with get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute(
                 "INSERT INTO ref_mapping_status (keyword, status) VALUES (?, ?)",
@@ -490,7 +724,7 @@ def add_status_mapping(keyword, status):
 def delete_status_mapping(keyword, status):
     """Delete status mapping."""
     try:
-        with sqlite3.connect(DATABASE_NAME) as conn:
+        with get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute(
                 "DELETE FROM ref_mapping_status WHERE keyword = ? AND status = ?",
@@ -502,46 +736,346 @@ def delete_status_mapping(keyword, status):
         log_error(f"Error deleting status mapping: {e}")
         return False
     
-def execute_sql_file(sql_file_path):
+# Kolom (kunci, nilai) setiap tabel reference data untuk import massal
+IMPORT_COLUMNS = {
+    "ref_mapping_penerima": ("keyword", "category"),
+    "ref_mapping_pembayar": ("keyword", "category"),
+    "bank_codes": ("code", "name"),
+    "ref_mapping_status": ("keyword", "status"),
+}
+IMPORT_BATCH_ROWS = config.get("database", {}).get("import_batch_rows", 10000) if config else 10000
+# Jumlah maksimum pesan baris yang ditolak yang disimpan di hasil import
+MAX_IMPORT_ERRORS = 100
+
+def _iter_import_rows(file_path):
     """
-    Mengeksekusi file SQL.
-    
+    Baca file CSV/Excel baris per baris.
+
+    Yields:
+        tuple: (nomor_baris, dict {nama_kolom_lowercase: nilai}).
+    """
+    if file_path.lower().endswith(".csv"):
+        with open(file_path, "r", encoding="utf-8-sig", newline="") as f:
+            reader = csv.reader(f)
+            header = [str(name).strip().lower() for name in next(reader, [])]
+            for row_number, row in enumerate(reader, start=2):
+                if any(value.strip() for value in row):
+                    row += [""] * (len(header) - len(row))
+                    yield row_number, dict(zip(header, row))
+        return
+
+    from excel_io import ExcelBatchReader  # pandas/openpyxl hanya dimuat untuk file Excel
+
+    reader = ExcelBatchReader(file_path, IMPORT_BATCH_ROWS)
+    try:
+        header = [str(name).strip().lower() for name in reader.columns]
+        for batch in reader:
+            for index, row in zip(batch.index, batch.itertuples(index=False, name=None)):
+                yield index + 2, dict(zip(header, row))
+    finally:
+        reader.close()
+
+def _import_value(value):
+    """Nilai cell sebagai teks bersih, atau None jika kosong."""
+    if value is None or (isinstance(value, float) and value != value):
+        return None
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    text = str(value).strip()
+    return text or None
+
+def import_reference_data(table_name, file_path):
+    """
+    Import massal reference data dari file CSV/Excel dengan semantik upsert.
+
+    File harus punya header dengan nama kolom tabel (misalnya keyword, category
+    untuk tabel mapping; code, name untuk bank_codes). Baris dibaca secara
+    streaming, dimasukkan ke tabel sementara dengan executemany, lalu di-upsert
+    ke tabel tujuan dalam satu transaksi. Baris yang nilainya sama dengan data
+    di database tidak ditulis ulang.
+
+    Args:
+        table_name (str): Salah satu tabel di IMPORT_COLUMNS.
+        file_path (str): Path file .csv, .xlsx atau .xls.
+
+    Returns:
+        tuple: (success, message, stats)
+            - success (bool): True jika berhasil, False jika gagal
+            - message (str): Pesan sukses/error
+            - stats (dict): inserted, updated, unchanged, rejected dan errors
+              (pesan untuk baris yang ditolak, maksimal MAX_IMPORT_ERRORS)
+    """
+    stats = {"inserted": 0, "updated": 0, "unchanged": 0, "rejected": 0, "errors": []}
+    if table_name not in IMPORT_COLUMNS:
+        return False, f"Invalid table name: {table_name}", stats
+    key_column, value_column = IMPORT_COLUMNS[table_name]
+
+    def reject(row_number, reason):
+        stats["rejected"] += 1
+        if len(stats["errors"]) < MAX_IMPORT_ERRORS:
+            stats["errors"].append(f"Baris {row_number}: {reason}")
+
+    def staged_rows():
+        """Baris valid sebagai (kunci, nilai); baris tidak valid dicatat sebagai rejected."""
+        columns_checked = False
+        for row_number, row in _iter_import_rows(file_path):
+            if not columns_checked:
+                missing = [name for name in (key_column, value_column) if name not in row]
+                if missing:
+                    raise ValueError(f"Kolom tidak ditemukan di file: {', '.join(missing)}")
+                columns_checked = True
+            key = _import_value(row[key_column])
+            value = _import_value(row[value_column])
+            if key is None or value is None:
+                reject(row_number, f"{key_column}/{value_column} kosong")
+                continue
+            if table_name == "bank_codes":
+                if key.isdigit() and len(key) < 3:
+                    key = key.zfill(3)  # Nol di depan hilang jika kode disimpan sebagai angka di Excel
+                if not key.isdigit() or len(key) != 3:
+                    reject(row_number, f"Kode bank harus berupa 3 digit angka ({key})")
+                    continue
+            yield key, value
+
+    try:
+        with get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("DROP TABLE IF EXISTS temp.import_stage")
+            cursor.execute("CREATE TEMP TABLE import_stage (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+            try:
+                # Baris dengan kunci yang sama di file: baris terakhir yang dipakai
+                rows = staged_rows()
+                while True:
+                    batch = [row for _, row in zip(range(IMPORT_BATCH_ROWS), rows)]
+                    if not batch:
+                        break
+                    cursor.executemany(
+                        "INSERT OR REPLACE INTO import_stage (key, value) VALUES (?, ?)", batch
+                    )
+
+                total, existing, changed = cursor.execute(f"""
+                    SELECT COUNT(*),
+                           COUNT(t.{key_column}),
+                           COALESCE(SUM(t.{key_column} IS NOT NULL AND t.{value_column} IS NOT s.value), 0)
+                    FROM import_stage s
+                    LEFT JOIN {table_name} t ON t.{key_column} = s.key
+                """).fetchone()
+                cursor.execute(f"""
+                    INSERT INTO {table_name} ({key_column}, {value_column})
+                    SELECT key, value FROM import_stage WHERE true
+                    ON CONFLICT({key_column}) DO UPDATE SET
+                        {value_column} = excluded.{value_column},
+                        updated_at = CURRENT_TIMESTAMP
+                    WHERE {value_column} IS NOT excluded.{value_column}
+                """)
+            finally:
+                cursor.execute("DROP TABLE IF EXISTS temp.import_stage")
+
+        stats["inserted"] = total - existing
+        stats["updated"] = changed
+        stats["unchanged"] = existing - changed
+        message = (
+            f"Import {table_name} selesai: {stats['inserted']} baru, {stats['updated']} diupdate, "
+            f"{stats['unchanged']} tidak berubah, {stats['rejected']} ditolak"
+        )
+        return True, message, stats
+
+    except FileNotFoundError:
+        return False, f"Import file not found: {file_path}", stats
+    except ValueError as e:
+        return False, f"Invalid import file: {e}", stats
+    except (sqlite3.Error, OSError) as e:
+        log_error(f"Error importing {table_name}: {e}")
+        return False, f"Error importing {table_name}: {e}", stats
+
+SQL_IMPORT_BATCH_STATEMENTS = config.get("database", {}).get("sql_import_batch_statements", 10000) if config else 10000
+# 0 = seluruh file dalam satu transaksi (rollback penuh jika ada error)
+SQL_IMPORT_COMMIT_STATEMENTS = config.get("database", {}).get("sql_import_commit_statements", 0) if config else 0
+# Ukuran blok baca file SQL dan batas panjang satu INSERT gabungan
+SQL_READ_CHUNK_SIZE = 1 << 20
+SQL_MAX_BATCH_CHARS = 8 << 20
+
+# Satu statement sampai ";" berikutnya. ";" di dalam string, identifier dalam
+# quote dan komentar dilewati; token yang belum lengkap di akhir buffer
+# membuat match gagal sampai blok berikutnya dibaca. Pola ditulis dalam bentuk
+# "biasa* (khusus biasa*)*" dengan token khusus selalu diawali karakter yang
+# tidak termasuk "biasa", sehingga match yang gagal tetap linear tanpa
+# quantifier possessive (yang baru ada di Python 3.11).
+SQL_STATEMENT_PATTERN = re.compile(
+    r"""[^;'"`\[\-/]*(?:(?:'[^']*'|"[^"]*"|`[^`]*`|\[[^\]]*\]|--[^\n]*\n|/\*.*?\*/|-(?!-)|/(?!\*))[^;'"`\[\-/]*)*;""",
+    re.S,
+)
+# Spasi dan komentar di awal statement
+SQL_LEADING_PATTERN = re.compile(r"(?:\s|--[^\n]*\n|/\*.*?\*/)*", re.S)
+# Statement transaksi di file dump diabaikan, transaksi diatur oleh importer
+SQL_TRANSACTION_PATTERN = re.compile(
+    r"(BEGIN|COMMIT|END|ROLLBACK)(\s+(DEFERRED|IMMEDIATE|EXCLUSIVE))?(\s+TRANSACTION)?\s*;?\s*",
+    re.I,
+)
+# INSERT ... VALUES (...), dipecah menjadi bagian depan dan daftar baris
+SQL_INSERT_PATTERN = re.compile(
+    r"""(INSERT\s+(?:OR\s+\w+\s+)?INTO\s+(?:"[^"]*"|\[[^\]]*\]|`[^`]*`|[\w$.])+(?![\w$."\[`])\s*(?:\([^()]*\)\s*)?VALUES)\s*(\(.*\))\s*;?\s*""",
+    re.S | re.I,
+)
+SQL_STRING_PATTERN = re.compile(r"'[^']*'")
+# Daftar baris "(...), (...)" tanpa klausa lain (ON CONFLICT, RETURNING, ...)
+SQL_VALUES_ROWS_PATTERN = re.compile(
+    r"\([^()]*(?:\([^()]*\)[^()]*)*\)(?:\s*,\s*\([^()]*(?:\([^()]*\)[^()]*)*\))*"
+)
+
+def iter_sql_statements(sql_file):
+    """
+    Pecah script SQL menjadi statement secara streaming.
+
+    ";" di dalam string, identifier dalam quote, komentar atau body trigger
+    (BEGIN ... END) tidak dianggap akhir statement.
+
+    Args:
+        sql_file: File teks script SQL (dibaca per blok dengan read()).
+
+    Yields:
+        str: Statement SQL lengkap (termasuk ";"), tanpa komentar di awal.
+    """
+    buffer = ""
+    stmt_start = 0
+    while True:
+        chunk = sql_file.read(SQL_READ_CHUNK_SIZE)
+        if not chunk:
+            break
+        buffer = buffer[stmt_start:] + chunk
+        stmt_start = pos = 0
+        while True:
+            match = SQL_STATEMENT_PATTERN.match(buffer, pos)
+            if match is None:
+                break
+            pos = match.end()
+            statement = buffer[stmt_start:pos]
+            # Body trigger berisi ";" tetapi statement-nya belum selesai
+            if sqlite3.complete_statement(statement):
+                statement = statement[SQL_LEADING_PATTERN.match(statement).end():]
+                if statement.strip(" \t\r\n;"):
+                    yield statement
+                stmt_start = pos
+    rest = buffer[stmt_start:]
+    rest = rest[SQL_LEADING_PATTERN.match(rest).end():]
+    if rest.strip() and not rest.startswith("--"):
+        yield rest
+
+def split_insert_statement(statement):
+    """
+    Pecah INSERT ... VALUES menjadi bagian depan dan daftar barisnya, agar
+    INSERT berurutan dengan bagian depan yang sama bisa digabung.
+
+    Args:
+        statement (str): Statement SQL.
+
+    Returns:
+        tuple: (prefix, rows) dengan prefix "INSERT ... VALUES" (spasi
+            dinormalisasi) dan rows teks "(...), (...)", atau None jika
+            statement bukan INSERT ... VALUES sederhana.
+    """
+    match = SQL_INSERT_PATTERN.fullmatch(statement)
+    if match is None:
+        return None
+    prefix, rows = match.groups()
+    if SQL_VALUES_ROWS_PATTERN.fullmatch(SQL_STRING_PATTERN.sub("", rows)) is None:
+        return None
+    return " ".join(prefix.split()), rows
+
+def execute_sql_file(sql_file_path, progress_callback=None, commit_statements=None):
+    """
+    Mengeksekusi file SQL secara streaming.
+
+    File dibaca per blok dan dipecah menjadi statement tanpa memuat seluruh
+    script ke memori. INSERT ... VALUES berurutan ke tabel dan kolom yang sama
+    digabung menjadi satu INSERT multi-baris, sehingga SQLite hanya mem-parse
+    satu statement per batch.
+
     Args:
         sql_file_path (str): Path ke file SQL yang akan dieksekusi
-        
+        progress_callback (callable, optional): Dipanggil dengan
+            (bytes_read, total_bytes, statements) setiap sekitar
+            database.sql_import_batch_statements statement.
+        commit_statements (int, optional): Commit setiap sekian statement.
+            0 berarti seluruh file dalam satu transaksi. Default dari config
+            (database.sql_import_commit_statements).
+
     Returns:
         tuple: (success, message)
             - success (bool): True jika berhasil, False jika gagal
-            - message (str): Pesan sukses/error
+            - message (str): Pesan sukses/error. Jika commit per batch dan
+              terjadi error, hanya batch yang belum di-commit yang di-rollback.
     """
+    if commit_statements is None:
+        commit_statements = SQL_IMPORT_COMMIT_STATEMENTS
     try:
-        with open(sql_file_path, 'r', encoding='utf-8') as f:
-            sql_script = f.read()
-            
-        with sqlite3.connect(DATABASE_NAME) as conn:
+        total_bytes = os.path.getsize(sql_file_path)
+        with open(sql_file_path, "r", encoding="utf-8-sig") as f:
+            conn = get_connection()
             cursor = conn.cursor()
-            
-            # Start transaction
+            progress = {"statements": 0, "committed": 0, "reported": 0}
+            pending_prefix = None
+            pending_rows = []
+            pending_chars = 0
+            current = None  # Statement yang sedang dijalankan, untuk pesan error
+
+            def run(statement, count):
+                nonlocal current
+                current = statement
+                cursor.execute(statement)
+                progress["statements"] += count
+                if commit_statements and progress["statements"] - progress["committed"] >= commit_statements:
+                    conn.commit()
+                    progress["committed"] = progress["statements"]
+                    cursor.execute("BEGIN")
+                if progress_callback and progress["statements"] - progress["reported"] >= SQL_IMPORT_BATCH_STATEMENTS:
+                    progress["reported"] = progress["statements"]
+                    progress_callback(f.buffer.tell(), total_bytes, progress["statements"])
+
+            def flush():
+                nonlocal pending_prefix, pending_rows, pending_chars
+                if pending_rows:
+                    run(f"{pending_prefix} {', '.join(pending_rows)}", len(pending_rows))
+                pending_prefix, pending_rows, pending_chars = None, [], 0
+
             cursor.execute("BEGIN")
-            
             try:
-                # Split script into individual statements
-                statements = sql_script.split(';')
-                
-                # Execute each statement
-                for statement in statements:
-                    if statement.strip():
-                        cursor.execute(statement)
-                
-                # Commit if all successful
+                for statement in iter_sql_statements(f):
+                    if SQL_TRANSACTION_PATTERN.fullmatch(statement):
+                        continue
+                    parts = split_insert_statement(statement)
+                    if parts is None:
+                        flush()
+                        run(statement, 1)
+                        continue
+                    prefix, rows = parts
+                    if (
+                        prefix != pending_prefix
+                        or len(pending_rows) >= SQL_IMPORT_BATCH_STATEMENTS
+                        or pending_chars >= SQL_MAX_BATCH_CHARS
+                    ):
+                        flush()
+                        pending_prefix = prefix
+                    pending_rows.append(rows)
+                    pending_chars += len(rows)
+                flush()
                 conn.commit()
-                return True, "SQL script executed successfully"
-                
-            except sqlite3.Error as e:
+                if progress_callback:
+                    progress_callback(total_bytes, total_bytes, progress["statements"])
+                return True, f"SQL script executed successfully ({progress['statements']} statements)"
+
+            except Exception as e:
                 # Rollback on error
                 conn.rollback()
-                return False, f"Error executing SQL: {str(e)}"
-                
+                if not isinstance(e, sqlite3.Error):
+                    return False, f"Unexpected error: {str(e)}"
+                message = f"Error executing SQL: {str(e)}"
+                if current is not None:
+                    message += f" (near: {' '.join(current.split())[:200]})"
+                if progress["committed"]:
+                    message += f". {progress['committed']} statements committed before the error"
+                return False, message
+
     except FileNotFoundError:
         return False, f"SQL file not found: {sql_file_path}"
     except Exception as e:
@@ -0,0 +1,386 @@
+import datetime
+import os
+import shutil
+import tempfile
+from xml.sax.saxutils import escape
+from zipfile import ZIP_DEFLATED, ZipFile
+import numpy as np
+import openpyxl
+import pandas as pd
+from openpyxl import Workbook, load_workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.comments import Comment
+from openpyxl.comments.author import AuthorList
+from openpyxl.comments.comment_sheet import CommentSheet
+from openpyxl.packaging.relationship import Relationship
+from openpyxl.styles import Alignment, Border, Font, PatternFill, Side
+from openpyxl.cell.cell import ILLEGAL_CHARACTERS_RE, TYPE_ERROR, TYPE_NUMERIC
+from openpyxl.utils import get_column_letter
+from openpyxl.writer.excel import ExcelWriter
+
+# Teks yang dibaca pandas.read_excel sebagai NaN (default na_values pandas)
+NA_STRINGS = {
+    "", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan",
+    "1.#IND", "1.#QNAN", "<NA>", "N/A", "NA", "NULL", "NaN", "None",
+    "n/a", "nan", "null",
+}
+
+
+def _convert_cell(cell):
+    """Konversi nilai cell openpyxl dengan aturan yang sama seperti pandas.read_excel."""
+    value = cell.value
+    if value is None:
+        return np.nan
+    if cell.data_type == TYPE_ERROR:
+        return np.nan
+    if cell.data_type == TYPE_NUMERIC:
+        int_value = int(value)
+        return int_value if int_value == value else float(value)
+    if isinstance(value, str) and value in NA_STRINGS:
+        return np.nan
+    return value
+
+
+def _column_names(header):
+    """Nama kolom dari baris header: kosong menjadi 'Unnamed: i', duplikat diberi suffix '.n'."""
+    names = []
+    seen = {}
+    for index, value in enumerate(header):
+        name = f"Unnamed: {index}" if pd.isna(value) else value
+        if name in seen:
+            seen[name] += 1
+            name = f"{name}.{seen[name]}"
+        else:
+            seen[name] = 0
+        names.append(name)
+    return names
+
+
+class ExcelBatchReader:
+    """
+    Pembaca file Excel per batch baris agar memori tetap kecil untuk file besar.
+
+    File .xlsx dibaca dengan openpyxl mode read-only dan tidak pernah dimuat
+    seluruhnya ke memori. File .xls (tidak didukung openpyxl) dibaca sekali
+    dengan pandas lalu dipotong per batch.
+
+    Setiap batch adalah DataFrame dengan index yang melanjutkan batch sebelumnya,
+    sehingga nomor baris (index + 2) sama seperti membaca seluruh file sekaligus.
+    Tipe nilai mengikuti isi cell (teks tetap teks), tidak ditebak per kolom.
+
+    total_rows adalah perkiraan jumlah baris data (dari dimensi sheet yang
+    tersimpan di file, untuk progress), atau None jika tidak diketahui.
+    """
+
+    def __init__(self, input_file, batch_rows=20000):
+        self.input_file = input_file
+        self.batch_rows = batch_rows
+        self._workbook = None
+        self._frame = None
+        self.total_rows = None
+
+        if input_file.lower().endswith(".xlsx"):
+            self._workbook = load_workbook(input_file, read_only=True, data_only=True)
+            sheet = self._workbook.worksheets[0]
+            if sheet.max_row and sheet.max_row > 1:
+                self.total_rows = sheet.max_row - 1
+            sheet.reset_dimensions()  # Dimensi di file sering tidak akurat
+            self._rows = sheet.iter_rows()
+            header = next(self._rows, ())
+            self.columns = _column_names([_convert_cell(cell) for cell in header])
+        else:
+            self._frame = pd.read_excel(input_file)
+            self.columns = list(self._frame.columns)
+            self.total_rows = len(self._frame)
+
+    def __iter__(self):
+        if self._frame is not None:
+            for start in range(0, len(self._frame), self.batch_rows):
+                yield self._frame.iloc[start:start + self.batch_rows]
+            return
+
+        width = len(self.columns)
+        start = 0
+        batch = []
+        blank_rows = 0  # Baris kosong berturut-turut yang belum dimasukkan ke batch
+        for row in self._rows:
+            values = [_convert_cell(cell) for cell in row[:width]]
+            if all(value is np.nan for value in values):
+                blank_rows += 1
+                continue
+            # Baris kosong di tengah tetap menjadi baris NaN seperti pandas;
+            # hanya baris kosong di akhir sheet yang dibuang
+            for _ in range(blank_rows):
+                batch.append([np.nan] * width)
+                if len(batch) >= self.batch_rows:
+                    yield self._make_frame(batch, start)
+                    start += len(batch)
+                    batch = []
+            blank_rows = 0
+            values.extend([np.nan] * (width - len(values)))
+            batch.append(values)
+            if len(batch) >= self.batch_rows:
+                yield self._make_frame(batch, start)
+                start += len(batch)
+                batch = []
+        if batch:
+            yield self._make_frame(batch, start)
+
+    def _make_frame(self, rows, start):
+        frame = pd.DataFrame(rows, columns=self.columns, dtype=object)
+        frame.index = pd.RangeIndex(start, start + len(rows))
+        return frame
+
+    def close(self):
+        """Tutup file workbook (wajib untuk mode read-only)."""
+        if self._workbook is not None:
+            self._workbook.close()
+            self._workbook = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+# Format header yang sama dengan DataFrame.to_excel (pandas 2.x)
+HEADER_FONT = Font(bold=True)
+HEADER_BORDER = Border(
+    left=Side(style="thin"),
+    right=Side(style="thin"),
+    top=Side(style="thin"),
+    bottom=Side(style="thin"),
+)
+HEADER_ALIGNMENT = Alignment(horizontal="center", vertical="top")
+
+# Satu objek fill dipakai bersama oleh semua cell yang di-highlight
+HIGHLIGHT_FILL = PatternFill(start_color="FFFF00", end_color="FFFF00", fill_type="solid")
+
+
+def finding_comment_text(result):
+    """Teks comment untuk cell yang di-highlight berdasarkan satu hasil validasi."""
+    return (
+        f"Suggested category: {result['suggested']}\n"
+        f"Name: {result['name']}\n"
+        f"Bank code: {result.get('bank_code', '')}\n"
+        f"Status: {result['status']}"
+    )
+
+
+COMMENT_AUTHOR = "Validator"
+
+# _StreamCommentExcelWriter memakai atribut internal ExcelWriter dan format XML
+# comment/VML dari versi openpyxl ini (lihat requirements.txt). Di versi lain
+# comment ditulis lewat jalur biasa openpyxl (disimpan di memori sampai save).
+STREAM_COMMENTS_OPENPYXL_VERSION = "3.1.5"
+STREAM_COMMENTS_SUPPORTED = openpyxl.__version__ == STREAM_COMMENTS_OPENPYXL_VERSION
+
+# Bagian XML comment dan VML (kotak comment), format sama dengan keluaran openpyxl
+COMMENTS_HEADER = (
+    '<comments xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+    f"<authors><author>{COMMENT_AUTHOR}</author></authors><commentList>"
+)
+COMMENTS_FOOTER = "</commentList></comments>"
+VML_HEADER = (
+    '<xml xmlns:ns0="urn:schemas-microsoft-com:office:office" '
+    'xmlns:ns1="urn:schemas-microsoft-com:vml" '
+    'xmlns:ns2="urn:schemas-microsoft-com:office:excel">'
+    '<ns0:shapelayout ns1:ext="edit"><ns0:idmap ns1:ext="edit" data="1" /></ns0:shapelayout>'
+    '<ns1:shapetype id="_x0000_t202" coordsize="21600,21600" ns0:spt="202" '
+    'path="m,l,21600r21600,l21600,xe"><ns1:stroke joinstyle="miter" />'
+    '<ns1:path gradientshapeok="t" ns0:connecttype="rect" /></ns1:shapetype>'
+)
+VML_FOOTER = "</xml>"
+VML_SHAPE = (
+    '<ns1:shape type="#_x0000_t202" style="position:absolute; margin-left:59.25pt;'
+    'margin-top:1.5pt;width:144px;height:79px;z-index:1;visibility:hidden" '
+    'fillcolor="#ffffe1" ns0:insetmode="auto" id="_x0000_s{shape_id:04d}">'
+    '<ns1:fill color2="#ffffe1" /><ns1:shadow color="black" obscured="t" />'
+    '<ns1:path ns0:connecttype="none" /><ns1:textbox style="mso-direction-alt:auto">'
+    '<div style="text-align:left" /></ns1:textbox><ns2:ClientData ObjectType="Note">'
+    "<ns2:MoveWithCells /><ns2:SizeWithCells /><ns2:AutoFill>False</ns2:AutoFill>"
+    "<ns2:Row>{row}</ns2:Row><ns2:Column>{column}</ns2:Column></ns2:ClientData></ns1:shape>"
+)
+
+
+class _CommentStream:
+    """
+    Comment cell yang langsung ditulis ke file sementara sebagai potongan XML.
+
+    openpyxl menyimpan semua comment di memori dan membangun seluruh XML-nya
+    saat save, sehingga memori bertambah sesuai jumlah temuan. Di sini setiap
+    comment langsung ditulis, lalu disalin ke file .xlsx saat disimpan.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self._comments = tempfile.TemporaryFile()
+        self._shapes = tempfile.TemporaryFile()
+
+    def add(self, row, column, text):
+        """Tambah comment di cell (row, column), keduanya mulai dari 1."""
+        text = ILLEGAL_CHARACTERS_RE.sub("", text)
+        self._comments.write(
+            f'<comment ref="{get_column_letter(column)}{row}" authorId="0" shapeId="0">'
+            f"<text><t>{escape(text)}</t></text></comment>".encode("utf-8")
+        )
+        self._shapes.write(
+            VML_SHAPE.format(shape_id=1026 + self.count, row=row - 1, column=column - 1).encode("utf-8")
+        )
+        self.count += 1
+
+    def write_parts(self, archive, comments_path, vml_path):
+        """Salin XML comment dan VML ke archive .xlsx tanpa memuatnya ke memori."""
+        for part, path, header, footer in (
+            (self._comments, comments_path, COMMENTS_HEADER, COMMENTS_FOOTER),
+            (self._shapes, vml_path, VML_HEADER, VML_FOOTER),
+        ):
+            part.seek(0)
+            with archive.open(path, "w", force_zip64=True) as out:
+                out.write(header.encode("utf-8"))
+                shutil.copyfileobj(part, out)
+                out.write(footer.encode("utf-8"))
+
+    def close(self):
+        self._comments.close()
+        self._shapes.close()
+
+
+class _StreamCommentExcelWriter(ExcelWriter):
+    """ExcelWriter openpyxl yang mengambil comment dari _CommentStream."""
+
+    def __init__(self, workbook, archive, comments):
+        super().__init__(workbook, archive)
+        self._comment_stream = comments
+
+    def write_worksheet(self, ws):
+        if not self._comment_stream.count:
+            super().write_worksheet(ws)
+            return
+
+        comment_sheet = CommentSheet(authors=AuthorList([COMMENT_AUTHOR]), commentList=[])
+        self._comments.append(comment_sheet)
+        comment_sheet._id = len(self._comments)
+        # Harus di-set sebelum sheet ditutup agar elemen legacyDrawing ikut ditulis
+        ws.legacy_drawing = f"xl/drawings/commentsDrawing{comment_sheet._id}.vml"
+        super().write_worksheet(ws)
+
+        self._comment_stream.write_parts(self._archive, comment_sheet.path[1:], ws.legacy_drawing)
+        self.manifest.append(comment_sheet)
+        ws._rels.append(Relationship(Id="comments", type=comment_sheet._rel_type, Target=comment_sheet.path))
+
+
+class ExcelStreamWriter:
+    """
+    Penulis file Excel hasil validasi dengan openpyxl mode write-only.
+
+    Baris ditulis per batch begitu selesai divalidasi, lengkap dengan header
+    yang sudah diganti namanya, highlight dan comment untuk cell yang memiliki
+    temuan. Comment juga langsung ditulis ke file sementara, sehingga memori
+    yang dipakai tidak bergantung pada jumlah baris maupun jumlah temuan
+    (hanya dengan openpyxl STREAM_COMMENTS_OPENPYXL_VERSION; di versi lain
+    comment disimpan oleh openpyxl seperti biasa).
+    """
+
+    def __init__(self, output_file, columns, header_names=None):
+        """
+        Args:
+            output_file (str): Path file .xlsx yang ditulis.
+            columns (list): Nama kolom DataFrame, sesuai urutan.
+            header_names (dict, optional): Penggantian nama header untuk file output.
+        """
+        self.output_file = output_file
+        self.columns = list(columns)
+        self._column_positions = {column: pos for pos, column in enumerate(self.columns)}
+        self._workbook = Workbook(write_only=True)
+        self._sheet = self._workbook.create_sheet("Sheet1")
+        self._comments = _CommentStream() if STREAM_COMMENTS_SUPPORTED else None
+        self.rows_written = 0
+
+        header_names = header_names or {}
+        header = []
+        for column in self.columns:
+            cell = WriteOnlyCell(self._sheet, value=header_names.get(column, column))
+            cell.font = HEADER_FONT
+            cell.border = HEADER_BORDER
+            cell.alignment = HEADER_ALIGNMENT
+            header.append(cell)
+        self._sheet.append(header)
+
+    def write_batch(self, batch, findings):
+        """
+        Tulis satu batch baris beserta highlight temuannya.
+
+        Args:
+            batch (DataFrame): Baris yang ditulis, index asli dipertahankan.
+            findings (iterable): Hasil validasi untuk baris-baris di batch ini;
+                "row" adalah nomor baris di file input (index + 2).
+        """
+        flagged = {}
+        for result in findings:
+            flagged.setdefault(result["row"] - 2, []).append(result)
+
+        values = batch.astype(object).where(batch.notna(), None)
+        # Baris 1 adalah header
+        for excel_row, (index, *row) in enumerate(values.itertuples(name=None), self.rows_written + 2):
+            notes = {}
+            for result in flagged.get(index, ()):
+                pos = self._column_positions[result["column"]]
+                if pos not in notes:
+                    cell = WriteOnlyCell(self._sheet, value=row[pos])
+                    cell.fill = HIGHLIGHT_FILL
+                    row[pos] = cell
+                # Temuan berikutnya di cell yang sama menimpa comment sebelumnya
+                notes[pos] = finding_comment_text(result)
+            if self._comments is None:
+                for pos, text in notes.items():
+                    row[pos].comment = Comment(text, COMMENT_AUTHOR)
+            self._sheet.append(row)
+            if self._comments is not None:
+                for pos in sorted(notes):
+                    self._comments.add(excel_row, pos + 1, notes[pos])
+        self.rows_written += len(batch)
+
+    def close(self):
+        """Simpan workbook ke output_file."""
+        if self._workbook is None:
+            return
+        workbook = self._workbook
+        if self._comments is None:
+            workbook.save(self.output_file)
+            self._workbook = None
+            return
+        workbook.properties.modified = datetime.datetime.now(tz=datetime.timezone.utc).replace(tzinfo=None)
+        archive = ZipFile(self.output_file, "w", ZIP_DEFLATED, allowZip64=True)
+        try:
+            _StreamCommentExcelWriter(workbook, archive, self._comments).save()
+        finally:
+            archive.close()
+        self._workbook = None
+        self._comments.close()
+
+    def discard(self):
+        """Batalkan workbook yang belum disimpan dan hapus file sementaranya."""
+        if self._workbook is None:
+            return
+        self._workbook = None
+        if self._comments is not None:
+            self._comments.close()
+        try:
+            self._sheet.close()
+        except Exception:
+            pass  # Sheet sudah ditutup oleh save() yang gagal
+        temp_file = getattr(getattr(self._sheet, "_writer", None), "out", None)
+        if temp_file and os.path.exists(temp_file):
+            os.remove(temp_file)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        # File hanya disimpan jika semua batch berhasil ditulis
+        if exc_type is None:
+            self.close()
+        else:
+            self.discard()
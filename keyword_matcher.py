@@ -0,0 +1,196 @@
+import re
+from collections import deque
+
+
+def keyword_tokens(keyword):
+    """
+    Ubah keyword menjadi tuple token untuk pencocokan kata utuh.
+
+    Keyword yang mengandung karakter khusus atau spasi ganda tidak akan
+    pernah cocok dengan nama yang sudah dinormalisasi, sehingga dikembalikan None.
+    """
+    tokens = str(keyword).upper().split(" ")
+    if not all(re.fullmatch(r"\w+", token) for token in tokens):
+        return None
+    return tuple(tokens)
+
+
+class KeywordAutomaton:
+    """
+    Automaton Aho-Corasick untuk mencari banyak pola sekaligus dalam satu kali scan.
+
+    Simbol pola bisa berupa karakter (pola string) atau token (pola tuple of str),
+    sehingga automaton yang sama dipakai untuk pencocokan substring maupun kata utuh.
+    """
+
+    def __init__(self):
+        self._goto = [{}]
+        self._fail = [0]
+        self._output = [[]]
+        self._built = False
+
+    def add(self, pattern, value):
+        """Tambahkan pola beserta nilai yang dikembalikan jika pola ditemukan."""
+        if not pattern:
+            return
+        state = 0
+        for symbol in pattern:
+            next_state = self._goto[state].get(symbol)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][symbol] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+            state = next_state
+        self._output[state].append(value)
+        self._built = False
+
+    def build(self):
+        """Bangun failure link (BFS) dan gabungkan output dari state fallback."""
+        queue = deque(self._goto[0].values())
+        for state in queue:
+            self._fail[state] = 0
+        while queue:
+            state = queue.popleft()
+            for symbol, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and symbol not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[next_state] = self._goto[fallback].get(symbol, 0)
+                self._output[next_state] = (
+                    self._output[next_state] + self._output[self._fail[next_state]]
+                )
+        self._built = True
+        return self
+
+    def iter_matches(self, sequence):
+        """Yield nilai setiap pola yang muncul di dalam sequence."""
+        if not self._built:
+            self.build()
+        goto, fail, output = self._goto, self._fail, self._output
+        state = 0
+        for symbol in sequence:
+            while state and symbol not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(symbol, 0)
+            if output[state]:
+                yield from output[state]
+
+
+class CategoryMatcher:
+    """
+    Matcher keyword kategori yang dikompilasi sekali per load reference data.
+
+    Menggantikan loop `is_standalone_word` per keyword di check_specific_category
+    dengan satu kali scan token nama.
+    """
+
+    GENERIC_IDENTIFIERS = ("PT", "CV", "TBK")
+
+    # Kategori yang dideteksi dari keyword sebagai substring biasa (bukan kata utuh)
+    SUBSTRING_CATEGORIES = ("C0", "F1")
+
+    def __init__(self, mapping_dict):
+        self.mapping = mapping_dict
+        self._automaton = KeywordAutomaton()
+        self._generic = []
+        self._substring_automaton = KeywordAutomaton()
+        self._substring_always = set()
+        for index, (keyword, category) in enumerate(mapping_dict.items()):
+            # Keyword yang sama dengan nama kategorinya tidak dihitung (mis. "C0" -> C0)
+            if category in self.SUBSTRING_CATEGORIES and keyword.upper() != category:
+                if keyword:
+                    self._substring_automaton.add(keyword.upper(), category)
+                else:
+                    self._substring_always.add(category)  # "" ada di setiap nama
+            if keyword.upper() in self.GENERIC_IDENTIFIERS:
+                self._generic.append((keyword.upper(), category))
+                continue
+            tokens = keyword_tokens(keyword)
+            if tokens:
+                self._automaton.add(tokens, (index, keyword, category))
+        self._automaton.build()
+        self._substring_automaton.build()
+
+    def find_substring_categories(self, name):
+        """
+        Cari kategori C0/F1 yang keyword-nya muncul sebagai substring nama,
+        dalam satu kali scan karakter.
+
+        Args:
+            name (str): Nama (akan di-uppercase).
+
+        Returns:
+            set: Kategori yang ditemukan.
+        """
+        found = set(self._substring_always)
+        for category in self._substring_automaton.iter_matches(str(name).upper()):
+            found.add(category)
+            if len(found) == len(self.SUBSTRING_CATEGORIES):
+                break
+        return found
+
+    def find_categories(self, name_tokens):
+        """
+        Cari semua kategori yang keyword-nya berdiri sendiri di dalam nama.
+
+        Returns:
+            dict: {category: keyword} dengan urutan sesuai urutan mapping.
+        """
+        matches = sorted(set(self._automaton.iter_matches(name_tokens)))
+        found_categories = {}
+        for _, keyword, category in matches:
+            if category not in found_categories:
+                found_categories[category] = keyword
+        return found_categories
+
+    def find_generic(self, name_tokens):
+        """Kembalikan kategori identifier umum (PT/CV/TBK) pertama yang ditemukan."""
+        if not self._generic:
+            return None
+        token_set = set(name_tokens)
+        for keyword, category in self._generic:
+            if keyword in token_set:
+                return category
+        return None
+
+
+class StatusMatcher:
+    """
+    Index token n-gram untuk keyword status (negara/ID/N1), dikompilasi sekali
+    per load reference data.
+
+    Keyword yang berdiri sendiri di nama ditemukan dengan lookup setiap
+    potongan token nama ke dalam hash index, bukan dengan mengecek setiap
+    keyword satu per satu.
+    """
+
+    def __init__(self, status_mapping):
+        self.mapping = status_mapping
+        self._statuses = list(status_mapping.values())
+        self._index = {}
+        for order, keyword in enumerate(status_mapping):
+            tokens = keyword_tokens(keyword)
+            if tokens:
+                self._index.setdefault(tokens, []).append(order)
+        self._lengths = sorted({len(tokens) for tokens in self._index})
+
+    def find_statuses(self, name_tokens):
+        """
+        Cari status dari semua keyword yang berdiri sendiri di dalam nama.
+
+        Args:
+            name_tokens (tuple): Token nama yang sudah dinormalisasi.
+
+        Returns:
+            list: List status per keyword yang cocok, sesuai urutan mapping.
+        """
+        found = []
+        for length in self._lengths:
+            if length > len(name_tokens):
+                break
+            for start in range(len(name_tokens) - length + 1):
+                found.extend(self._index.get(name_tokens[start:start + length], ()))
+        return [self._statuses[order] for order in sorted(set(found))]
@@ -4,10 +4,13 @@ import os
 import db_utils
 import json
 import ttkbootstrap as ttkb
-from data_validator import DataValidator
+from data_validator import CancellationToken, DataValidator, ValidationCancelled
 from tool_tip import ToolTip
 from windows import ManageMappingWindow, ManageBankCodesWindow, ManageStatusMappingWindow
 import subprocess
+import multiprocessing
+import queue
+import threading
 
 # Load konfigurasi
 config = db_utils.load_config()
@@ -39,6 +42,8 @@ class App:
         self.style = ttkb.Style("cosmo")
         self.root.title("LLD-Bank Data Clarification Tool")
         
+        # Database lama: tambahkan tracking versi reference data (tidak berubah jika sudah ada)
+        db_utils.migrate_database()
         try:
             self.validator = DataValidator(FUZZY_MATCH_THRESHOLD)
         except Exception as e:
@@ -47,6 +52,8 @@ class App:
             return
         
         self.recent_files = self.load_recent_files()
+        self.validation_thread = None
+        self.reference_reload_pending = False
             
         self.create_interface()
         self.set_icon()
@@ -75,6 +82,7 @@ class App:
         file_menu = tk.Menu(menubar, tearoff=0)
         menubar.add_cascade(label="File", menu=file_menu)
         file_menu.add_command(label="Open File", command=self.process_file)
+        self.file_menu = file_menu
         file_menu.add_separator()
         file_menu.add_command(label="Recent Validated Folder", command=self.open_validated_folder, state="disabled")
         self.open_validated_folder_menu = file_menu  # Store reference to enable later
@@ -145,6 +153,7 @@ class App:
         ToolTip(self.file_button, "Klik untuk memilih file Excel yang akan divalidasi")
         
         # Recent Files
+        self.recent_buttons = []
         if self.recent_files:
             recent_frame = ttkb.Labelframe(actions_frame, text="File Terakhir", padding=10)
             recent_frame.grid(row=1, column=0, sticky="ew", pady=(0, 10))
@@ -157,6 +166,7 @@ class App:
                 )
                 btn.grid(row=idx, column=0, sticky="ew", pady=2)
                 ToolTip(btn, f"Buka file: {recent_file}")
+                self.recent_buttons.append(btn)
 
         # Progress Section dengan informasi detail
         progress_frame = ttkb.Labelframe(main_frame, text="Processing Status", padding=15)
@@ -177,6 +187,15 @@ class App:
         progress_info_frame.grid_columnconfigure(0, weight=1)
         self.progress_bar.grid(row=0, column=0, sticky="ew", padx=(0, 10))
 
+        self.cancel_button = ttkb.Button(
+            progress_info_frame,
+            text="Cancel",
+            command=self.cancel_validation,
+            state="disabled"
+        )
+        self.cancel_button.grid(row=0, column=1)
+        ToolTip(self.cancel_button, "Hentikan validasi setelah batch yang sedang diproses")
+
         # Database Management dengan grouping yang lebih baik
         db_frame = ttkb.Labelframe(main_frame, text="Data Setup", padding=15)
         db_frame.grid(row=3, column=0, sticky="ew")
@@ -364,52 +383,161 @@ Notes:
         )
         close_btn.pack(pady=10)
 
-    def process_file(self):
-        """Memproses file dengan visual feedback yang lebih baik."""
+    # Porsi progress bar (0-100) untuk setiap tahap pemrosesan
+    PROGRESS_STAGES = {
+        "read": (0, 0),
+        "validate": (0, 80),
+        "write_main": (80, 85),
+        "split": (85, 100),
+    }
+    STAGE_LABELS = {
+        "read": "Membaca file",
+        "validate": "Validasi",
+        "write_main": "Menyimpan file hasil validasi",
+        "split": "Memecah file per bank",
+    }
+    PROGRESS_POLL_MS = 100
+
+    def process_file(self, input_file=None):
+        """
+        Memproses file dengan visual feedback yang lebih baik.
+
+        Validasi berjalan di background thread; progress dikirim lewat queue
+        dan dibaca oleh main thread dengan after(), sehingga GUI tetap responsif.
+        """
+        # Open File, Ctrl+O dan tombol file terakhir tidak boleh memulai run kedua
+        if self.is_validation_running():
+            return
         try:
-            input_file = filedialog.askopenfilename(
-                title="Select Excel File",
-                filetypes=[("Excel files", "*.xlsx *.xls")],
-                initialdir="."
-            )
+            if input_file is None:
+                input_file = filedialog.askopenfilename(
+                    title="Select Excel File",
+                    filetypes=[("Excel files", "*.xlsx *.xls")],
+                    initialdir="."
+                )
 
             if not input_file:
                 return
 
             self.status_bar.config(text="Processing file...")
             self.status_label.config(text="Processing...")
-            self.progress_bar.start(10)
-            self.file_button.config(state="disabled")
+            self.progress_bar.config(mode="determinate", value=0)
+            self.set_file_actions_state("disabled")
+            self.cancel_button.config(state="normal")
             self.root.config(cursor="wait")
-            self.root.update()
 
-            try:
-                output_file, error_count, validation_results = self.validator.process_file(input_file)
-                self.last_validated_file = output_file  # Store the validated file path
-                self.last_validated_folder = os.path.dirname(output_file)  # Simpan folder
-                self.open_validated_folder_menu.entryconfig("Recent Validated Folder", state="normal")  # Enable menu item
-                
-                detail_message = "Validation Results:\n\n"
-                for result in validation_results:
-                    detail_message += f"Row {result['row']}, {result['column']}:\n"
-                    detail_message += f"Current: {result['current']}\n"
-                    detail_message += f"Suggested: {result['suggested']}\n"
-                    detail_message += f"Name: {result['name']}\n"
-                    if "bank_code" in result:
-                        detail_message += f"Bank code: {result['bank_code']}\n"
-                    detail_message += f"Status: {result['status']}\n\n"
-
-                message = f"Validasi selesai!\n\n"
-                message += f"Ditemukan {error_count} ketidaksesuaian.\n"
-                message += (
-                    f"File hasil validasi tersimpan di:\n{output_file}\n\n"
-                )
-                message += "Lihat detail hasil validasi?"
+            self.progress_queue = queue.Queue()
+            self.cancel_token = CancellationToken()
+            self.validation_thread = threading.Thread(
+                target=self.run_validation,
+                args=(input_file, self.progress_queue, self.cancel_token),
+                daemon=True,
+            )
+            self.validation_thread.start()
+            self.root.after(self.PROGRESS_POLL_MS, self.poll_validation)
+
+        except Exception as e:
+            self.status_bar.config(text="Error occurred")
+            messagebox.showerror("Error", f"Unexpected error: {str(e)}")
+
+    def is_validation_running(self):
+        """True jika thread validasi masih berjalan."""
+        return self.validation_thread is not None and self.validation_thread.is_alive()
+
+    def set_file_actions_state(self, state):
+        """Aktifkan/nonaktifkan semua aksi yang memulai validasi."""
+        self.file_button.config(state=state)
+        for btn in self.recent_buttons:
+            btn.config(state=state)
+        self.file_menu.entryconfig("Open File", state=state)
+
+    def reload_reference_data(self):
+        """
+        Muat ulang reference data validator setelah database diubah dari GUI.
+
+        Selama validasi berjalan reload ditunda sampai thread validasi selesai,
+        agar reference data yang sedang dipakai worker tidak diganti.
+        """
+        if self.is_validation_running():
+            self.reference_reload_pending = True
+            return
+        self.reference_reload_pending = False
+        self.validator.reload_reference_data()
+
+    def run_validation(self, input_file, progress_queue, cancel_token):
+        """Jalankan validasi di background thread; semua hasil dikirim lewat queue."""
+        try:
+            result = self.validator.process_file(
+                input_file,
+                progress_callback=lambda event: progress_queue.put(("progress", event)),
+                cancel_token=cancel_token,
+            )
+            progress_queue.put(("done", result))
+        except Exception as e:
+            progress_queue.put(("error", e))
 
-                if messagebox.askyesno("Success", message):
-                    self.show_validation_details(validation_results)
+    def cancel_validation(self):
+        """Minta validasi yang sedang berjalan berhenti di batch berikutnya."""
+        self.cancel_token.cancel()
+        self.cancel_button.config(state="disabled")
+        self.status_label.config(text="Membatalkan...")
 
-            except PermissionError:
+    def poll_validation(self):
+        """Baca event dari background thread dan perbarui tampilan (main thread)."""
+        try:
+            while True:
+                kind, payload = self.progress_queue.get_nowait()
+                if kind == "progress":
+                    self.show_progress(payload)
+                    continue
+                self.finish_validation(kind, payload)
+                return
+        except queue.Empty:
+            pass
+        self.root.after(self.PROGRESS_POLL_MS, self.poll_validation)
+
+    def show_progress(self, event):
+        """Perbarui progress bar dan label dari satu event progress."""
+        stage = event["stage"]
+        start, end = self.PROGRESS_STAGES.get(stage, (0, 0))
+        label = self.STAGE_LABELS.get(stage, stage)
+
+        if stage == "split":
+            fraction = event["files_done"] / event["files_total"] if event["files_total"] else 1.0
+            label += f": {event['files_done']} / {event['files_total']} file"
+        elif stage == "validate" and event["total_rows"]:
+            fraction = min(event["rows"] / event["total_rows"], 1.0)
+            label += f": {event['rows']:,} / {event['total_rows']:,} baris"
+        else:
+            fraction = 1.0
+            if stage == "validate":
+                label += f": {event['rows']:,} baris"
+        if stage == "validate" and event["rows_per_sec"]:
+            label += f" ({event['rows_per_sec']:,.0f} baris/detik)"
+
+        self.progress_bar.config(value=start + (end - start) * fraction)
+        self.status_label.config(text=label)
+        self.status_bar.config(text=f"Processing file... {label}")
+
+    def finish_validation(self, kind, payload):
+        """Tampilkan hasil validasi (atau error) setelah background thread selesai."""
+        # Hasil terakhir sudah dikirim, thread tinggal keluar dari run_validation
+        self.validation_thread.join()
+        self.validation_thread = None
+        if self.reference_reload_pending:
+            self.reload_reference_data()
+
+        self.status_bar.config(text="Ready")
+        self.status_label.config(text="Ready")
+        self.progress_bar.config(value=100 if kind == "done" else 0)
+        self.set_file_actions_state("normal")
+        self.cancel_button.config(state="disabled")
+        self.root.config(cursor="")
+
+        if kind == "error":
+            if isinstance(payload, ValidationCancelled):
+                messagebox.showinfo("Cancelled", "Validasi dibatalkan.")
+            elif isinstance(payload, PermissionError):
                 error_msg = (
                     "Tidak dapat menyimpan file hasil validasi karena file sedang digunakan.\n\n"
                     "Langkah penyelesaian:\n"
@@ -418,21 +546,60 @@ Notes:
                     "3. Coba proses validasi lagi"
                 )
                 messagebox.showerror("Permission Denied", error_msg)
-                
-            except Exception as e:
-                messagebox.showerror("Error", f"Gagal memproses file: {str(e)}")
-                
-            finally:
-                self.status_bar.config(text="Ready")
-                self.status_label.config(text="Ready")
-                self.progress_bar.stop()
-                self.file_button.config(state="normal")
-                self.root.config(cursor="")
+            else:
+                messagebox.showerror("Error", f"Gagal memproses file: {str(payload)}")
+            return
 
+        try:
+            self.show_validation_summary(*payload)
         except Exception as e:
             self.status_bar.config(text="Error occurred")
             messagebox.showerror("Error", f"Unexpected error: {str(e)}")
 
+    def show_validation_summary(self, output_file, error_count, validation_results):
+        """Menampilkan ringkasan hasil validasi."""
+        self.last_validated_file = output_file  # Store the validated file path
+        self.last_validated_folder = os.path.dirname(output_file)  # Simpan folder
+        self.open_validated_folder_menu.entryconfig("Recent Validated Folder", state="normal")  # Enable menu item
+
+        message = f"Validasi selesai!\n\n"
+        message += f"Ditemukan {error_count} ketidaksesuaian.\n"
+        message += (
+            f"File hasil validasi tersimpan di:\n{output_file}\n\n"
+        )
+        cache_stats = self.validator.run_stats.get("classification_cache")
+        if cache_stats:
+            message += (
+                f"Cache klasifikasi nama: {cache_stats['hits']} hit / "
+                f"{cache_stats['misses']} miss\n\n"
+            )
+        pair_stats = self.validator.run_stats.get("bank_pair_cache")
+        if pair_stats and (pair_stats["hits"] or pair_stats["misses"]):
+            message += (
+                f"Cache pasangan bank: {pair_stats['hits']} hit / "
+                f"{pair_stats['misses']} miss\n\n"
+            )
+        dedup_stats = self.validator.run_stats.get("dedup")
+        if dedup_stats:
+            message += (
+                f"Baris unik divalidasi: {dedup_stats['unique_rows']} dari "
+                f"{dedup_stats['rows']} (rasio {dedup_stats['ratio']:.1f}x)\n\n"
+            )
+        failed_banks = [
+            str(report["bank_code"])
+            for report in self.validator.run_stats.get("bank_files", [])
+            if report["error"]
+        ]
+        if failed_banks:
+            message += (
+                f"Gagal menulis file per bank untuk: {', '.join(failed_banks)}\n"
+                "(lihat app.log untuk detail)\n\n"
+            )
+        message += "Lihat detail hasil validasi?"
+
+        if messagebox.askyesno("Success", message):
+            self.show_validation_details(validation_results)
+
     def show_validation_details(self, validation_results):
         """Menampilkan detail hasil validasi di window baru."""
         detail_window = ttkb.Toplevel(self.root) 
@@ -504,7 +671,7 @@ Notes:
     def manage_mapping(self, event=None):
         """Membuka window Manage Mapping."""
         try:
-            mapping_window = ManageMappingWindow(self.root)
+            mapping_window = ManageMappingWindow(self.root, app=self)
             mapping_window.transient(self.root)  # Set parent window
             mapping_window.grab_set()  # Make window modal
             
@@ -526,7 +693,7 @@ Notes:
     def manage_bank_codes(self, event=None):
         """Membuka window Manage Bank Codes."""
         try:
-            bank_codes_window = ManageBankCodesWindow(self.root)
+            bank_codes_window = ManageBankCodesWindow(self.root, app=self)
             bank_codes_window.transient(self.root)  # Set parent window
             bank_codes_window.grab_set()  # Make window modal
             
@@ -548,7 +715,7 @@ Notes:
     def manage_status(self, event=None):
         """Membuka window Manage Status Mapping."""
         try:
-            status_window = ManageStatusMappingWindow(self.root)
+            status_window = ManageStatusMappingWindow(self.root, app=self)
             status_window.transient(self.root)  # Set parent window
             status_window.grab_set()  # Make window modal
             
@@ -581,7 +748,7 @@ Notes:
         """Contoh penambahan kategori baru ke DB, lalu reload."""
         success = db_utils.add_mapping_data("ref_mapping_penerima", keyword, category)
         if success:
-            self.validator.reload_reference_data()
+            self.reload_reference_data()
             messagebox.showinfo("Info", f"Berhasil menambah kategori {category} untuk '{keyword}'")
 
     def import_sql(self):
@@ -601,8 +768,7 @@ Notes:
                     if success:
                         messagebox.showinfo("Success", message)
                         # Reload data after successful import
-                        if hasattr(self, 'validator'):
-                            self.validator.reload_reference_data()
+                        self.reload_reference_data()
                     else:
                         messagebox.showerror("Error", message)
         
@@ -611,6 +777,7 @@ Notes:
             db_utils.log_error(f"Error in import_sql: {str(e)}")
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()  # Dibutuhkan worker process pada build PyInstaller
     root = ttkb.Window(themename="cosmo")
     app = App(root)
     root.mainloop()
\ No newline at end of file
@@ -0,0 +1,69 @@
+from collections import OrderedDict
+
+
+class LRUCache:
+    """
+    Cache LRU sederhana dengan batas ukuran dan statistik hit/miss.
+
+    Entry yang paling lama tidak dipakai dibuang ketika cache penuh.
+    maxsize <= 0 berarti cache dinonaktifkan (semua lookup dihitung ulang).
+    """
+
+    def __init__(self, maxsize=100000):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._data)
+
+    def get_or_compute(self, key, compute):
+        """
+        Ambil nilai untuk key dari cache, atau hitung dan simpan jika belum ada.
+
+        Args:
+            key: Key cache (harus hashable).
+            compute (callable): Fungsi tanpa argumen untuk menghitung nilai.
+
+        Returns:
+            Nilai dari cache atau hasil compute().
+        """
+        try:
+            value = self._data[key]
+        except KeyError:
+            self.misses += 1
+            value = compute()
+            if self.maxsize > 0:
+                self._data[key] = value
+                if len(self._data) > self.maxsize:
+                    self._data.popitem(last=False)
+            return value
+        self.hits += 1
+        self._data.move_to_end(key)
+        return value
+
+    def clear(self):
+        """Kosongkan cache (statistik tidak direset)."""
+        self._data.clear()
+
+    def reset_stats(self):
+        """Reset hitungan hit/miss, misalnya di awal setiap run."""
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self):
+        """
+        Statistik pemakaian cache.
+
+        Returns:
+            dict: hits, misses, hit_rate, size dan maxsize.
+        """
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+        }
@@ -0,0 +1,84 @@
+import re
+from collections import namedtuple
+
+# Bentuk normal sebuah nama, dihitung sekali per nama unik:
+# - tokens: tuple token uppercase tanpa tanda baca
+# - text: token digabung dengan satu spasi
+# - padded: text dengan spasi di awal dan akhir, untuk pencarian kata utuh
+# - token_set: himpunan token untuk lookup kata tunggal
+NormalizedName = namedtuple("NormalizedName", ["tokens", "text", "padded", "token_set"])
+
+# Kata yang dihapus (sebagai substring) sebelum membandingkan nama dengan
+# nama referensi sandi bank
+BANK_CODE_LOCATION_WORDS = ["HONG KONG", "SINGAPORE", "INDONESIA", "CHINA", "JAPAN"]
+BANK_CODE_COMMON_WORDS = ["PT", "BANK", "PERSERO", "TBK", "LIMITED", "LTD"]
+
+# Kata umum yang dihapus (sebagai kata utuh) sebelum membandingkan dua nama bank
+BANK_COMMON_WORDS = [
+    "PT",
+    "BANK",
+    "PERSERO",
+    "(PERSERO)",
+    "TBK",
+    "INCORPORATION",
+    "CORPORATION",
+    "LTD",
+    "LIMITED",
+    "INCORPORATED",
+]
+
+
+def tokenize_name(text):
+    """
+    Normalisasi nama menjadi tuple token, sama seperti yang dilakukan
+    is_standalone_word: uppercase, karakter khusus diganti spasi, lalu split.
+
+    Args:
+        text (str): Nama yang akan dinormalisasi.
+
+    Returns:
+        tuple: Token-token nama dalam uppercase.
+    """
+    text = re.sub(r"[^\w\s]", " ", str(text).upper())
+    return tuple(text.split())
+
+
+def normalize_name(name):
+    """
+    Ubah nama mentah menjadi NormalizedName.
+
+    Args:
+        name: Nama (nilai apa pun, diubah dengan str()).
+
+    Returns:
+        NormalizedName: Bentuk normal nama.
+    """
+    tokens = tokenize_name(name)
+    text = " ".join(tokens)
+    return NormalizedName(tokens, text, f" {text} ", frozenset(tokens))
+
+
+def strip_bank_code_words(normalized):
+    """
+    Varian nama untuk validasi sandi bank: kata lokasi/negara dan kata umum
+    (PT, BANK, ...) dihapus sebagai substring dari teks normal.
+    """
+    name = normalized.text
+    for word in BANK_CODE_LOCATION_WORDS + BANK_CODE_COMMON_WORDS:
+        name = name.replace(word, "")
+    return name.strip()
+
+
+def strip_bank_words(normalized):
+    """
+    Varian nama untuk is_same_bank: kata umum (PT, BANK, TBK, ...) dihapus
+    jika berdiri sendiri di awal, tengah atau akhir teks normal.
+    """
+    name = normalized.text
+    for word in BANK_COMMON_WORDS:
+        name = name.replace(f" {word} ", " ")
+        if name.startswith(f"{word} "):
+            name = name[len(word):].strip()
+        if name.endswith(f" {word}"):
+            name = name[: -len(word)].strip()
+    return name
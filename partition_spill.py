@@ -0,0 +1,128 @@
+import os
+import pickle
+import tempfile
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+# Lokasi potongan satu bank di file spill: offset setiap record dan jumlah barisnya
+BankPartition = namedtuple("BankPartition", ["path", "offsets", "rows"])
+
+
+def bank_partition_key(value):
+    """
+    Kunci partisi (dan nama file) untuk satu nilai kode bank.
+
+    Reader streaming mempertahankan tipe asli cell, sehingga kode yang sama
+    bisa muncul sebagai teks "333" dan angka 333 (atau 333.0); keduanya harus
+    masuk ke partisi yang sama.
+
+    Returns:
+        str: Kode bank yang dinormalisasi, atau None jika kosong.
+    """
+    if value is None or (not isinstance(value, str) and pd.isna(value)):
+        return None
+    if isinstance(value, (float, np.floating)) and float(value).is_integer():
+        value = int(value)
+    key = str(value).strip()
+    return key or None
+
+
+class BankPartitionSpill:
+    """
+    Penampung sementara baris dan temuan per kode bank di disk.
+
+    Setiap batch yang selesai divalidasi dipotong per kode bank lalu ditulis
+    ke satu file spill sebagai record pickle; yang disimpan di memori hanya
+    offset record per bank. File per bank kemudian bisa ditulis (juga oleh
+    worker process) dengan membaca record-nya satu per satu, sehingga memori
+    tidak bergantung pada jumlah baris file input.
+
+    Urutan bank mengikuti kemunculan pertamanya di file, dan urutan baris
+    dalam satu bank sama dengan urutan asli. Baris dikelompokkan per
+    bank_partition_key; baris tanpa kode bank dilewati.
+    """
+
+    def __init__(self, directory=None):
+        fd, self.path = tempfile.mkstemp(suffix=".bank_spill", dir=directory)
+        self._file = os.fdopen(fd, "wb")
+        self._offsets = {}
+        self._rows = {}
+
+    def add(self, batch, bank_column, findings, fields):
+        """
+        Potong satu batch per kode bank dan tulis ke file spill.
+
+        Args:
+            batch (DataFrame): Baris yang sudah divalidasi.
+            bank_column (str): Nama kolom kode bank.
+            findings (list): Temuan untuk baris-baris di batch ini.
+            fields (tuple): Urutan field temuan untuk tuple ringkas.
+        """
+        # Factorize nilai mentah, lalu gabungkan nilai yang kuncinya sama
+        raw_codes, raw_values = pd.factorize(batch[bank_column], sort=False)
+        raw_keys = [bank_partition_key(value) for value in raw_values]
+        key_codes, unique_banks = pd.factorize(pd.Series(raw_keys, dtype=object), sort=False)
+        if len(unique_banks) == 0:
+            return
+        codes = np.where(raw_codes >= 0, key_codes[raw_codes], -1)
+
+        results_by_bank = {}
+        for finding in findings:
+            results_by_bank.setdefault(bank_partition_key(finding["bank_code"]), []).append(
+                tuple(finding[field] for field in fields)
+            )
+
+        # Baris diurutkan sekali per batch (stabil); potongan per bank berupa slice
+        order = np.argsort(codes, kind="stable")
+        sorted_batch = batch.iloc[order]
+        start = int(np.count_nonzero(codes < 0))
+        ends = start + np.cumsum(np.bincount(codes[codes >= 0], minlength=len(unique_banks)))
+        for bank_code, end in zip(unique_banks, ends.tolist()):
+            self._offsets.setdefault(bank_code, []).append(self._file.tell())
+            self._rows[bank_code] = self._rows.get(bank_code, 0) + end - start
+            pickle.dump(
+                (sorted_batch.iloc[start:end], results_by_bank.get(bank_code, [])),
+                self._file,
+                protocol=pickle.HIGHEST_PROTOCOL,
+            )
+            start = end
+
+    def partitions(self):
+        """
+        Selesaikan penulisan dan kembalikan potongan per bank.
+
+        Returns:
+            list: Tuple (bank_code, BankPartition) sesuai urutan kemunculan bank.
+        """
+        self._file.flush()
+        return [
+            (bank_code, BankPartition(self.path, offsets, self._rows[bank_code]))
+            for bank_code, offsets in self._offsets.items()
+        ]
+
+    def close(self):
+        if not self._file.closed:
+            self._file.close()
+
+    def remove(self):
+        """Hapus file spill."""
+        self.close()
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass  # Sudah terhapus, atau masih dibuka worker yang dibatalkan (Windows)
+
+
+def iter_partition(partition):
+    """
+    Baca record satu bank dari file spill.
+
+    Yields:
+        tuple: (batch, findings) dengan findings berupa tuple ringkas.
+    """
+    with open(partition.path, "rb") as f:
+        for offset in partition.offsets:
+            f.seek(offset)
+            yield pickle.load(f)
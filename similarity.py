@@ -0,0 +1,99 @@
+from difflib import SequenceMatcher
+
+# Mulai panjang ini SequenceMatcher memakai heuristik autojunk, jadi
+# matching_characters tidak lagi identik dan ratio dihitung oleh difflib
+AUTOJUNK_MIN_LENGTH = 200
+
+
+def _ratio(matches, total_length):
+    """Rumus ratio SequenceMatcher: 2 * M / T (1.0 jika kedua string kosong)."""
+    return 2.0 * matches / total_length if total_length else 1.0
+
+
+def length_upper_bound(a, b):
+    """
+    Batas atas ratio dari panjang string saja.
+
+    Jumlah karakter yang cocok tidak mungkin melebihi panjang string terpendek.
+    """
+    return _ratio(min(len(a), len(b)), len(a) + len(b))
+
+
+def char_upper_bound(a, b):
+    """
+    Batas atas ratio dari jumlah karakter bersama (multiset).
+
+    Setiap karakter yang cocok di matching block SequenceMatcher pasti ada di
+    kedua string, sehingga jumlahnya tidak melebihi irisan multiset karakter.
+    """
+    shared = sum(min(a.count(char), b.count(char)) for char in set(a))
+    return _ratio(shared, len(a) + len(b))
+
+
+def ratio_exceeds(a, b, threshold):
+    """
+    Cek apakah SequenceMatcher(None, a, b).ratio() > threshold.
+
+    Pasangan yang batas atasnya (panjang, lalu karakter bersama) sudah tidak
+    melebihi threshold langsung ditolak tanpa menghitung ratio. Hanya pasangan
+    yang lolos kedua filter yang dihitung ratio persisnya, sehingga hasilnya
+    selalu sama dengan membandingkan ratio secara langsung.
+
+    Args:
+        a (str): String pertama.
+        b (str): String kedua.
+        threshold (float): Batas kemiripan.
+
+    Returns:
+        bool: True jika ratio melebihi threshold.
+    """
+    if length_upper_bound(a, b) <= threshold:
+        return False
+    if char_upper_bound(a, b) <= threshold:
+        return False
+    return sequence_ratio(a, b) > threshold
+
+
+def sequence_ratio(a, b):
+    """Nilai yang sama dengan SequenceMatcher(None, a, b).ratio()."""
+    if len(b) >= AUTOJUNK_MIN_LENGTH:
+        return SequenceMatcher(None, a, b).ratio()
+    return _ratio(matching_characters(a, b), len(a) + len(b))
+
+
+def matching_characters(a, b):
+    """
+    Jumlah karakter yang cocok menurut algoritma Ratcliff/Obershelp milik
+    SequenceMatcher (tanpa isjunk), tanpa membangun objek SequenceMatcher.
+
+    Longest match dipilih dengan aturan tie-break yang sama seperti
+    SequenceMatcher.find_longest_match, sehingga hasilnya identik.
+    """
+    b2j = {}
+    for j, char in enumerate(b):
+        b2j.setdefault(char, []).append(j)
+
+    matched = 0
+    queue = [(0, len(a), 0, len(b))]
+    while queue:
+        alo, ahi, blo, bhi = queue.pop()
+        besti, bestj, bestsize = alo, blo, 0
+        j2len = {}
+        for i in range(alo, ahi):
+            new_j2len = {}
+            for j in b2j.get(a[i], ()):
+                if j < blo:
+                    continue
+                if j >= bhi:
+                    break
+                k = new_j2len[j] = j2len.get(j - 1, 0) + 1
+                if k > bestsize:
+                    besti, bestj, bestsize = i - k + 1, j - k + 1, k
+            j2len = new_j2len
+        if bestsize:
+            matched += bestsize
+            if alo < besti and blo < bestj:
+                queue.append((alo, besti, blo, bestj))
+            if besti + bestsize < ahi and bestj + bestsize < bhi:
+                queue.append((besti + bestsize, ahi, bestj + bestsize, bhi))
+    return matched
@@ -0,0 +1,68 @@
+import os
+import shutil
+import sys
+import tempfile
+
+import pytest
+from openpyxl import load_workbook
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DUMMY_DATA = os.path.join(ROOT, "data", "dummy_data.xlsx")
+
+sys.path.insert(0, ROOT)
+# config.json dan app.log dipakai relatif terhadap working directory saat modul
+# di-import; jalankan dari folder sementara agar file di repo tidak berubah
+_WORKDIR = tempfile.mkdtemp(prefix="validator_tests_")
+shutil.copy(os.path.join(ROOT, "config.json"), _WORKDIR)
+os.chdir(_WORKDIR)
+
+import db_utils  # noqa: E402
+
+db_utils.set_headless()
+
+
+@pytest.fixture
+def reference_db(tmp_path, monkeypatch):
+    """
+    Salinan config.json dan reference_data.db di tmp_path, yang juga menjadi
+    working directory (folder Output ikut dibuat di sana).
+    """
+    shutil.copy(os.path.join(ROOT, "config.json"), tmp_path)
+    database = tmp_path / "reference_data.db"
+    shutil.copyfile(os.path.join(ROOT, "reference_data.db"), database)
+    manager = db_utils.ConnectionManager(str(database))
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(db_utils, "DATABASE_NAME", str(database))
+    monkeypatch.setattr(db_utils, "connection_manager", manager)
+    yield str(database)
+    manager.close_all()
+
+
+@pytest.fixture
+def validator(reference_db):
+    from data_validator import DataValidator
+
+    return DataValidator(db_utils.FUZZY_MATCH_THRESHOLD)
+
+
+def write_workbook(path, header, rows):
+    """Tulis file input .xlsx dari header dan list baris."""
+    from openpyxl import Workbook
+
+    workbook = Workbook()
+    sheet = workbook.active
+    sheet.append(header)
+    for row in rows:
+        sheet.append(row)
+    workbook.save(path)
+    return str(path)
+
+
+def read_dummy_rows():
+    """Header dan baris data/dummy_data.xlsx apa adanya (tipe cell asli)."""
+    workbook = load_workbook(DUMMY_DATA, read_only=True)
+    try:
+        rows = [list(row) for row in workbook.active.iter_rows(values_only=True)]
+    finally:
+        workbook.close()
+    return rows[0], rows[1:]
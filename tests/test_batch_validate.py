@@ -0,0 +1,32 @@
+import os
+import shutil
+
+import batch_validate
+from tests.conftest import DUMMY_DATA
+
+
+def test_output_names_are_unique_per_run():
+    names = batch_validate.output_names(
+        ["a/data.xlsx", "b/data.xlsx", "data_2.xlsx", "c/DATA.xlsx", "other.xlsx"]
+    )
+    assert names == ["data", "data_3", "data_2", "DATA_4", "other"]
+
+
+def test_same_basename_from_different_folders_do_not_overwrite(reference_db, tmp_path):
+    inputs = []
+    for folder in ("a", "b"):
+        os.makedirs(tmp_path / folder)
+        inputs.append(str(tmp_path / folder / "dummy_data.xlsx"))
+        shutil.copy(DUMMY_DATA, inputs[-1])
+
+    results = batch_validate.run(inputs)
+
+    assert [result["status"] for result in results] == ["ok", "ok"]
+    output_files = [result["output_file"] for result in results]
+    assert len({os.path.dirname(path) for path in output_files}) == 2
+    assert all(os.path.exists(path) for path in output_files)
+    assert results[0]["findings"] == results[1]["findings"]
+    assert sorted(os.listdir("Output")) == [
+        "dummy_data_2024_10_validated",
+        "dummy_data_2_2024_10_validated",
+    ]
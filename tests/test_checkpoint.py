@@ -0,0 +1,145 @@
+import json
+import multiprocessing
+import os
+import pickle
+import shutil
+
+import pandas as pd
+import pytest
+
+from checkpoint import CHECKPOINT_FORMAT, ValidationCheckpoint
+from data_validator import CancellationToken, ValidationCancelled
+from tests.conftest import DUMMY_DATA
+
+
+def _batch(start, rows):
+    return pd.DataFrame({"value": range(start, start + rows)}, index=range(start, start + rows))
+
+
+def test_load_keeps_only_offsets_and_replays_batches(tmp_path):
+    path = str(tmp_path / "run.checkpoint")
+    checkpoint = ValidationCheckpoint(path, "key")
+    assert checkpoint.load() is False
+    checkpoint.add_batch(_batch(0, 3), [{"row": 2}])
+    checkpoint.add_batch(_batch(3, 2), [])
+    checkpoint.mark_stage("validated")
+    checkpoint.close()
+
+    resumed = ValidationCheckpoint(path, "key")
+    assert resumed.load() is True
+    assert resumed.rows_done == 5
+    assert len(resumed.batch_offsets) == 2
+    assert not hasattr(resumed, "batches")
+    assert resumed.stages == {"validated"}
+    batches = list(resumed.iter_batches())
+    assert [batch["value"].tolist() for batch, _ in batches] == [[0, 1, 2], [3, 4]]
+    assert [findings for _, findings in batches] == [[{"row": 2}], []]
+
+    # Batch baru ditambahkan setelah batch lama
+    resumed.add_batch(_batch(5, 1), [])
+    assert resumed.rows_done == 6
+    resumed.close()
+
+
+def test_truncated_batch_is_dropped(tmp_path):
+    path = str(tmp_path / "run.checkpoint")
+    checkpoint = ValidationCheckpoint(path, "key")
+    checkpoint.load()
+    checkpoint.add_batch(_batch(0, 3), [])
+    complete_size = os.path.getsize(path)
+    checkpoint.add_batch(_batch(3, 100), [])
+    checkpoint.close()
+    with open(path, "r+b") as f:
+        f.truncate(complete_size + 40)
+
+    resumed = ValidationCheckpoint(path, "key")
+    assert resumed.load() is True
+    assert resumed.rows_done == 3
+    assert os.path.getsize(path) == complete_size
+    resumed.add_batch(_batch(3, 2), [])
+    resumed.close()
+
+    again = ValidationCheckpoint(path, "key")
+    again.load()
+    assert [len(batch) for batch, _ in again.iter_batches()] == [3, 2]
+    again.close()
+
+
+class _Unpickled(Exception):
+    pass
+
+
+def _refuse_unpickle():
+    raise _Unpickled()
+
+
+class _Payload:
+    def __reduce__(self):
+        return (_refuse_unpickle, ())
+
+
+@pytest.mark.parametrize("header", [None, {"format": CHECKPOINT_FORMAT, "key": "other"}, "not json"])
+def test_data_is_not_unpickled_without_matching_header(tmp_path, header):
+    path = str(tmp_path / "run.checkpoint")
+    with open(path, "wb") as f:
+        pickle.dump(("stage", _Payload()), f)
+    if header is not None:
+        with open(path + ".json", "w", encoding="utf-8") as f:
+            f.write(header if isinstance(header, str) else json.dumps(header))
+
+    checkpoint = ValidationCheckpoint(path, "key")
+    assert checkpoint.load() is False
+    checkpoint.close()
+    assert os.path.getsize(path) == 0
+    with open(path + ".json", encoding="utf-8") as f:
+        assert json.load(f) == {"format": CHECKPOINT_FORMAT, "key": "key"}
+
+
+def _cancel_after(validator, batches):
+    token = CancellationToken()
+    seen = []
+
+    def on_batch(event):
+        seen.append(event)
+        if len(seen) == batches:
+            token.cancel()
+
+    return token, validator.subscribe(on_batch, ["batch_completed"])
+
+
+def test_resume_after_cancel_matches_fresh_run(validator, tmp_path):
+    input_file = str(tmp_path / "dummy_data.xlsx")
+    shutil.copy(DUMMY_DATA, input_file)
+    validator.batch_rows = 20
+    validator.split_workers = 1
+
+    token, unsubscribe = _cancel_after(validator, 3)
+    with pytest.raises(ValidationCancelled):
+        validator.process_file(input_file, cancel_token=token, use_checkpoint=True)
+    unsubscribe()
+
+    output_file, resumed_count, resumed_results = validator.process_file(input_file, use_checkpoint=True)
+    assert validator.run_stats["resumed_rows"] == 60
+    assert not os.path.exists(os.path.splitext(output_file)[0] + ".checkpoint")
+
+    shutil.rmtree("Output")
+    _, fresh_count, fresh_results = validator.process_file(input_file)
+    assert resumed_count == fresh_count
+    assert resumed_results == fresh_results
+
+
+def test_cancel_shuts_down_worker_pool(validator, tmp_path):
+    input_file = str(tmp_path / "dummy_data.xlsx")
+    shutil.copy(DUMMY_DATA, input_file)
+    validator.batch_rows = 10
+    validator.parallel_workers = 2
+    validator.parallel_min_rows = 0
+
+    token, _ = _cancel_after(validator, 2)
+    # excinfo menahan traceback (dan frame process_file), jadi pool harus
+    # sudah dimatikan oleh process_file sendiri, bukan oleh GC
+    with pytest.raises(ValidationCancelled) as excinfo:
+        validator.process_file(input_file, cancel_token=token)
+    assert validator.run_stats["workers"] == 2
+    assert multiprocessing.active_children() == []
+    del excinfo
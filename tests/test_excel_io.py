@@ -0,0 +1,130 @@
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+from openpyxl import load_workbook
+
+import excel_io
+from excel_io import COMMENT_AUTHOR, ExcelBatchReader, ExcelStreamWriter, finding_comment_text
+from tests.conftest import DUMMY_DATA, write_workbook
+
+COLUMNS = ["nama", "kategori", "nilai"]
+
+
+def _finding(row, column, suggested):
+    return {
+        "row": row, "column": column, "current": "X", "suggested": suggested,
+        "name": f"NAMA {row}", "bank_code": "222", "status": "ID",
+    }
+
+
+def _write(path):
+    batches = [
+        pd.DataFrame({"nama": ["A", "B"], "kategori": ["C0", None], "nilai": [1, 2.5]}),
+        pd.DataFrame({"nama": ["C & <D>"], "kategori": ["E0"], "nilai": [np.nan]}, index=[2]),
+    ]
+    findings = [
+        [_finding(2, "kategori", "B0"), _finding(3, "nama", "C0"), _finding(3, "nama", "D0")],
+        [_finding(4, "kategori", "Z9")],
+    ]
+    with ExcelStreamWriter(str(path), COLUMNS, {"nama": "Nama"}) as writer:
+        for batch, batch_findings in zip(batches, findings):
+            writer.write_batch(batch, batch_findings)
+    return findings
+
+
+def _cells(path):
+    workbook = load_workbook(path)
+    sheet = workbook.active
+    cells = {}
+    for row in sheet.iter_rows():
+        for cell in row:
+            cells[cell.coordinate] = (
+                cell.value,
+                cell.fill.fgColor.rgb if cell.fill.fill_type else None,
+                (cell.comment.text, cell.comment.author) if cell.comment else None,
+            )
+    return cells
+
+
+@pytest.mark.parametrize("stream_comments", [True, False])
+def test_comments_round_trip_through_load_workbook(tmp_path, monkeypatch, stream_comments):
+    monkeypatch.setattr(excel_io, "STREAM_COMMENTS_SUPPORTED", stream_comments)
+    path = tmp_path / "out.xlsx"
+    findings = _write(path)
+
+    cells = _cells(path)
+    assert cells["A1"][0] == "Nama"
+    assert cells["B2"] == ("C0", "00FFFF00", (finding_comment_text(findings[0][0]), COMMENT_AUTHOR))
+    # Temuan terakhir di cell yang sama yang dipakai sebagai comment
+    assert cells["A3"] == ("B", "00FFFF00", (finding_comment_text(findings[0][2]), COMMENT_AUTHOR))
+    assert cells["B3"] == (None, None, None)
+    assert cells["A4"] == ("C & <D>", None, None)
+    assert cells["B4"][2] == (finding_comment_text(findings[1][0]), COMMENT_AUTHOR)
+    assert cells["C3"][0] == 2.5 and cells["C4"][0] is None
+
+
+def test_stream_and_openpyxl_comments_are_identical(tmp_path, monkeypatch):
+    _write(tmp_path / "stream.xlsx")
+    monkeypatch.setattr(excel_io, "STREAM_COMMENTS_SUPPORTED", False)
+    _write(tmp_path / "openpyxl.xlsx")
+    assert _cells(tmp_path / "stream.xlsx") == _cells(tmp_path / "openpyxl.xlsx")
+
+
+def test_stream_comments_follow_pinned_openpyxl():
+    import openpyxl
+
+    assert excel_io.STREAM_COMMENTS_SUPPORTED == (
+        openpyxl.__version__ == excel_io.STREAM_COMMENTS_OPENPYXL_VERSION
+    )
+
+
+def test_reader_keeps_interior_blank_rows(tmp_path):
+    path = write_workbook(
+        tmp_path / "in.xlsx",
+        ["a", "b"],
+        [[1, "x"], [None, None], [3, "z"], [None, None], [None, None]],
+    )
+    reader = ExcelBatchReader(path, batch_rows=2)
+    try:
+        frame = pd.concat(list(reader))
+    finally:
+        reader.close()
+    assert frame.index.tolist() == [0, 1, 2]
+    assert frame["a"].tolist()[::2] == [1, 3]
+    assert frame.iloc[1].isna().all()
+
+
+def _same_cells(frame, expected):
+    assert list(frame.columns) == list(expected.columns)
+    assert frame.index.tolist() == expected.index.tolist()
+    for column in expected.columns:
+        for actual, value in zip(frame[column], expected[column]):
+            if pd.isna(value):
+                assert pd.isna(actual), (column, actual)
+            else:
+                assert (actual, type(actual)) == (value, type(value)), column
+
+
+@pytest.mark.parametrize("batch_rows", [1, 7, 20000])
+def test_reader_matches_read_excel(tmp_path, batch_rows):
+    mixed = write_workbook(
+        tmp_path / "mixed.xlsx",
+        ["text", "number", "flag", "when"],
+        [
+            ["222", 222, True, datetime(2024, 10, 1)],
+            [None, 1.5, False, None],
+            ["  spasi ", -3, None, datetime(2024, 10, 2, 8, 30)],
+            [None, None, None, None],
+            ["x", 0, True, None],
+        ],
+    )
+    for path in (DUMMY_DATA, mixed):
+        reader = ExcelBatchReader(path, batch_rows=batch_rows)
+        try:
+            frame = pd.concat(list(reader))
+        finally:
+            reader.close()
+        # Tipe per cell (teks tetap teks) sama dengan pandas tanpa konversi dtype
+        _same_cells(frame, pd.read_excel(path, dtype=object))
@@ -0,0 +1,51 @@
+from memo_cache import LRUCache
+
+
+def test_lru_evicts_least_recently_used():
+    cache = LRUCache(maxsize=2)
+    computed = []
+
+    def compute(value):
+        def run():
+            computed.append(value)
+            return value * 10
+        return run
+
+    assert cache.get_or_compute("a", compute(1)) == 10
+    assert cache.get_or_compute("b", compute(2)) == 20
+    assert cache.get_or_compute("a", compute(99)) == 10  # "a" jadi paling baru
+    assert cache.get_or_compute("c", compute(3)) == 30  # "b" dibuang
+    assert cache.get_or_compute("a", compute(99)) == 10
+    assert cache.get_or_compute("b", compute(4)) == 40
+    assert computed == [1, 2, 3, 4]
+    assert len(cache) == 2
+    assert cache.stats() == {
+        "hits": 2, "misses": 4, "hit_rate": 2 / 6, "size": 2, "maxsize": 2,
+    }
+
+
+def test_lru_disabled_and_reset():
+    cache = LRUCache(maxsize=0)
+    assert cache.get_or_compute("a", lambda: 1) == 1
+    assert cache.get_or_compute("a", lambda: 2) == 2
+    assert len(cache) == 0
+    assert cache.stats()["misses"] == 2
+
+    cache = LRUCache(maxsize=5)
+    cache.get_or_compute("a", lambda: 1)
+    cache.get_or_compute("a", lambda: 1)
+    cache.clear()
+    assert len(cache) == 0 and cache.stats()["hits"] == 1
+    cache.reset_stats()
+    assert cache.stats()["hit_rate"] == 0.0
+
+
+def test_classification_cache_matches_uncached(validator):
+    names = ["PT BANK MANDIRI TBK", "bank indonesia", "KOPERASI MAJU", "HSBC HONG KONG", ""]
+    for side, mapping in validator.reference_mapping.items():
+        for name in names * 2:
+            result = validator.classify_name(side, name)
+            assert result.category == validator.check_specific_category(name, mapping)
+    for name in names * 2:
+        assert list(validator.get_cached_suggested_status(name)) == validator.get_suggested_status(name)
+    assert validator.classification_cache.hits > 0
@@ -0,0 +1,186 @@
+"""
+Keyword matcher dan name_normalizer dibandingkan dengan pengecekan lama
+(regex + `f" {word} " in text` dan substring `in`) pada nama acak.
+"""
+import random
+import re
+
+import pytest
+
+from keyword_matcher import CategoryMatcher, KeywordAutomaton, StatusMatcher
+from name_normalizer import normalize_name, strip_bank_code_words, strip_bank_words
+
+OLD_SHORT_KEYWORDS = {
+    "PT", "WHO", "UN", "TBK", "CV", "LTD", "INC", "CORP", "CO",
+    "LLC", "PTE", "PVT", "BV", "NV", "SA", "GMBH", "AG", "SL",
+    "SRL", "SAS", "SARL", "SPA", "SNC", "SCS", "SCA", "SAR",
+    "SASU", "SARLU",
+}
+OLD_COMPANY_WORDS = {"PT", "PERSERO", "TBK", "LTD", "CV", "KOPERASI"}
+FILLER_WORDS = [
+    "PT", "PT.", "P.T.", "CV", "TBK", "LTD", "CO", "SA", "UN", "WHO", "PTE",
+    "BANK", "BANKING", "PERSERO", "(PERSERO)", "KOPERASI", "HONG", "KONG",
+    "SINGAPORE", "CHINA", "MANDIRI", "ASIA", "CENTRAL", "LIMITED", "INC.",
+    "CORP", "A", "-", "  ", "COMPANY", "PTX",
+]
+
+
+def old_is_standalone_word(word, text):
+    if not text or not word:
+        return False
+    word = word.upper()
+    text = " ".join(re.sub(r"[^\w\s]", " ", text.upper()).split())
+    text = f" {text} "
+    if word in OLD_SHORT_KEYWORDS:
+        for match in re.finditer(fr"\b{re.escape(word)}\b", text):
+            start, end = match.span()
+            if text[start - 1] == " " and text[end] == " ":
+                return True
+        return False
+    return f" {word} " in text
+
+
+def old_check_specific_category(name, mapping_dict, category_priority):
+    name = str(name).upper()
+    found_categories = {}
+    for keyword, category in mapping_dict.items():
+        if keyword.upper() in ["PT", "CV", "TBK"]:
+            continue
+        if old_is_standalone_word(keyword, name) and category not in found_categories:
+            found_categories[category] = keyword
+    if found_categories:
+        for priority_category in category_priority:
+            if priority_category in found_categories:
+                return priority_category
+        return next(iter(found_categories))
+    for keyword, category in mapping_dict.items():
+        if keyword.upper() in ["PT", "CV", "TBK"] and old_is_standalone_word(keyword, name):
+            return category
+    return None
+
+
+def old_has_keyword_category(name, mapping_dict, target):
+    for keyword, category in mapping_dict.items():
+        if keyword.upper() == target:
+            continue
+        if keyword.upper() in str(name).upper() and category == target:
+            return True
+    return False
+
+
+def old_get_suggested_status(name, status_mapping):
+    name = str(name).upper()
+    for kw in OLD_SHORT_KEYWORDS:
+        if kw in name and not old_is_standalone_word(kw, name):
+            return set()
+    country_statuses = set()
+    for keyword, statuses in status_mapping.items():
+        if old_is_standalone_word(keyword, name):
+            country_statuses.update(s for s in statuses if s not in ["ID", "N1"])
+    if country_statuses:
+        return country_statuses
+    if any(old_is_standalone_word(kw, name) for kw in OLD_COMPANY_WORDS):
+        return {"ID", "N1"}
+    return set()
+
+
+def old_same_bank_clean(name):
+    name = " ".join(re.sub(r"[^\w\s]", " ", str(name).upper()).split())
+    for word in ["PT", "BANK", "PERSERO", "(PERSERO)", "TBK", "INCORPORATION",
+                 "CORPORATION", "LTD", "LIMITED", "INCORPORATED"]:
+        name = name.replace(f" {word} ", " ")
+        if name.startswith(f"{word} "):
+            name = name[len(word):].strip()
+        if name.endswith(f" {word}"):
+            name = name[: -len(word)].strip()
+    return name
+
+
+def old_bank_code_clean(name):
+    name = " ".join(re.sub(r"[^\w\s]", " ", str(name).upper()).split())
+    for word in ["HONG KONG", "SINGAPORE", "INDONESIA", "CHINA", "JAPAN", "",
+                 "PT", "BANK", "PERSERO", "TBK", "LIMITED", "LTD"]:
+        name = name.replace(word, "")
+    return name.strip()
+
+
+def random_names(keywords, count, seed):
+    rng = random.Random(seed)
+    words = list(keywords) + FILLER_WORDS
+    names = []
+    for _ in range(count):
+        name = " ".join(rng.choice(words) for _ in range(rng.randint(0, 5)))
+        if rng.random() < 0.2:
+            name = name.lower()
+        if rng.random() < 0.2:
+            name = name.replace(" ", rng.choice([".", ",", "", "  "]), 1)
+        names.append(name)
+    return names
+
+
+@pytest.mark.parametrize("side, seed", [("penerima", 1), ("pembayar", 2)])
+def test_category_matcher_matches_old_checks(validator, side, seed):
+    mapping = validator.reference_mapping[side]
+    matcher = validator.category_matchers[side]
+    for name in random_names(mapping, 3000, seed):
+        assert validator.check_specific_category(name, mapping) == old_check_specific_category(
+            name, mapping, validator.category_priority
+        ), name
+        found = matcher.find_substring_categories(name)
+        for category in CategoryMatcher.SUBSTRING_CATEGORIES:
+            assert (category in found) == old_has_keyword_category(name, mapping, category), name
+
+
+def test_suggested_status_matches_old_checks(validator):
+    status_mapping = validator.status_mapping
+    keywords = list(status_mapping) + sorted(OLD_SHORT_KEYWORDS)
+    for name in random_names(keywords, 3000, seed=7):
+        assert set(validator.get_suggested_status(name)) == old_get_suggested_status(
+            name, status_mapping
+        ), name
+
+
+def test_standalone_word_matches_old_check(validator):
+    rng = random.Random(3)
+    keywords = FILLER_WORDS + sorted(OLD_SHORT_KEYWORDS) + ["HONG KONG", "PT BANK", "CENTRAL ASIA"]
+    for name in random_names(keywords, 3000, seed=5):
+        for word in rng.sample(keywords, 5):
+            assert validator.is_standalone_word(word, name) == old_is_standalone_word(word, name)
+
+
+def test_matchers_on_small_mapping():
+    mapping = {
+        "BANK INDONESIA": "C0",
+        "C0": "C0",
+        "ASIAN DEVELOPMENT": "F1",
+        "KOPERASI": "E1",
+        "PT": "E0",
+        "BANK": "B0",
+        "A.B": "X1",  # tidak pernah cocok sebagai kata utuh
+    }
+    matcher = CategoryMatcher(mapping)
+    tokens = normalize_name("pt. Bank Indonesia (Persero)").tokens
+    assert matcher.find_categories(tokens) == {"C0": "BANK INDONESIA", "B0": "BANK"}
+    assert matcher.find_generic(tokens) == "E0"
+    assert matcher.find_categories(normalize_name("A.B").tokens) == {}
+    assert matcher.find_substring_categories("xbank indonesiax") == {"C0"}
+    assert matcher.find_substring_categories("c0 asian developments") == {"F1"}
+
+    statuses = StatusMatcher({"HONG KONG": ["HK"], "PT": ["ID", "N1"], "KONG": ["XX"]})
+    assert statuses.find_statuses(normalize_name("PT HONG-KONG").tokens) == [
+        ["HK"], ["ID", "N1"], ["XX"]
+    ]
+
+
+def test_automaton_reports_overlapping_patterns():
+    automaton = KeywordAutomaton()
+    for pattern in ("HE", "SHE", "HIS", "HERS"):
+        automaton.add(pattern, pattern)
+    assert sorted(automaton.iter_matches("USHERS")) == ["HE", "HERS", "SHE"]
+
+
+def test_bank_name_cleaners_match_old_cleaners():
+    for name in random_names(["HONG KONG", "INDONESIA", "JAPAN", "INCORPORATED"], 5000, seed=11):
+        normalized = normalize_name(name)
+        assert strip_bank_words(normalized) == old_same_bank_clean(name), name
+        assert strip_bank_code_words(normalized) == old_bank_code_clean(name), name
@@ -0,0 +1,73 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from partition_spill import BankPartitionSpill, bank_partition_key, iter_partition
+from tests.conftest import read_dummy_rows, write_workbook
+
+
+def test_bank_partition_key_merges_text_and_numbers():
+    assert bank_partition_key("333") == "333"
+    assert bank_partition_key(333) == "333"
+    assert bank_partition_key(333.0) == "333"
+    assert bank_partition_key(np.int64(333)) == "333"
+    assert bank_partition_key(" 333 ") == "333"
+    assert bank_partition_key("0333") == "0333"
+    assert bank_partition_key(3.5) == "3.5"
+    for empty in (None, np.nan, "", "  "):
+        assert bank_partition_key(empty) is None
+
+
+def test_spill_groups_mixed_bank_codes(tmp_path):
+    batch = pd.DataFrame(
+        {"cKdBank": ["333", 222, 333, np.nan, 333.0, "222"], "value": range(6)},
+        dtype=object,
+    )
+    findings = [
+        {"row": 2, "bank_code": "333"},
+        {"row": 4, "bank_code": 333},
+        {"row": 3, "bank_code": 222},
+    ]
+    spill = BankPartitionSpill(str(tmp_path))
+    try:
+        spill.add(batch, "cKdBank", findings, ("row", "bank_code"))
+        partitions = spill.partitions()
+        assert [bank for bank, _ in partitions] == ["333", "222"]
+
+        records = {bank: list(iter_partition(partition)) for bank, partition in partitions}
+        assert [partition.rows for _, partition in partitions] == [3, 2]
+        (rows_333, findings_333), = records["333"]
+        assert rows_333["value"].tolist() == [0, 2, 4]
+        assert findings_333 == [(2, "333"), (4, 333)]
+        (rows_222, findings_222), = records["222"]
+        assert rows_222["value"].tolist() == [1, 5]
+        assert findings_222 == [(3, 222)]
+    finally:
+        spill.remove()
+
+
+def test_process_file_writes_one_file_per_normalised_bank(validator, tmp_path):
+    header, rows = read_dummy_rows()
+    bank_column = header.index("cKdBank")
+    # Kode bank 333 sebagian disimpan sebagai teks, sebagian sebagai angka
+    for i, row in enumerate(rows):
+        if str(row[bank_column]) == "333" and i % 2:
+            row[bank_column] = "333"
+        elif str(row[bank_column]) == "333":
+            row[bank_column] = 333
+    input_file = write_workbook(tmp_path / "mixed.xlsx", header, rows)
+    validator.split_workers = 1
+
+    validator.process_file(input_file)
+
+    reports = validator.run_stats["bank_files"]
+    files = [report["file"] for report in reports]
+    assert len(files) == len(set(files))
+    assert sorted(report["bank_code"] for report in reports) == ["222", "333"]
+    expected_333 = sum(1 for row in rows if str(row[bank_column]) == "333")
+    report_333 = next(report for report in reports if report["bank_code"] == "333")
+    assert report_333["rows"] == expected_333
+    assert os.path.basename(report_333["file"]).endswith("_333_validated.xlsx")
+    written = pd.read_excel(report_333["file"])
+    assert len(written) == expected_333
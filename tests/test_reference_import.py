@@ -0,0 +1,80 @@
+import csv
+
+import pytest
+
+import db_utils
+from tests.conftest import write_workbook
+
+
+def _write_csv(path, header, rows):
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(header)
+        writer.writerows(rows)
+    return str(path)
+
+
+@pytest.mark.parametrize("extension", ["csv", "xlsx"])
+def test_import_bank_codes_counts(reference_db, tmp_path, extension):
+    existing = db_utils.get_bank_codes()
+    assert existing["222"] == "AAA" and existing["333"] == "BBB"
+    rows = [
+        ["222", "AAA"],         # tidak berubah
+        ["333", "BBB BARU"],    # diupdate
+        ["8", "BANK DELAPAN"],  # baru, menjadi 008
+        ["777", "BANK LAMA"],
+        ["777", "BANK TUJUH"],  # kunci sama di file: baris terakhir dipakai
+        ["12A", "BANK X"],      # ditolak: bukan 3 digit
+        ["", "TANPA KODE"],     # ditolak: kosong
+        ["", ""],               # baris kosong dilewati
+    ]
+    header = ["Code", "Name"]
+    if extension == "csv":
+        path = _write_csv(tmp_path / "bank.csv", header, rows)
+    else:
+        path = write_workbook(tmp_path / "bank.xlsx", header, [[c or None, n or None] for c, n in rows])
+
+    success, message, stats = db_utils.import_reference_data("bank_codes", path)
+
+    assert success, message
+    assert {key: stats[key] for key in ("inserted", "updated", "unchanged", "rejected")} == {
+        "inserted": 2, "updated": 1, "unchanged": 1, "rejected": 2,
+    }
+    assert stats["errors"] == [
+        "Baris 7: Kode bank harus berupa 3 digit angka (12A)",
+        "Baris 8: code/name kosong",
+    ]
+    bank_codes = db_utils.get_bank_codes()
+    assert bank_codes["333"] == "BBB BARU"
+    assert bank_codes["008"] == "BANK DELAPAN"
+    assert bank_codes["777"] == "BANK TUJUH"
+    assert len(bank_codes) == len(existing) + 2
+
+
+def test_reimport_is_unchanged_and_keeps_version(reference_db, tmp_path):
+    path = _write_csv(
+        tmp_path / "mapping.csv", ["keyword", "category"],
+        [["Kedutaan", "B0"], ["KEYWORD BARU", "E0"]],
+    )
+    success, _, stats = db_utils.import_reference_data("ref_mapping_penerima", path)
+    assert success and (stats["inserted"], stats["unchanged"]) == (1, 1)
+    version = db_utils.get_reference_version()
+
+    success, _, stats = db_utils.import_reference_data("ref_mapping_penerima", path)
+    assert success and (stats["inserted"], stats["updated"], stats["unchanged"]) == (0, 0, 2)
+    # Baris yang tidak berubah tidak ditulis ulang, jadi reference data tidak dimuat ulang
+    assert db_utils.get_reference_version() == version
+    assert db_utils.get_mapping_data("ref_mapping_penerima")["KEYWORD BARU"] == "E0"
+
+
+def test_import_rejects_bad_input(reference_db, tmp_path):
+    before = db_utils.get_bank_codes()
+    path = _write_csv(tmp_path / "bank.csv", ["code", "nama"], [["999", "BANK"]])
+    success, message, stats = db_utils.import_reference_data("bank_codes", path)
+    assert not success and "name" in message
+    assert db_utils.get_bank_codes() == before
+
+    success, message, _ = db_utils.import_reference_data("users", path)
+    assert not success and "users" in message
+    success, message, _ = db_utils.import_reference_data("bank_codes", str(tmp_path / "missing.csv"))
+    assert not success and "not found" in message
@@ -0,0 +1,39 @@
+import hashlib
+
+import db_utils
+
+
+def _digest(path):
+    db_utils.connection_manager.close_all()
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def _drop_version_tracking():
+    with db_utils.get_connection() as conn:
+        triggers = conn.execute("SELECT name FROM sqlite_master WHERE type = 'trigger'").fetchall()
+        for (name,) in triggers:
+            conn.execute(f"DROP TRIGGER {name}")
+        conn.execute("DROP TABLE IF EXISTS ref_data_version")
+
+
+def test_shipped_database_has_version_tracking(reference_db):
+    before = _digest(reference_db)
+    assert isinstance(db_utils.get_reference_version(), int)
+    assert db_utils.migrate_database() is True
+    db_utils.get_reference_data()
+    assert _digest(reference_db) == before
+
+
+def test_migrate_adds_tracking_to_old_database(reference_db):
+    _drop_version_tracking()
+    before = _digest(reference_db)
+    # Tanpa tabel versi: hanya membaca, versi dari waktu modifikasi file
+    assert db_utils.get_reference_version() is not None
+    assert _digest(reference_db) == before
+
+    assert db_utils.migrate_database() is True
+    version = db_utils.get_reference_version()
+    assert isinstance(version, int)
+    assert db_utils.add_bank_code("999", "BANK TEST")
+    assert db_utils.get_reference_version() > version
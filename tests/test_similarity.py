@@ -0,0 +1,80 @@
+"""
+similarity dan is_same_bank dibandingkan dengan difflib.SequenceMatcher dan
+algoritma is_same_bank asli (logika benchmark_similarity.py).
+"""
+import random
+import string
+from difflib import SequenceMatcher
+
+import pytest
+
+from benchmark_similarity import BANK_NAMES, make_pairs, reference_is_same_bank
+from similarity import AUTOJUNK_MIN_LENGTH, ratio_exceeds, sequence_ratio
+
+
+def random_pairs(count, seed):
+    """Pasangan string acak dengan alfabet kecil (banyak karakter berulang)."""
+    rng = random.Random(seed)
+    alphabet = "AB C" + string.ascii_uppercase[:6]
+    pairs = [("", ""), ("", "A"), ("A", "")]
+    for _ in range(count):
+        pairs.append(tuple(
+            "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 30)))
+            for _ in range(2)
+        ))
+    return pairs
+
+
+def test_sequence_ratio_matches_difflib():
+    pairs = make_pairs(3000, seed=0) + random_pairs(3000, seed=1)
+    for a, b in pairs:
+        assert sequence_ratio(a, b) == SequenceMatcher(None, a, b).ratio(), (a, b)
+
+
+def test_sequence_ratio_matches_difflib_with_autojunk():
+    rng = random.Random(2)
+    for length in (AUTOJUNK_MIN_LENGTH - 1, AUTOJUNK_MIN_LENGTH, 400):
+        a = "".join(rng.choice("ABC ") for _ in range(length))
+        b = "".join(rng.choice("ABC ") for _ in range(length))
+        assert sequence_ratio(a, b) == SequenceMatcher(None, a, b).ratio()
+
+
+@pytest.mark.parametrize("threshold", [0.0, 0.5, 0.8, 0.9, 1.0])
+def test_ratio_exceeds_matches_difflib(threshold):
+    for a, b in make_pairs(2000, seed=3) + random_pairs(1000, seed=4):
+        expected = SequenceMatcher(None, a, b).ratio() > threshold
+        assert ratio_exceeds(a, b, threshold) == expected, (a, b)
+
+
+@pytest.mark.parametrize("threshold", [0.8, 0.9])
+def test_is_same_bank_matches_original(validator, threshold):
+    validator.fuzzy_match_threshold = threshold
+    pairs = make_pairs(3000, seed=5) + [
+        ("PT BANK", "BANK"), ("", "BANK MANDIRI"), ("BANK MANDIRI", "  "),
+        ("PT. BANK CENTRAL ASIA, TBK", "BANK CENTRAL ASIA"),
+    ]
+    for a, b in pairs:
+        assert validator.is_same_bank(a, b) == reference_is_same_bank(a, b, threshold), (a, b)
+
+
+def test_is_same_bank_cached_is_symmetric(validator):
+    pairs = make_pairs(1000, seed=6)
+    for a, b in pairs:
+        expected = validator.is_same_bank(a, b)
+        assert validator.is_same_bank_cached(a, b) == expected, (a, b)
+        assert validator.is_same_bank_cached(b, a) == expected, (a, b)
+    # Urutan dan spasi/huruf tidak membuat entry cache baru
+    assert validator.is_same_bank_cached(" bank  mandiri", "BANK MANDIRI ") is True
+    assert validator.is_same_bank_cached("BANK MANDIRI", " bank  mandiri") is True
+    assert validator.is_same_bank_cached(None, "BANK MANDIRI") is False
+    assert len(validator.bank_pair_cache) <= 2 * len(pairs) + 2
+
+
+def test_threshold_change_clears_pair_cache(validator):
+    first, second = "BANK MANDIRI", "BANK MANDIRA"
+    validator.fuzzy_match_threshold = 0.99
+    assert validator.is_same_bank_cached(first, second) is False
+    validator.fuzzy_match_threshold = 0.5
+    assert len(validator.bank_pair_cache) == 0
+    assert validator.is_same_bank_cached(first, second) is True
+    assert validator.is_same_bank_cached(BANK_NAMES[0], BANK_NAMES[0]) is True
@@ -0,0 +1,128 @@
+import io
+import sqlite3
+
+import pytest
+
+import db_utils
+
+SCRIPT = """-- dump; dengan komentar
+BEGIN TRANSACTION;
+CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT, note TEXT);
+CREATE TABLE "odd;name" (value TEXT);
+CREATE TABLE audit (item_id INTEGER, action TEXT);
+/* komentar blok; tidak memecah statement */
+INSERT INTO items VALUES (1, 'a;b', 'it''s');
+INSERT INTO items VALUES (2, '-- bukan komentar', '/* bukan */');
+insert   into items
+    VALUES (3, 'x', NULL);
+INSERT INTO items (id, name, note) VALUES (4, '(', ')'), (5, lower('ABC'), 'f(g)');
+INSERT INTO "odd;name" VALUES ('q;');
+CREATE TRIGGER items_audit AFTER INSERT ON items
+BEGIN
+    INSERT INTO audit VALUES (NEW.id, 'insert;');
+    UPDATE items SET note = note || '!' WHERE id = NEW.id;
+END;
+INSERT INTO items VALUES (6, 'y', 'z');
+INSERT INTO items VALUES (7, 'y', 'z') ON CONFLICT DO NOTHING;
+INSERT INTO items VALUES (8, 'y', 'z');
+COMMIT;
+"""
+
+
+def _statements(text, chunk_size=None, monkeypatch=None):
+    if chunk_size:
+        monkeypatch.setattr(db_utils, "SQL_READ_CHUNK_SIZE", chunk_size)
+    return list(db_utils.iter_sql_statements(io.StringIO(text)))
+
+
+def _dump(database):
+    conn = sqlite3.connect(database)
+    try:
+        return {
+            table: conn.execute(f'SELECT * FROM "{table}" ORDER BY rowid').fetchall()
+            for table in ("items", "odd;name", "audit")
+        }
+    finally:
+        conn.close()
+
+
+@pytest.mark.parametrize("chunk_size", [None, 1, 7, 64])
+def test_iter_sql_statements_keeps_quotes_comments_and_triggers(monkeypatch, chunk_size):
+    statements = _statements(SCRIPT, chunk_size, monkeypatch)
+    assert len(statements) == 14
+    assert statements[0] == "BEGIN TRANSACTION;"
+    # Komentar di awal statement dibuang
+    assert statements[4] == "INSERT INTO items VALUES (1, 'a;b', 'it''s');"
+    assert statements[5] == "INSERT INTO items VALUES (2, '-- bukan komentar', '/* bukan */');"
+    assert statements[9].startswith("CREATE TRIGGER") and statements[9].endswith("END;")
+    assert all(sqlite3.complete_statement(statement) for statement in statements)
+
+
+def test_iter_sql_statements_yields_unterminated_tail(monkeypatch):
+    text = "SELECT 1;\n-- komentar\nSELECT 'a;'\n"
+    assert _statements(text, 4, monkeypatch) == ["SELECT 1;", "SELECT 'a;'\n"]
+    assert _statements("SELECT 1; -- selesai\n") == ["SELECT 1;"]
+
+
+@pytest.mark.parametrize("statement, expected", [
+    ("INSERT INTO items VALUES (1, 'a');", ("INSERT INTO items VALUES", "(1, 'a')")),
+    (
+        "insert or replace into \"odd;name\"  (value)\n VALUES ('x'), ('y');",
+        ("insert or replace into \"odd;name\" (value) VALUES", "('x'), ('y')"),
+    ),
+    (
+        "INSERT INTO items VALUES (5, lower('A)B'), 'f(g)');",
+        ("INSERT INTO items VALUES", "(5, lower('A)B'), 'f(g)')"),
+    ),
+    ("INSERT INTO items VALUES (1, 'a') ON CONFLICT DO NOTHING;", None),
+    ("INSERT INTO items SELECT * FROM other;", None),
+    ("INSERT INTO items VALUES (1, 'a') RETURNING id;", None),
+    ("UPDATE items SET name = 'VALUES (1)';", None),
+])
+def test_split_insert_statement(statement, expected):
+    assert db_utils.split_insert_statement(statement) == expected
+
+
+def test_execute_sql_file_matches_executescript(reference_db, tmp_path):
+    sql_file = tmp_path / "dump.sql"
+    sql_file.write_text(SCRIPT, encoding="utf-8")
+    expected_db = str(tmp_path / "expected.db")
+    conn = sqlite3.connect(expected_db)
+    conn.executescript(SCRIPT)
+    conn.close()
+
+    executed = []
+    db_utils.get_connection().set_trace_callback(executed.append)
+    success, message = db_utils.execute_sql_file(str(sql_file))
+    db_utils.get_connection().set_trace_callback(None)
+
+    assert success, message
+    assert _dump(reference_db) == _dump(expected_db)
+    # Statement di body trigger dilaporkan dengan teks statement luarnya
+    executed = [sql for i, sql in enumerate(executed) if not i or sql != executed[i - 1]]
+    inserts = [sql for sql in executed if sql.upper().startswith("INSERT INTO ITEMS")]
+    # Hanya INSERT berurutan dengan bagian depan yang sama yang digabung;
+    # statement lain dan INSERT dengan klausa ON CONFLICT memutus gabungan
+    assert [sql.count("), (") + 1 for sql in inserts] == [2, 1, 2, 1, 1, 1]
+    assert inserts[0] == (
+        "INSERT INTO items VALUES (1, 'a;b', 'it''s'), (2, '-- bukan komentar', '/* bukan */')"
+    )
+
+
+def test_execute_sql_file_rolls_back_on_error(reference_db, tmp_path):
+    sql_file = tmp_path / "broken.sql"
+    sql_file.write_text(
+        "CREATE TABLE items (id INTEGER PRIMARY KEY);\n"
+        "INSERT INTO items VALUES (1);\nINSERT INTO items VALUES (1);\n",
+        encoding="utf-8",
+    )
+    success, message = db_utils.execute_sql_file(str(sql_file))
+    assert not success
+    assert "UNIQUE constraint failed" in message
+    conn = sqlite3.connect(reference_db)
+    try:
+        assert conn.execute(
+            "SELECT COUNT(*) FROM sqlite_master WHERE name = 'items'"
+        ).fetchone() == (0,)
+    finally:
+        conn.close()
@@ -0,0 +1,246 @@
+import os
+import random
+
+import numpy as np
+import pandas as pd
+import pytest
+from openpyxl import load_workbook
+
+from data_validator import RULE_COLUMNS
+from tests.conftest import DUMMY_DATA, write_workbook
+
+INPUT_HEADER = [
+    "cKdBank", "tahun", "bulan", "status_penerima", "kategori_penerima",
+    "status_pembayar", "kategori_pembayar", "stt", "nama_penerima", "nama_pembayar",
+]
+
+
+def _frame(rows):
+    return pd.DataFrame(rows, columns=RULE_COLUMNS, dtype=object)
+
+
+def test_dedup_keeps_mixed_type_values_apart(validator):
+    # 1000 (N1) dan 1000.0 / True bernilai sama untuk Python, tetapi teksnya berbeda
+    base = ["PT MAJU JAYA", "C0", "JOHN SMITH", "E0", "222", "ID", "CN"]
+    rows = [
+        base[:7] + [stt]
+        for stt in (1000, 1000.0, "1000", True, 1, 1.0, np.nan, None, "nan")
+    ]
+    df = _frame(rows * 2)
+
+    deduped = validator._validate_unique_rows(df)
+    assert deduped == validator._validate_frame(df)
+    n1_rows = {result["row"] for result in deduped if result["suggested"] == "N1"}
+    assert 2 in n1_rows and 4 in n1_rows and 3 not in n1_rows
+
+
+def validate_rows_reference(validator, df):
+    """
+    Loop df.iterrows() dari process_file sebelum validasi kolumnar, memakai
+    method aturan DataValidator per baris.
+    """
+    results = []
+
+    def add(idx, column, current, suggested, name, row, status):
+        results.append({
+            "row": idx + 2, "column": column, "current": current, "suggested": suggested,
+            "name": name, "bank_code": row.get("cKdBank", ""), "status": status,
+        })
+
+    def has_keyword(name, side, target):
+        mapping = validator.reference_mapping[side]
+        return any(
+            keyword.upper() != target and keyword.upper() in str(name).upper()
+            and category == target
+            for keyword, category in mapping.items()
+        )
+
+    for idx, row in df.iterrows():
+        nama_pn, nama_pb = row["nama_penerima"], row["nama_pembayar"]
+        kat_pn, kat_pb = row["kategori_penerima"], row["kategori_pembayar"]
+        if validator.is_n1_category(row.get("stt", "")):
+            if kat_pn != "N1":
+                add(idx, "kategori_penerima", kat_pn, "N1", nama_pn, row, "N1")
+            if kat_pb != "N1":
+                add(idx, "kategori_pembayar", kat_pb, "N1", nama_pb, row, "N1")
+            continue
+
+        forced_categories = validator.stt_category_exceptions.get(str(row.get("stt", "")), [])
+        if forced_categories and kat_pn != forced_categories[0]:
+            add(idx, "kategori_penerima", kat_pn, forced_categories[0], nama_pn, row,
+                row.get("status_penerima", ""))
+
+        is_pn_bank = "BANK" in str(nama_pn).upper() and kat_pn not in ["F1", "C0"]
+        is_pb_bank = "BANK" in str(nama_pb).upper() and kat_pb not in ["F1", "C0"]
+        valid_code_pn = validator.validate_bank_code(nama_pn, row.get("cKdBank", ""))
+        valid_code_pb = validator.validate_bank_code(nama_pb, row.get("cKdBank", ""))
+        status_pn = str(row.get("status_penerima", "")).upper()
+        status_pb = str(row.get("status_pembayar", "")).upper()
+
+        suggested_pn = suggested_pb = None
+        if validator.is_category_allowed_for_stt(row.get("stt", ""), kat_pn):
+            suggested_pb = kat_pb
+        else:
+            if nama_pn == nama_pb and status_pn == status_pb:
+                suggested_pb = "I0"
+            else:
+                if has_keyword(nama_pn, "penerima", "C0"):
+                    suggested_pn, is_pn_bank = "C0", False
+                if has_keyword(nama_pb, "pembayar", "C0"):
+                    suggested_pb, is_pb_bank = "C0", False
+                if suggested_pn is None and has_keyword(nama_pn, "penerima", "F1"):
+                    suggested_pn = "F1"
+                if suggested_pb is None and has_keyword(nama_pb, "pembayar", "F1"):
+                    suggested_pb = "F1"
+                if suggested_pn is None and is_pn_bank:
+                    suggested_pn, _ = validator.get_bank_category(
+                        nama_pn, row.get("status_penerima", ""), row.get("cKdBank", ""),
+                        valid_code_pn,
+                    )
+                    if suggested_pn in ["C1", "C2"] and validator.is_same_bank(nama_pn, nama_pb):
+                        suggested_pb = "C2" if suggested_pn == "C1" else "C1"
+                if suggested_pb is None and is_pb_bank:
+                    suggested_pb, _ = validator.get_bank_category(
+                        nama_pb, row.get("status_pembayar", ""), row.get("cKdBank", ""),
+                        valid_code_pb,
+                    )
+            if suggested_pn is None and not is_pn_bank:
+                suggested_pn = validator.check_specific_category(
+                    nama_pn, validator.reference_mapping["penerima"]
+                )
+            if suggested_pb is None and not is_pb_bank:
+                suggested_pb = validator.check_specific_category(
+                    nama_pb, validator.reference_mapping["pembayar"]
+                )
+
+        if suggested_pn and kat_pn != suggested_pn:
+            add(idx, "kategori_penerima", kat_pn, suggested_pn, nama_pn, row, status_pn)
+        if suggested_pb and kat_pb != suggested_pb:
+            add(idx, "kategori_pembayar", kat_pb, suggested_pb, nama_pb, row, status_pb)
+
+        if kat_pb == "C2":
+            suggested = validator.validate_c2_category(
+                nama_pb, row.get("status_pembayar", ""), row.get("cKdBank", ""), valid_code_pb
+            )
+            if suggested:
+                add(idx, "kategori_pembayar", "C2", suggested, nama_pb, row,
+                    row.get("status_pembayar", ""))
+
+        for column, name, current in (
+            ("status_penerima", nama_pn, status_pn),
+            ("status_pembayar", nama_pb, status_pb),
+        ):
+            suggested_statuses = validator.get_suggested_status(name)
+            if "LTD" in str(name).upper():
+                continue
+            if suggested_statuses and current not in suggested_statuses:
+                add(idx, column, current, " or ".join(suggested_statuses), name, row, current)
+    return results
+
+
+def generated_rows(validator, count, seed):
+    """Baris input acak dari keyword reference data, nama bank dan status."""
+    rng = random.Random(seed)
+    words = (
+        list(validator.reference_mapping["penerima"])
+        + list(validator.status_mapping)
+        + list(validator.bank_codes.values())
+        + ["BANK", "PT", "PT.", "CV", "TBK", "LTD", "PTE", "PERSERO", "(PERSERO)",
+           "SINGAPORE", "HONG KONG", "KOPERASI", "MANDIRI", "FOO", "bank", "-"]
+    )
+    categories = ["B0", "C0", "C1", "C2", "C9", "A0", "D0", "E0", "F1", "F2", "I0", "N1", None]
+    statuses = ["ID", "SG", "MY", "HK", "N1", "US", None, "id"]
+
+    def name():
+        text = " ".join(rng.choice(words) for _ in range(rng.randint(1, 4)))
+        return text.lower() if rng.random() < 0.2 else text
+
+    names = [name() for _ in range(count // 3)]
+    rows = []
+    for _ in range(count):
+        nama_pn = rng.choice(names)
+        nama_pb = nama_pn if rng.random() < 0.1 else rng.choice(names)
+        status_pn = rng.choice(statuses)
+        status_pb = status_pn if rng.random() < 0.3 else rng.choice(statuses)
+        rows.append([
+            rng.choice(list(validator.bank_codes)[:5] + [222, 999, None]), 2024, 10,
+            status_pn, rng.choice(categories), status_pb, rng.choice(categories),
+            rng.choice(["1000", 2012, 1521, 1550, 2100]), nama_pn, nama_pb,
+        ])
+    return rows
+
+
+def _comparable(findings):
+    return [
+        {key: None if pd.isna(value) else value for key, value in finding.items()}
+        for finding in findings
+    ]
+
+
+@pytest.mark.parametrize("source", ["dummy", "generated"])
+def test_columnar_engine_matches_row_by_row(validator, tmp_path, source):
+    if source == "dummy":
+        path = DUMMY_DATA
+    else:
+        rows = generated_rows(validator, 1000, seed=8)
+        # Baris duplikat agar jalur dedup ikut menyalin temuan
+        path = write_workbook(tmp_path / "generated.xlsx", INPUT_HEADER, rows + rows[::3])
+    df = pd.read_excel(path)
+
+    expected = _comparable(validate_rows_reference(validator, df))
+    assert len(expected) > 0
+    assert _comparable(validator._validate_frame(df)) == expected
+    assert _comparable(validator._validate_unique_rows(df)) == expected
+    if source == "generated":
+        assert validator.dedup_stats["unique_rows"] < validator.dedup_stats["rows"]
+
+
+def _workbook_cells(path):
+    workbook = load_workbook(path)
+    try:
+        return [
+            (cell.coordinate, cell.value, cell.fill.fgColor.rgb,
+             cell.comment.text if cell.comment else None)
+            for row in workbook.active.iter_rows()
+            for cell in row
+        ]
+    finally:
+        workbook.close()
+
+
+def _output_files(output_file):
+    folder = os.path.dirname(output_file)
+    return {
+        name: _workbook_cells(os.path.join(folder, name))
+        for name in sorted(os.listdir(folder))
+        if name.endswith(".xlsx")
+    }
+
+
+def test_parallel_run_matches_serial_run(validator, tmp_path):
+    rows = generated_rows(validator, 1200, seed=9)
+    path = write_workbook(tmp_path / "input.xlsx", INPUT_HEADER, rows)
+    validator.batch_rows = 100
+
+    validator.parallel_workers = 1
+    validator.split_workers = 1
+    serial_file, serial_count, serial_results = validator.process_file(path, output_name="serial")
+    assert validator.run_stats["workers"] == 1
+
+    validator.parallel_workers = 2
+    validator.parallel_min_rows = 0
+    validator.split_workers = 2
+    parallel_file, parallel_count, parallel_results = validator.process_file(
+        path, output_name="parallel"
+    )
+    assert validator.run_stats["workers"] == 2
+
+    assert parallel_count == serial_count > 0
+    assert _comparable(parallel_results) == _comparable(serial_results)
+    serial_outputs = _output_files(serial_file)
+    parallel_outputs = {
+        name.replace("parallel", "serial"): cells
+        for name, cells in _output_files(parallel_file).items()
+    }
+    assert len(serial_outputs) > 1
+    assert parallel_outputs == serial_outputs
@@ -6,13 +6,13 @@ import db_utils
 class ManageMappingWindow(ttkb.Toplevel):
     """Window untuk mengelola mapping."""
 
-    def __init__(self, parent):
+    def __init__(self, parent, app=None):
         super().__init__(parent)
         self.title("Manage Mapping")
         self.sort_order = {"column": "Keyword", "direction": "asc"}
         self.minsize(600, 600)
         self.resizable(True, True)
-        self.app = parent  # Store reference to parent App instance
+        self.app = app  # App utama, untuk reload reference data validator
         self.create_widgets()
         self.populate_treeview()
 
@@ -135,8 +135,8 @@ class ManageMappingWindow(ttkb.Toplevel):
                 self.keyword_entry.delete(0, tk.END)
                 self.category_combobox.set("")
                 # Update validator reference data
-                if hasattr(self.app, 'validator'):
-                    self.app.validator.reload_reference_data()
+                if self.app is not None:
+                    self.app.reload_reference_data()
             else:
                 self.show_error_message(
                     "Failed to add mapping. Keyword might already exist."
@@ -160,8 +160,8 @@ class ManageMappingWindow(ttkb.Toplevel):
                 self.keyword_entry.delete(0, tk.END)
                 self.category_combobox.set("")
                 # Update validator reference data
-                if hasattr(self.app, 'validator'):
-                    self.app.validator.reload_reference_data()
+                if self.app is not None:
+                    self.app.reload_reference_data()
             else:
                 self.show_error_message("Please select a category.")
         else:
@@ -181,8 +181,8 @@ class ManageMappingWindow(ttkb.Toplevel):
                 self.show_success_message("Mapping deleted successfully!")
                 self.populate_treeview()
                 # Update validator reference data
-                if hasattr(self.app, 'validator'):
-                    self.app.validator.reload_reference_data()
+                if self.app is not None:
+                    self.app.reload_reference_data()
         else:
             self.show_error_message("Please select an item to delete.")
 
@@ -234,8 +234,8 @@ class ManageMappingWindow(ttkb.Toplevel):
                         messagebox.showinfo("Success", message)
                         self.populate_treeview()  # Refresh data after import
                         # Update validator reference data if app exists
-                        if hasattr(self.app, 'validator'):
-                            self.app.validator.reload_reference_data()
+                        if self.app is not None:
+                            self.app.reload_reference_data()
                     else:
                         messagebox.showerror("Error", message)
         
@@ -246,12 +246,13 @@ class ManageMappingWindow(ttkb.Toplevel):
 class ManageBankCodesWindow(ttkb.Toplevel):
     """Window untuk mengelola bank codes."""
 
-    def __init__(self, parent):
+    def __init__(self, parent, app=None):
         super().__init__(parent)
         self.title("Manage Bank Codes")
         self.sort_order = {"column": "Code", "direction": "asc"}
         self.minsize(600, 600)
         self.resizable(True, True)
+        self.app = app  # App utama, untuk reload reference data validator
         self.create_widgets()
         self.populate_treeview()
 
@@ -434,8 +435,8 @@ class ManageBankCodesWindow(ttkb.Toplevel):
                         messagebox.showinfo("Success", message)
                         self.populate_treeview()  # Refresh data after import
                         # Update validator reference data if app exists
-                        if hasattr(self.app, 'validator'):
-                            self.app.validator.reload_reference_data()
+                        if self.app is not None:
+                            self.app.reload_reference_data()
                     else:
                         messagebox.showerror("Error", message)
         
@@ -446,12 +447,13 @@ class ManageBankCodesWindow(ttkb.Toplevel):
 class ManageStatusMappingWindow(ttkb.Toplevel):
     """Window untuk mengelola mapping status."""
 
-    def __init__(self, parent):
+    def __init__(self, parent, app=None):
         super().__init__(parent)
         self.title("Manage Status Mapping")
         self.sort_order = {"column": "Keyword", "direction": "asc"}
         self.minsize(600, 600)
         self.resizable(True, True)
+        self.app = app  # App utama, untuk reload reference data validator
         self.create_widgets()
         self.populate_treeview()
 
@@ -619,8 +621,8 @@ class ManageStatusMappingWindow(ttkb.Toplevel):
                         messagebox.showinfo("Success", message)
                         self.populate_treeview()  # Refresh data after import
                         # Update validator reference data if app exists
-                        if hasattr(self.app, 'validator'):
-                            self.app.validator.reload_reference_data()
+                        if self.app is not None:
+                            self.app.reload_reference_data()
                     else:
                         messagebox.showerror("Error", message)
         